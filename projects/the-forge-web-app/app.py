@@ -1,32 +1,35 @@
+import time
+_RUN_STARTED = time.perf_counter()
+
 import streamlit as st
 import os
 import tempfile
 import json
+import hashlib
 import xml.etree.ElementTree as ET
 from io import BytesIO
-
-import openpyxl
-import difflib
-from openpyxl.utils import get_column_letter
-
-# Import modern UI libraries
-
-from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode, DataReturnMode
+from collections import OrderedDict
 
 # Import the microservices
-from services.xsd_parser_service import XSDParser
-from services.json_schema_parser_service import JSONSchemaParser
-from services.excel_export_service import ExcelExporter
-from services.wsdl_to_xsd_extractor import merge_xsd_from_wsdl
-from services.excel_mapping_service import ExcelMappingService
-
+# Heavy services (openpyxl, jsonschema, lxml) are imported by the registry or the pages that use them
+from services.service_registry import ServiceRegistry
 from services.case_converter_service import pascal_to_camel, camel_to_pascal
 
-from services.converter_service import ConverterService
-
 # Import homepage
 from homepage import show_home_page
 
+_IMPORTS_DONE = time.perf_counter()
+
+SERVICE_SPECS = {
+    'xsd_parser': ('services.xsd_parser_service', 'XSDParser'),
+    'json_schema_parser': ('services.json_schema_parser_service', 'JSONSchemaParser'),
+    'excel_exporter': ('services.excel_export_service', 'ExcelExporter'),
+    'mapping_service': ('services.excel_mapping_service', 'ExcelMappingService'),
+    'converter': ('services.converter_service', 'ConverterService'),
+    'parse_cache': ('services.schema_parse_cache', 'SchemaParseCache'),
+    'synonyms': ('services.similarity_engine', 'SynonymTable'),
+}
+
 # Page configuration
 st.set_page_config(
     page_title="The Forge - Schema Transformation Tool",
@@ -423,19 +426,10 @@ st.markdown("""
 # Initialize services with caching
 @st.cache_resource
 def get_services():
-    try:
-        services = {
-            'xsd_parser': XSDParser(),
-            'json_schema_parser': JSONSchemaParser(),
-            'excel_exporter': ExcelExporter(),
-            'mapping_service': ExcelMappingService(),
-            'converter': ConverterService()
-        }
-        return services
-    except Exception as e:
-        st.error(f"Error initializing services: {str(e)}")
-        # Return empty services dict as fallback
-        return {}
+    """Service registry shared by all sessions; each service is built on first use."""
+    services = ServiceRegistry(SERVICE_SPECS)
+    services.record('app_imports', _IMPORTS_DONE - _RUN_STARTED)
+    return services
 
 def main():
     # Header
@@ -507,7 +501,9 @@ def main():
     elif st.session_state.current_page == "Converter":
         show_converter_page(services)
     elif st.session_state.current_page == "About":
-        show_about_page()
+        show_about_page(services)
+    
+    services.record(f"first_render:{st.session_state.current_page}", time.perf_counter() - _RUN_STARTED)
 
 
 
@@ -609,6 +605,30 @@ def show_mapping_page(services):
     with col4:
         reorder_attributes = st.checkbox("Reorder Attributes First", value=False,
                                        help="Reorder attributes to appear before elements in each parent structure")
+    with col5:
+        matching_mode = st.selectbox("Matching Mode", ["Full path", "Hierarchy", "One-to-one"],
+                                     help="Full path compares whole paths across the target; Hierarchy matches parent structures first, then children within them; "
+                                          "One-to-one maps each target field at most once, maximizing the total field-name similarity")
+    
+    with st.expander("📚 Learn from Previous Mappings"):
+        st.markdown("Upload mapping workbooks exported earlier (and corrected by hand) to learn field-name synonyms and abbreviations such as `qty` ↔ `quantity`. Learned pairs are matched before any fuzzy scoring.")
+        learned_files = st.file_uploader("Upload mapping workbooks", type=['xlsx'], accept_multiple_files=True, key="synonym_uploader")
+        if st.button("Learn Synonyms", disabled=not learned_files):
+            synonyms = services['synonyms']
+            try:
+                learned = sum(synonyms.learn_workbook(BytesIO(f.read())) for f in learned_files)
+                synonyms.save()
+                st.success(f"✅ Learned {learned} new field pairs ({len(synonyms)} entries in the synonym table)")
+            except Exception as e:
+                st.error(f"Error learning synonyms: {str(e)}")
+    
+    with st.expander("🔁 Incremental Re-mapping"):
+        st.markdown("Upload the mapping workbook generated for the previous schema version. Only fields that were added, or whose mapping no longer exists, are matched again; every other row keeps its destination and target columns, manual edits included.")
+        previous_mapping = st.file_uploader("Upload previous mapping workbook", type=['xlsx'], key="previous_mapping_uploader")
+        previous_target = st.file_uploader("Upload previous target schema (optional)", type=['xsd', 'xml', 'json'], key="previous_target_uploader",
+                                           help="Lets renamed or moved destination fields be followed; without it a destination that no longer exists under the same path is matched again")
+        rematch_unmatched = st.checkbox("Re-match previously unmatched fields", value=False,
+                                        help="Also match fields whose Destination Fields cell was empty in the previous workbook")
     
     # Generate mapping button
     if st.button("🚀 Generate Mapping", type="primary", use_container_width=True):
@@ -630,7 +650,11 @@ def show_mapping_page(services):
                         
                         st.info(f"ℹ️ {status_text}")
                     
-                    result = process_mapping(source_file, target_file, services, source_case, target_case, reorder_attributes, min_match_threshold)
+                    if previous_mapping:
+                        result = process_incremental_mapping(previous_mapping, source_file, target_file, services, source_case, target_case,
+                                                             reorder_attributes, matching_mode, rematch_unmatched, previous_target)
+                    else:
+                        result = process_mapping(source_file, target_file, services, source_case, target_case, reorder_attributes, min_match_threshold, matching_mode)
                     if result:
                         st.markdown('<div class="success-message">✅ Mapping generated successfully!</div>', unsafe_allow_html=True)
                         st.download_button(
@@ -699,7 +723,7 @@ def show_wsdl_to_xsd_page(services):
 
 
 
-def show_about_page():
+def show_about_page(services):
     """
     Display the about page with application information and features.
     """
@@ -751,6 +775,10 @@ def show_about_page():
     Built with Streamlit
     Based on The Forge v8 Desktop Application
     """)
+    
+    with st.expander("⏱️ Startup Timings"):
+        st.markdown("Cold-start cost of this server process: app imports, time to the first render of each page and first-use construction of each service.")
+        st.table([{"Step": step, "Milliseconds": ms} for step, ms in services.timing_report()])
 
 
 def show_converter_page(services):
@@ -815,7 +843,9 @@ def show_converter_page(services):
         
         # Determine file types based on source type
         file_types = []
-        if source_type == "json example" or source_type == "json schema":
+        if source_type == "json example":
+            file_types = ['json', 'ndjson', 'jsonl']
+        elif source_type == "json schema":
             file_types = ['json']
         elif source_type == "xsd":
             file_types = ['xsd', 'xml']
@@ -843,7 +873,7 @@ def show_converter_page(services):
                     decoded_content = content.decode('utf-8')
                     preview = decoded_content[:1000] + "..." if len(decoded_content) > 1000 else decoded_content
                     
-                    if uploaded_file.name.lower().endswith('.json'):
+                    if uploaded_file.name.lower().endswith(('.json', '.ndjson', '.jsonl')):
                         st.code(preview, language="json")
                     else:
                         st.code(preview, language="xml")
@@ -860,6 +890,14 @@ def show_converter_page(services):
                 help="Name for the generated JSON schema"
             )
             
+            sample_size = st.number_input(
+                "Records to Sample",
+                min_value=0,
+                value=0,
+                step=1000,
+                help="For large JSON arrays or NDJSON files, infer the schema from a random sample of this many records (0 = use every record)"
+            )
+            
             validate_schema = st.checkbox(
                 "Validate Generated Schema",
                 value=True,
@@ -915,6 +953,8 @@ def show_converter_page(services):
                         conversion_params = {}
                         if conversion_key == "json_to_schema":
                             conversion_params['schema_name'] = schema_name
+                            if sample_size:
+                                conversion_params['sample_size'] = int(sample_size)
                         elif conversion_key == "xml_to_xsd":
                             conversion_params['schema_name'] = schema_name
                         elif conversion_key == "xsd_to_xml":
@@ -1086,7 +1126,14 @@ def process_excel_conversion(file_path: str, conversion_key: str, services: dict
         elif conversion_key == "xsd_to_excel":
             # Convert XSD to Excel with multiple sheets for multiple messages
             xsd_parser = services['xsd_parser']
-            parsed_data = xsd_parser.parse_xsd_file_by_messages(file_path)
+            parse_cache = services.get('parse_cache')
+            if parse_cache is None:
+                parsed_data = xsd_parser.parse_xsd_file_by_messages(file_path)
+            else:
+                with open(file_path, 'rb') as f:
+                    content = f.read()
+                parsed_data = parse_cache.get_or_parse(content, _parser_settings('xsd_by_messages', services),
+                                                       lambda: xsd_parser.parse_xsd_file_by_messages(file_path))
             output_buffer = BytesIO()
             excel_exporter.export(parsed_data, output_buffer)
             output_buffer.seek(0)
@@ -1200,61 +1247,232 @@ def convert_json_example_if_needed(file_path, services):
         return file_path
 
 
-def process_mapping(source_file, target_file, services, source_case="Original", target_case="Original", reorder_attributes=False, min_match_threshold=20):
+def _parser_settings(kind, services):
+    """Everything besides the file bytes that shapes the parsed rows (part of the parse cache key)."""
+    if kind == 'json':
+        parser = services['json_schema_parser']
+        return ('json', parser.PARSER_VERSION, parser.max_level)
+    parser = services['xsd_parser']
+    return (kind, parser.PARSER_VERSION, parser.max_level, parser.type_recursion_limit)
+
+
+def load_schema_rows(content, file_name, services):
+    """
+    Parse uploaded schema bytes (XSD, JSON Schema or JSON example) into rows.
+    Returns (rows, is_json). Rows come from the shared parse cache when the same
+    bytes were already parsed with the same parser settings.
+    """
+    is_json = file_name.lower().endswith('.json')
+    
+    def parse():
+        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_name.split('.')[-1]}") as temp_file:
+            temp_file.write(content)
+            temp_path = temp_file.name
+        # JSON examples are converted to a schema first
+        schema_path = convert_json_example_if_needed(temp_path, services)
+        try:
+            return parse_schema_file(schema_path, services)
+        finally:
+            for path in {temp_path, schema_path}:
+                if os.path.exists(path):
+                    os.unlink(path)
+    
+    parse_cache = services.get('parse_cache')
+    if parse_cache is None:
+        return parse(), is_json
+    return parse_cache.get_or_parse(content, _parser_settings('json' if is_json else 'xsd', services), parse), is_json
+
+
+def _row_path(row):
+    return '.'.join(row['levels'])
+
+
+def match_source_paths(src_rows, tgt_rows, matching_mode="Full path", synonyms=None):
+    """
+    Match every distinct source path to a target row: the same path if the target has it,
+    otherwise a learned synonym path (synonyms is a SynonymTable), otherwise the closest
+    target path (difflib ratio >= 0.6), else None.
+    In "Hierarchy" mode the closest path is searched inside the aligned parent structure
+    first (see HierarchyMatcher), falling back to the whole target for leftovers. In
+    "One-to-one" mode the paths the target does not have are assigned to the remaining
+    target paths by field name, each target at most once, maximizing the total score
+    (see ExcelMappingService.assign_paths).
+    Returns {source_path: target_row or None}.
+    """
+    tgt_path_dict = {_row_path(row): row for row in tgt_rows}
+    tgt_paths = list(tgt_path_dict.keys())
+    if matching_mode == "One-to-one":
+        from services.excel_mapping_service import ExcelMappingService
+        # Field names are scored, so the blank padding levels are left out of the paths
+        def filled_path(row):
+            return '.'.join(lvl for lvl in row['levels'] if lvl)
+        tgt_by_filled = {filled_path(row): row for row in tgt_rows}
+        src_paths = list(dict.fromkeys(filled_path(row) for row in src_rows))
+        matched = {path: tgt_by_filled[path] for path in src_paths if path in tgt_by_filled}
+        rest_src = [path for path in src_paths if path not in matched]
+        rest_tgt = [path for path in tgt_by_filled if path not in matched]
+        for i, (j, _) in ExcelMappingService().assign_paths(rest_src, rest_tgt).items():
+            matched[rest_src[i]] = tgt_by_filled[rest_tgt[j]]
+        return {_row_path(row): matched.get(filled_path(row)) for row in src_rows}
+    if matching_mode == "Hierarchy":
+        from services.hierarchy_matcher import HierarchyMatcher
+        # Parsers pad levels with blanks; the tree is built from the filled ones only
+        def filled(row):
+            return tuple(lvl for lvl in row['levels'] if lvl)
+        tgt_by_levels = {filled(row): row for row in tgt_rows}
+        matches = HierarchyMatcher(list(tgt_by_levels), synonyms=synonyms).match([filled(row) for row in src_rows])
+        return {_row_path(row): tgt_by_levels[matches[filled(row)]] if matches[filled(row)] else None
+                for row in src_rows}
+    from services.path_match_index import PathMatchIndex
+    tgt_index = PathMatchIndex(tgt_paths, synonyms=synonyms) if tgt_paths else None
+    path_matches = {}
+    for src_row in src_rows:
+        src_path_str = _row_path(src_row)
+        if src_path_str in path_matches:
+            continue
+        tgt_row = tgt_path_dict.get(src_path_str)
+        if not tgt_row and tgt_index:
+            # Use fuzzy matching with a higher threshold for better accuracy
+            matches = tgt_index.get_close_matches(src_path_str, n=1, cutoff=0.6)
+            if matches:
+                tgt_row = tgt_path_dict[matches[0]]
+        path_matches[src_path_str] = tgt_row
+    return path_matches
+
+
+MATCH_CACHE_SIZE = 4
+
+
+def get_session_path_matches(source_content, target_content, src_rows, tgt_rows, matching_mode="Full path", synonyms=None):
+    """
+    Return match_source_paths() for this schema pair, computed once per session.
+    Keyed by the content hashes of both uploads, the matching mode and the synonym
+    table revision; the few most recent pairs are kept.
+    """
+    key = (hashlib.sha256(source_content).hexdigest(), hashlib.sha256(target_content).hexdigest(), matching_mode,
+           synonyms.revision if synonyms is not None else None)
+    if 'match_cache' not in st.session_state:
+        st.session_state['match_cache'] = OrderedDict()
+    match_cache = st.session_state['match_cache']
+    if key in match_cache:
+        match_cache.move_to_end(key)
+        return match_cache[key]
+    path_matches = match_source_paths(src_rows, tgt_rows, matching_mode, synonyms)
+    match_cache[key] = path_matches
+    while len(match_cache) > MATCH_CACHE_SIZE:
+        match_cache.popitem(last=False)
+    return path_matches
+
+
+def process_mapping(source_file, target_file, services, source_case="Original", target_case="Original", reorder_attributes=False, min_match_threshold=20, matching_mode="Full path"):
     try:
-        # Create temporary files
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{source_file.name.split('.')[-1]}") as source_temp:
-            source_temp.write(source_file.read())
-            source_temp_path = source_temp.name
-        
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{target_file.name.split('.')[-1]}") as target_temp:
-            target_temp.write(target_file.read())
-            target_temp_path = target_temp.name
-        
         # --- Enhanced schema parsing logic for XSD, JSON Schema, and JSON Examples ---
+        # Parsed rows are cached by file content, so reruns with other options skip parsing
+        source_content = source_file.read()
+        target_content = target_file.read()
+        src_rows, source_is_json = load_schema_rows(source_content, source_file.name, services)
+        tgt_rows, target_is_json = load_schema_rows(target_content, target_file.name, services)
         
-        # Check if source file is a JSON example and convert to schema if needed
-        source_temp_path = convert_json_example_if_needed(source_temp_path, services)
-        
-        # Parse source schema (XSD, JSON Schema, or converted JSON Example)
-        src_rows = parse_schema_file(source_temp_path, services)
-        
-        # Check if target file is a JSON example and convert to schema if needed
-        target_temp_path = convert_json_example_if_needed(target_temp_path, services)
-        
-        # Parse target schema (XSD, JSON Schema, or converted JSON Example)
-        tgt_rows = []
-        if target_temp_path and os.path.exists(target_temp_path):
-            tgt_rows = parse_schema_file(target_temp_path, services)
+        # Matching only depends on the two schemas; case, threshold and reordering are applied afterwards
+        path_matches = get_session_path_matches(source_content, target_content, src_rows, tgt_rows, matching_mode,
+                                                services.get('synonyms'))
         
         # Detect if both schemas are JSON schemas
-        source_is_json = source_file.name.lower().endswith('.json') or source_temp_path.endswith('.json')
-        target_is_json = target_file.name.lower().endswith('.json') or target_temp_path.endswith('.json')
         both_json_schemas = source_is_json and target_is_json
         
         if both_json_schemas:
             # For JSON Schema to JSON Schema mapping, use single sheet approach
-            return _process_json_schema_mapping(src_rows, tgt_rows, source_case, target_case, min_match_threshold, source_temp_path, target_temp_path)
+            return _process_json_schema_mapping(src_rows, tgt_rows, source_case, target_case, min_match_threshold, path_matches)
         else:
             # For XSD or mixed schema mapping, use multi-sheet approach
-            return _process_mixed_schema_mapping(src_rows, tgt_rows, source_case, target_case, reorder_attributes, min_match_threshold, source_temp_path, target_temp_path)
+            return _process_mixed_schema_mapping(src_rows, tgt_rows, source_case, target_case, reorder_attributes, min_match_threshold, path_matches)
         
     except Exception as e:
         st.error(f"Error in mapping: {str(e)}")
         return None
 
 
-def _process_json_schema_mapping(src_rows, tgt_rows, source_case, target_case, min_match_threshold, source_temp_path=None, target_temp_path=None):
+MAPPING_ATTRIBUTE_COLUMNS = ['Request Parameter', 'GDPR', 'Cardinality', 'Type', 'Base Type', 'Details', 'Description', 'Category', 'Example']
+
+
+def _convert_levels(levels, case):
+    if case == "PascalCase":
+        return [camel_to_pascal(level) for level in levels]
+    if case == "camelCase":
+        return [pascal_to_camel(level) for level in levels]
+    return levels.copy()
+
+
+def _build_mapping_entry(src_row, tgt_row, source_case, target_case, max_src_level, max_tgt_level):
+    """
+    Collect everything one mapping row needs (case-converted, padded levels plus the
+    source/target rows) so the sheet layout can be decided before anything is written.
+    """
+    converted_levels = _convert_levels(src_row['levels'], source_case)
+    src_levels = converted_levels + [''] * (max_src_level - len(converted_levels))
+    dest_field = ''  # Unmatched source fields keep an empty destination
+    if tgt_row:
+        converted_tgt_levels = _convert_levels(tgt_row['levels'], target_case)
+        # Set destination field to the matched target path
+        dest_field = '.'.join([lvl for lvl in converted_tgt_levels if lvl])
+        tgt_levels = converted_tgt_levels + [''] * (max_tgt_level - len(converted_tgt_levels))
+    else:
+        tgt_levels = [''] * max_tgt_level
+    return {
+        'src_levels': src_levels,
+        'src_row': src_row,
+        'dest_field': dest_field,
+        'tgt_levels': tgt_levels,
+        'tgt_row': tgt_row,
+    }
+
+
+def _write_mapping_sheet(wb, title, mapping_entries, max_src_level, max_tgt_level, summary):
+    """
+    Append one mapping sheet to a write-only workbook.
+    Empty level columns are dropped up front from the collected entries (trailing
+    source levels, and every target level after the first one that no row uses),
+    so each row is streamed exactly once instead of pruning the finished sheet.
+    Returns (headers, data_rows) with the values written below the two header rows.
+    """
+    src_level_count = max((i + 1 for entry in mapping_entries
+                           for i, lvl in enumerate(entry['src_levels']) if lvl not in (None, '')), default=0)
+    src_keep = range(src_level_count)
+    tgt_keep = [k for k in range(max_tgt_level)
+                if k == 0 or any(entry['tgt_levels'][k] not in (None, '') for entry in mapping_entries)]
+    
+    ws = wb.create_sheet(title=title)
+    src_cols = [f'Level{i+1}_src' for i in src_keep] + [f'{col}_src' for col in MAPPING_ATTRIBUTE_COLUMNS]
+    tgt_cols = [f'Level{k+1}_tgt' for k in tgt_keep] + [f'{col}_tgt' for col in MAPPING_ATTRIBUTE_COLUMNS]
+    headers = src_cols + ['Destination Fields'] + tgt_cols
+    ws.append(headers)
+    ws.append([''] * len(headers))  # Second header row blank for now
+    
+    data_rows = []
+    for entry in mapping_entries:
+        src_row = entry['src_row']
+        tgt_row = entry['tgt_row']
+        src_vals = [entry['src_levels'][i] for i in src_keep] + [
+            src_row.get(col, 'element' if col == 'Category' else '') for col in MAPPING_ATTRIBUTE_COLUMNS
+        ]
+        tgt_vals = [entry['tgt_levels'][k] for k in tgt_keep] + [
+            (tgt_row.get(col, 'element' if col == 'Category' else '') if tgt_row else '') for col in MAPPING_ATTRIBUTE_COLUMNS
+        ]
+        data_rows.append(src_vals + [entry['dest_field']] + tgt_vals)
+        ws.append(data_rows[-1])
+    
+    # Add summary row at the end
+    data_rows.append([''] * len(src_cols) + [summary] + [''] * len(tgt_cols))
+    ws.append(data_rows[-1])
+    return headers, data_rows
+
+
+def _process_json_schema_mapping(src_rows, tgt_rows, source_case, target_case, min_match_threshold, path_matches=None):
     """
     Process JSON Schema to JSON Schema mapping using single sheet approach.
     Respects JSON schema logic including restrictions, cardinalities, etc.
     """
     try:
-        # Build Excel file with single sheet for JSON schemas
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "JSON Schema Mapping"
-        
         # Initialize variables for statistics
         total_source_fields = 0
         matched_fields = 0
@@ -1263,126 +1481,17 @@ def _process_json_schema_mapping(src_rows, tgt_rows, source_case, target_case, m
         max_src_level = max((len(row['levels']) for row in src_rows), default=1)
         max_tgt_level = max((len(row['levels']) for row in tgt_rows), default=1) if tgt_rows else 1
         
-        # Define headers with same structure as XSD transformation
-        src_cols = [f'Level{i+1}_src' for i in range(max_src_level)] + ['Request Parameter_src', 'GDPR_src', 'Cardinality_src', 'Type_src', 'Base Type_src', 'Details_src', 'Description_src', 'Category_src', 'Example_src']
-        tgt_cols = [f'Level{i+1}_tgt' for i in range(max_tgt_level)] + ['Request Parameter_tgt', 'GDPR_tgt', 'Cardinality_tgt', 'Type_tgt', 'Base Type_tgt', 'Details_tgt', 'Description_tgt', 'Category_tgt', 'Example_tgt']
-        headers = src_cols + ['Destination Fields'] + tgt_cols
-        ws.append(headers)
-        ws.append([''] * len(headers))  # Second header row blank for now
-        
-        def row_path(row):
-            return '.'.join(row['levels'])
-        
-        tgt_path_dict = {row_path(row): row for row in tgt_rows}
-        tgt_paths = list(tgt_path_dict.keys())
-        
-        # Create a mapping of source paths to target paths based on similarity
-        source_to_target_mapping = {}
-        
-        for src_row in src_rows:
-            # Apply case conversion to source levels if needed
-            converted_levels = src_row['levels'].copy()
-            if source_case == "PascalCase":
-                converted_levels = [camel_to_pascal(level) for level in converted_levels]
-            elif source_case == "camelCase":
-                converted_levels = [pascal_to_camel(level) for level in converted_levels]
-            
-            src_levels = converted_levels + [''] * (max_src_level - len(converted_levels))
-            src_vals = src_levels + [
-                src_row.get('Request Parameter',''),
-                src_row.get('GDPR',''),
-                src_row.get('Cardinality',''),
-                src_row.get('Type',''),
-                src_row.get('Base Type',''),
-                src_row.get('Details',''),
-                src_row.get('Description',''),
-                src_row.get('Category','element'),
-                src_row.get('Example','')
-            ]
-            
-            src_path_str = row_path(src_row)
-            
-            # Check if we already have a mapping for this source path
-            if src_path_str in source_to_target_mapping:
-                tgt_row = source_to_target_mapping[src_path_str]
-            else:
-                # Try to find a match
-                tgt_row = tgt_path_dict.get(src_path_str)
-                best_match = ''
-                
-                if not tgt_row and tgt_paths:
-                    # Use fuzzy matching with a higher threshold for better accuracy
-                    matches = difflib.get_close_matches(src_path_str, tgt_paths, n=1, cutoff=0.6)
-                    if matches:
-                        best_match = matches[0]
-                        tgt_row = tgt_path_dict[best_match]
-                
-                # Store the mapping to avoid re-computation
-                source_to_target_mapping[src_path_str] = tgt_row
-            
-            dest_field = ''  # Initialize destination field as empty
-            
-            # Apply case conversion to target levels if needed
-            converted_tgt_levels = []
-            if tgt_row:
-                converted_tgt_levels = tgt_row['levels'].copy()
-                if target_case == "PascalCase":
-                    converted_tgt_levels = [camel_to_pascal(level) for level in converted_tgt_levels]
-                elif target_case == "camelCase":
-                    converted_tgt_levels = [pascal_to_camel(level) for level in converted_tgt_levels]
-                # Set destination field to the matched target path
-                dest_field = '.'.join([lvl for lvl in converted_tgt_levels if lvl])
-                tgt_levels = converted_tgt_levels + [''] * (max_tgt_level - len(converted_tgt_levels))
-            else:
-                tgt_levels = ['']*max_tgt_level
-                # Keep dest_field as empty string for unmatched source fields
-            
-            tgt_vals = tgt_levels + [
-                tgt_row.get('Request Parameter','') if tgt_row else '',
-                tgt_row.get('GDPR','') if tgt_row else '',
-                tgt_row.get('Cardinality','') if tgt_row else '',
-                tgt_row.get('Type','') if tgt_row else '',
-                tgt_row.get('Base Type','') if tgt_row else '',
-                tgt_row.get('Details','') if tgt_row else '',
-                tgt_row.get('Description','') if tgt_row else '',
-                tgt_row.get('Category','element') if tgt_row else '',
-                tgt_row.get('Example','') if tgt_row else ''
-            ]
-            
-            ws.append(src_vals + [dest_field] + tgt_vals)
+        # Source path -> matched target row (None when unmatched)
+        if path_matches is None:
+            path_matches = match_source_paths(src_rows, tgt_rows)
+        mapping_entries = [
+            _build_mapping_entry(src_row, path_matches[_row_path(src_row)], source_case, target_case, max_src_level, max_tgt_level)
+            for src_row in src_rows
+        ]
         
         # Update statistics
         total_source_fields = len(src_rows)
-        matched_fields = sum(1 for src_row in src_rows 
-                          if source_to_target_mapping.get(row_path(src_row)) is not None)
-        
-        # Add summary row at the end
-        summary_row = [''] * len(src_vals) + [f'SUMMARY: {matched_fields}/{total_source_fields} fields matched'] + [''] * len(tgt_vals)
-        ws.append(summary_row)
-        
-        # Prune unused columns
-        def last_nonempty_level_col(start_col, num_levels):
-            for col in range(start_col + num_levels - 1, start_col - 1, -1):
-                for row in ws.iter_rows(min_row=3, min_col=col, max_col=col):
-                    if any(cell.value not in (None, '') for cell in row):
-                        return col
-            return start_col - 1
-        
-        src_level_start = 1
-        last_src_col = last_nonempty_level_col(src_level_start, max_src_level)
-        for col in range(src_level_start + max_src_level - 1, last_src_col, -1):
-            ws.delete_cols(col)
-        
-        header_row = [cell.value for cell in ws[1]]
-        try:
-            tgt_level_start = header_row.index('Level1_tgt') + 1
-        except ValueError:
-            tgt_level_start = len(header_row) + 1
-        
-        for col in range(tgt_level_start + max_tgt_level - 1, tgt_level_start - 1, -1):
-            col_letter = get_column_letter(col)
-            if col > tgt_level_start and all((ws.cell(row=row, column=col).value in (None, '')) for row in range(3, ws.max_row + 1)):
-                ws.delete_cols(col)
+        matched_fields = sum(1 for entry in mapping_entries if entry['tgt_row'] is not None)
         
         # Calculate overall match percentage
         match_percentage = (matched_fields / total_source_fields * 100) if total_source_fields > 0 else 0
@@ -1414,16 +1523,14 @@ def _process_json_schema_mapping(src_rows, tgt_rows, source_case, target_case, m
             """)
             return None
         
-        # Save to buffer
+        # Stream the single sheet into a write-only workbook
+        import openpyxl
+        wb = openpyxl.Workbook(write_only=True)
+        _write_mapping_sheet(wb, "JSON Schema Mapping", mapping_entries, max_src_level, max_tgt_level,
+                             f'SUMMARY: {matched_fields}/{total_source_fields} fields matched')
         output_buffer = BytesIO()
         wb.save(output_buffer)
         
-        # Clean up temp files
-        if source_temp_path and os.path.exists(source_temp_path):
-            os.unlink(source_temp_path)
-        if target_temp_path and os.path.exists(target_temp_path):
-            os.unlink(target_temp_path)
-        
         output_buffer.seek(0)
         
         # Show success message with match statistics
@@ -1436,164 +1543,57 @@ def _process_json_schema_mapping(src_rows, tgt_rows, source_case, target_case, m
         return None
 
 
-def _process_mixed_schema_mapping(src_rows, tgt_rows, source_case, target_case, reorder_attributes, min_match_threshold, source_temp_path=None, target_temp_path=None):
+def _group_by_message(src_rows):
+    """Group source rows by message/element name (their first level), in order, for the multi-sheet layout."""
+    src_messages = {}
+    current_message = "schema"  # Default message name
+    
+    for row in src_rows:
+        # For JSON Schema, we don't have multiple messages like XSD, so group by first level
+        if len(row['levels']) > 0 and row['levels'][0]:
+            current_message = row['levels'][0]
+        
+        if current_message not in src_messages:
+            src_messages[current_message] = []
+        src_messages[current_message].append(row)
+    return src_messages
+
+
+def _process_mixed_schema_mapping(src_rows, tgt_rows, source_case, target_case, reorder_attributes, min_match_threshold, path_matches=None):
     """
     Process mixed schema mapping (XSD, JSON Schema, or mixed) using multi-sheet approach.
     This is the original logic for handling XSD and mixed schema types.
     """
     try:
         # Group source rows by message/element name for multi-sheet structure
-        src_messages = {}
-        current_message = "schema"  # Default message name
-        
-        for row in src_rows:
-            # For JSON Schema, we don't have multiple messages like XSD, so group by first level
-            if len(row['levels']) > 0 and row['levels'][0]:
-                current_message = row['levels'][0]
-            
-            if current_message not in src_messages:
-                src_messages[current_message] = []
-            src_messages[current_message].append(row)
+        src_messages = _group_by_message(src_rows)
         
-        # Build Excel file
-        wb = openpyxl.Workbook()
-        first = True
+        # Source path -> matched target row (None when unmatched)
+        if path_matches is None:
+            path_matches = match_source_paths(src_rows, tgt_rows)
         
         # Initialize variables for overall statistics
         total_source_fields = 0
         matched_fields = 0
         
+        # Match every message first; sheets are streamed out once their column layout is known
+        sheets = []
+        
         for msg_name, src_full_rows in src_messages.items():
-            if not first:
-                ws = wb.create_sheet(title=msg_name[:31])  # Excel sheet name limit
-            else:
-                ws = wb.active
-                ws.title = msg_name[:31]
-                first = False
-            
             max_src_level = max((len(row['levels']) for row in src_full_rows), default=1)
             max_tgt_level = max((len(row['levels']) for row in tgt_rows), default=1) if tgt_rows else 1
             
-            src_cols = [f'Level{i+1}_src' for i in range(max_src_level)] + ['Request Parameter_src', 'GDPR_src', 'Cardinality_src', 'Type_src', 'Base Type_src', 'Details_src', 'Description_src', 'Category_src', 'Example_src']
-            tgt_cols = [f'Level{i+1}_tgt' for i in range(max_tgt_level)] + ['Request Parameter_tgt', 'GDPR_tgt', 'Cardinality_tgt', 'Type_tgt', 'Base Type_tgt', 'Details_tgt', 'Description_tgt', 'Category_tgt', 'Example_tgt']
-            headers = src_cols + ['Destination Fields'] + tgt_cols
-            ws.append(headers)
-            ws.append([''] * len(headers))  # Second header row blank for now
-            
-            def row_path(row):
-                return '.'.join(row['levels'])
-            
-            tgt_path_dict = {row_path(row): row for row in tgt_rows}
-            tgt_paths = list(tgt_path_dict.keys())
-            
-            # Create a mapping of source paths to target paths based on similarity
-            # This will help avoid duplicating target fields across multiple source rows
-            source_to_target_mapping = {}
-            
-            for src_row in src_full_rows:
-                # Apply case conversion to source levels if needed
-                converted_levels = src_row['levels'].copy()
-                if source_case == "PascalCase":
-                    converted_levels = [camel_to_pascal(level) for level in converted_levels]
-                elif source_case == "camelCase":
-                    converted_levels = [pascal_to_camel(level) for level in converted_levels]
-                
-                src_levels = converted_levels + [''] * (max_src_level - len(converted_levels))
-                src_vals = src_levels + [
-                    src_row.get('Request Parameter',''),
-                    src_row.get('GDPR',''),
-                    src_row.get('Cardinality',''),
-                    src_row.get('Type',''),
-                    src_row.get('Base Type',''),
-                    src_row.get('Details',''),
-                    src_row.get('Description',''),
-                    src_row.get('Category','element'),
-                    src_row.get('Example','')
-                ]
-                
-                src_path_str = row_path(src_row)
-                
-                # Check if we already have a mapping for this source path
-                if src_path_str in source_to_target_mapping:
-                    tgt_row = source_to_target_mapping[src_path_str]
-                else:
-                    # Try to find a match
-                    tgt_row = tgt_path_dict.get(src_path_str)
-                    best_match = ''
-                    
-                    if not tgt_row and tgt_paths:
-                        # Use fuzzy matching with a higher threshold for better accuracy
-                        matches = difflib.get_close_matches(src_path_str, tgt_paths, n=1, cutoff=0.6)
-                        if matches:
-                            best_match = matches[0]
-                            tgt_row = tgt_path_dict[best_match]
-                    
-                    # Store the mapping to avoid re-computation
-                    source_to_target_mapping[src_path_str] = tgt_row
-                
-                dest_field = ''  # Initialize destination field as empty
-                
-                # Apply case conversion to target levels if needed
-                converted_tgt_levels = []
-                if tgt_row:
-                    converted_tgt_levels = tgt_row['levels'].copy()
-                    if target_case == "PascalCase":
-                        converted_tgt_levels = [camel_to_pascal(level) for level in converted_tgt_levels]
-                    elif target_case == "camelCase":
-                        converted_tgt_levels = [pascal_to_camel(level) for level in converted_tgt_levels]
-                    # Set destination field to the matched target path
-                    dest_field = '.'.join([lvl for lvl in converted_tgt_levels if lvl])
-                    tgt_levels = converted_tgt_levels + [''] * (max_tgt_level - len(converted_tgt_levels))
-                else:
-                    tgt_levels = ['']*max_tgt_level
-                    # Keep dest_field as empty string for unmatched source fields
-                
-                tgt_vals = tgt_levels + [
-                    tgt_row.get('Request Parameter','') if tgt_row else '',
-                    tgt_row.get('GDPR','') if tgt_row else '',
-                    tgt_row.get('Cardinality','') if tgt_row else '',
-                    tgt_row.get('Type','') if tgt_row else '',
-                    tgt_row.get('Base Type','') if tgt_row else '',
-                    tgt_row.get('Details','') if tgt_row else '',
-                    tgt_row.get('Description','') if tgt_row else '',
-                    tgt_row.get('Category','element') if tgt_row else '',
-                    tgt_row.get('Example','') if tgt_row else ''
-                ]
-                
-                ws.append(src_vals + [dest_field] + tgt_vals)
+            mapping_entries = [
+                _build_mapping_entry(src_row, path_matches[_row_path(src_row)], source_case, target_case, max_src_level, max_tgt_level)
+                for src_row in src_full_rows
+            ]
             
             # Update overall statistics
             total_source_fields += len(src_full_rows)
-            matched_fields += sum(1 for src_row in src_full_rows 
-                              if source_to_target_mapping.get(row_path(src_row)) is not None)
-            
-            # Add summary row at the end
-            summary_row = [''] * len(src_vals) + [f'SUMMARY: {matched_fields}/{total_source_fields} fields matched'] + [''] * len(tgt_vals)
-            ws.append(summary_row)
-            
-            # Prune unused source level columns
-            def last_nonempty_level_col(start_col, num_levels):
-                for col in range(start_col + max_src_level - 1, start_col - 1, -1):
-                    for row in ws.iter_rows(min_row=3, min_col=col, max_col=col):
-                        if any(cell.value not in (None, '') for cell in row):
-                            return col
-                return start_col - 1
+            matched_fields += sum(1 for entry in mapping_entries if entry['tgt_row'] is not None)
             
-            src_level_start = 1
-            last_src_col = last_nonempty_level_col(src_level_start, max_src_level)
-            for col in range(src_level_start + max_src_level - 1, last_src_col, -1):
-                ws.delete_cols(col)
-            
-            header_row = [cell.value for cell in ws[1]]
-            try:
-                tgt_level_start = header_row.index('Level1_tgt') + 1
-            except ValueError:
-                tgt_level_start = len(header_row) + 1
-            
-            for col in range(tgt_level_start + max_tgt_level - 1, tgt_level_start - 1, -1):
-                col_letter = get_column_letter(col)
-                if col > tgt_level_start and all((ws.cell(row=row, column=col).value in (None, '')) for row in range(3, ws.max_row + 1)):
-                    ws.delete_cols(col)
+            sheets.append((msg_name, mapping_entries, max_src_level, max_tgt_level,
+                           f'SUMMARY: {matched_fields}/{total_source_fields} fields matched'))
         
         # Calculate overall match percentage
         match_percentage = (matched_fields / total_source_fields * 100) if total_source_fields > 0 else 0
@@ -1601,12 +1601,6 @@ def _process_mixed_schema_mapping(src_rows, tgt_rows, source_case, target_case,
         
         # Check if we have enough matches to generate a meaningful mapping
         if match_percentage < min_match_threshold:
-            # Clean up temp files before returning
-            if 'source_temp_path' in locals():
-                os.unlink(source_temp_path)
-            if 'target_temp_path' in locals():
-                os.unlink(target_temp_path)
-            
             # Provide detailed analysis
             st.warning(f"⚠️ **Schemas don't match well enough to generate a mapping**")
             st.markdown(f"""
@@ -1631,22 +1625,28 @@ def _process_mixed_schema_mapping(src_rows, tgt_rows, source_case, target_case,
             """)
             return None
         
-        # Save to buffer
+        # Stream every message sheet into a write-only workbook
+        import openpyxl
+        wb = openpyxl.Workbook(write_only=True)
+        written_sheets = {}
+        for msg_name, mapping_entries, max_src_level, max_tgt_level, summary in sheets:
+            if reorder_attributes:
+                # Attributes first under each parent, applied to the rows before they are written
+                from services.reorder_excel_attributes import order_attributes_first
+                mapping_entries = order_attributes_first(
+                    mapping_entries,
+                    lambda entry: [lvl for lvl in entry['src_levels'] if lvl],
+                    lambda entry: entry['src_row'].get('Category', 'element'),
+                )
+            written_sheets[msg_name[:31]] = _write_mapping_sheet(wb, msg_name[:31], mapping_entries, max_src_level, max_tgt_level, summary)  # Excel sheet name limit
         output_buffer = BytesIO()
         wb.save(output_buffer)
         
-        # --- Post-processing QA: Excel Output Validator ---
-        xsd_path = source_temp_path if 'source_temp_path' in locals() else target_temp_path
+        # --- Post-processing QA: validate the rows just written against the parsed source ---
         try:
-            from services.excel_output_validator import validate_excel_output, _log_messages
+            from services.excel_output_validator import validate_mapping_rows, _log_messages
             _log_messages.clear()
-            # Save to temporary file for validation
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as temp_excel:
-                output_buffer.seek(0)
-                temp_excel.write(output_buffer.getvalue())
-                temp_excel_path = temp_excel.name
-            
-            validate_excel_output(xsd_path, temp_excel_path)
+            validate_mapping_rows(src_rows, written_sheets)
             
             # Improved validation display
             if _log_messages:
@@ -1710,43 +1710,9 @@ def _process_mixed_schema_mapping(src_rows, tgt_rows, source_case, target_case,
                                 st.text(f"  ... and {len(warning_messages) - 3} more field warnings")
                     else:
                         st.success("🎉 All validations passed successfully!")
-            
-            # Clean up temp validation file
-            os.unlink(temp_excel_path)
         except Exception as e:
             st.error(f"❌ Error in post-processing validator: {e}")
         
-        # --- Attribute reordering if flag is set ---
-        if reorder_attributes:
-            try:
-                from services.reorder_excel_attributes import reorder_attributes_in_excel
-                
-                # Save to temporary file for reordering
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as temp_excel:
-                    output_buffer.seek(0)
-                    temp_excel.write(output_buffer.getvalue())
-                    temp_excel_path = temp_excel.name
-                
-                reorder_attributes_in_excel(temp_excel_path)
-                
-                # Read back the reordered file
-                with open(temp_excel_path, 'rb') as f:
-                    output_buffer.seek(0)
-                    output_buffer.write(f.read())
-                    output_buffer.truncate()
-                
-                # Clean up temp reordering file
-                os.unlink(temp_excel_path)
-            except Exception as e:
-                st.error(f"Failed to reorder attributes: {str(e)}")
-                # Continue without reordering rather than failing the entire process
-        
-        # Clean up temp files
-        if source_temp_path and os.path.exists(source_temp_path):
-            os.unlink(source_temp_path)
-        if target_temp_path and os.path.exists(target_temp_path):
-            os.unlink(target_temp_path)
-        
         output_buffer.seek(0)
         
         # Show success message with match statistics
@@ -1758,12 +1724,107 @@ def _process_mixed_schema_mapping(src_rows, tgt_rows, source_case, target_case,
         st.error(f"Error in mixed schema mapping: {str(e)}")
         return None
 
+def process_incremental_mapping(previous_file, source_file, target_file, services, source_case="Original", target_case="Original",
+                                reorder_attributes=False, matching_mode="Full path", rematch_unmatched=False, previous_target_file=None):
+    """
+    Re-map a new version of the source and/or target schema against a previous mapping
+    workbook. Source fields are diffed against the workbook's rows (added, removed,
+    renamed, moved); rows whose source field and destination still exist are carried
+    over with their Destination Fields and target columns as they were (manual edits
+    included), and only the remaining fields are matched again. Destinations are followed
+    through renames and moves only when the previous target schema is given.
+    """
+    try:
+        from services.incremental_mapping import read_mapping_workbook, IncrementalMappingPlan
+        src_rows, source_is_json = load_schema_rows(source_file.read(), source_file.name, services)
+        tgt_rows, target_is_json = load_schema_rows(target_file.read(), target_file.name, services)
+        previous_rows = read_mapping_workbook(BytesIO(previous_file.read()))
+        if not previous_rows:
+            st.error("The previous mapping workbook has no mapping rows (expected a workbook exported by this page)")
+            return None
+        
+        # Compare the filled levels, in the case the previous workbook was written with
+        def src_key(row):
+            return tuple(lvl for lvl in _convert_levels(row['levels'], source_case) if lvl)
+        def tgt_key(row):
+            return tuple(lvl for lvl in _convert_levels(row['levels'], target_case) if lvl)
+        tgt_by_key = {tgt_key(row): row for row in tgt_rows}
+        previous_target_paths = None
+        if previous_target_file is not None:
+            previous_tgt_rows, _ = load_schema_rows(previous_target_file.read(), previous_target_file.name, services)
+            previous_target_paths = [tgt_key(row) for row in previous_tgt_rows]
+        plan = IncrementalMappingPlan(previous_rows, [src_key(row) for row in src_rows], list(tgt_by_key), rematch_unmatched,
+                                      previous_target_paths)
+        
+        rematch = set(plan.rematch)
+        rematch_rows = [row for row in src_rows if src_key(row) in rematch]
+        path_matches = match_source_paths(rematch_rows, tgt_rows, matching_mode, services.get('synonyms')) if rematch_rows else {}
+        
+        max_tgt_level = max([len(row['levels']) for row in tgt_rows] +
+                            [len(entry['tgt_levels']) for entry in plan.carried.values()] + [1])
+        src_messages = {"JSON Schema Mapping": src_rows} if source_is_json and target_is_json else _group_by_message(src_rows)
+        
+        total_source_fields = 0
+        matched_fields = 0
+        import openpyxl
+        wb = openpyxl.Workbook(write_only=True)
+        for msg_name, src_full_rows in src_messages.items():
+            max_src_level = max((len(row['levels']) for row in src_full_rows), default=1)
+            mapping_entries = []
+            for src_row in src_full_rows:
+                previous = plan.carried.get(src_key(src_row))
+                if previous is None:
+                    entry = _build_mapping_entry(src_row, path_matches[_row_path(src_row)], source_case, target_case, max_src_level, max_tgt_level)
+                elif previous['dest_changed']:
+                    # The destination was renamed or moved: take its new path and attributes
+                    tgt_row = tgt_by_key[tuple(previous['dest_field'].split('.'))]
+                    entry = _build_mapping_entry(src_row, tgt_row, source_case, target_case, max_src_level, max_tgt_level)
+                else:
+                    # Source columns follow the new schema; the mapping decision is kept as it was
+                    entry = _build_mapping_entry(src_row, None, source_case, target_case, max_src_level, max_tgt_level)
+                    entry['dest_field'] = previous['dest_field']
+                    entry['tgt_levels'] = previous['tgt_levels'] + [''] * (max_tgt_level - len(previous['tgt_levels']))
+                    entry['tgt_row'] = previous['tgt_values'] if previous['dest_field'] else None
+                mapping_entries.append(entry)
+            
+            total_source_fields += len(src_full_rows)
+            matched_fields += sum(1 for entry in mapping_entries if entry['tgt_row'] is not None)
+            if reorder_attributes:
+                from services.reorder_excel_attributes import order_attributes_first
+                mapping_entries = order_attributes_first(
+                    mapping_entries,
+                    lambda entry: [lvl for lvl in entry['src_levels'] if lvl],
+                    lambda entry: entry['src_row'].get('Category', 'element'),
+                )
+            _write_mapping_sheet(wb, msg_name[:31], mapping_entries, max_src_level, max_tgt_level,
+                                 f'SUMMARY: {matched_fields}/{total_source_fields} fields matched')
+        output_buffer = BytesIO()
+        wb.save(output_buffer)
+        
+        source_changes = plan.source_diff.summary()
+        with st.expander("🔁 Schema Changes", expanded=False):
+            st.markdown(f"- **Source fields:** {source_changes['added']} added, {source_changes['removed']} removed, "
+                        f"{source_changes['renamed']} renamed, {source_changes['moved']} moved")
+            if plan.target_diff is not None:
+                target_changes = plan.target_diff.summary()
+                st.markdown(f"- **Target fields:** {target_changes['added']} added, {target_changes['removed']} removed, "
+                            f"{target_changes['renamed']} renamed, {target_changes['moved']} moved")
+        st.success(f"✅ **Mapping updated!** {len(plan.carried)} fields carried over, {len(plan.rematch)} re-matched "
+                   f"({matched_fields}/{total_source_fields} fields matched)")
+        return output_buffer.getvalue()
+        
+    except Exception as e:
+        st.error(f"Error in incremental mapping: {str(e)}")
+        return None
+
+
 def process_wsdl_to_xsd(wsdl_file, services):
     try:
         # Read WSDL content
         wsdl_content = wsdl_file.read().decode('utf-8')
         
         # Extract XSD
+        from services.wsdl_to_xsd_extractor import merge_xsd_from_wsdl
         xsd_content = merge_xsd_from_wsdl(wsdl_content)
         
         if not xsd_content or xsd_content.startswith("Error"):
@@ -34,12 +34,25 @@ class ConverterService:
         """
         return self.json_to_schema.convert_json_example_to_schema(json_data, schema_name)
     
+    def convert_json_stream_to_schema(self, source, schema_name: str = "GeneratedSchema",
+                                      sample_size: Optional[int] = None, ndjson: bool = False) -> Dict[str, Any]:
+        """
+        Convert a large JSON or NDJSON file to JSON schema, merging records as they are read.
+        """
+        return self.json_to_schema.convert_json_stream_to_schema(source, schema_name, sample_size, ndjson=ndjson)
+    
     def convert_xml_example_to_xsd(self, xml_data: str, schema_name: str = "GeneratedSchema") -> str:
         """
         Convert XML example to XSD schema.
         """
         return self.xml_to_xsd.convert_xml_example_to_xsd(xml_data, schema_name)
     
+    def convert_xml_file_to_xsd(self, source, schema_name: str = "GeneratedSchema") -> str:
+        """
+        Convert an XML example file to XSD schema, streaming it instead of loading it whole.
+        """
+        return self.xml_to_xsd.convert_xml_file_to_xsd(source, schema_name)
+    
     def convert_xsd_to_xml_example(self, xsd_content: str, root_element_name: Optional[str] = None) -> str:
         """
         Convert XSD schema to XML example.
@@ -258,6 +271,17 @@ class ConverterService:
         Process a file conversion based on the conversion type.
         """
         try:
+            ndjson = file_path.lower().endswith(('.ndjson', '.jsonl'))
+            if conversion_type == "json_to_schema" and (kwargs.get('sample_size') or ndjson):
+                # NDJSON and sampled inference are streamed record by record
+                schema_name = kwargs.get('schema_name', 'GeneratedSchema')
+                return self.convert_json_stream_to_schema(file_path, schema_name, kwargs.get('sample_size'), ndjson)
+            
+            if conversion_type == "xml_to_xsd":
+                # Streamed from disk, so large XML examples are never held in memory whole
+                schema_name = kwargs.get('schema_name', 'GeneratedSchema')
+                return self.convert_xml_file_to_xsd(file_path, schema_name)
+            
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             
@@ -266,10 +290,6 @@ class ConverterService:
                 schema_name = kwargs.get('schema_name', 'GeneratedSchema')
                 return self.convert_json_example_to_schema(json_data, schema_name)
             
-            elif conversion_type == "xml_to_xsd":
-                schema_name = kwargs.get('schema_name', 'GeneratedSchema')
-                return self.convert_xml_example_to_xsd(content, schema_name)
-            
             elif conversion_type == "xsd_to_xml":
                 root_element_name = kwargs.get('root_element_name')
                 return self.convert_xsd_to_xml_example(content, root_element_name)
@@ -1,8 +1,13 @@
+import heapq
+
 import openpyxl
 
+from .similarity_engine import SimilarityEngine
+
 class ExcelMappingService:
-    def __init__(self, max_structure_depth=8):
+    def __init__(self, max_structure_depth=8, engine=None):
         self.max_structure_depth = max_structure_depth
+        self.engine = engine or SimilarityEngine('sequence')
         self.mapping_data = None
         self.headers = None
         self.sheet_names = []
@@ -58,9 +63,69 @@ class ExcelMappingService:
                     items.append(new_key)
         return items
 
-    def generate_mapping_from_schemas(self, source_schema, target_schema, source_struct=None, target_struct=None):
+    @staticmethod
+    def _field_name(path):
+        return path.split('.')[-1] if '.' in path else path
+
+    @staticmethod
+    def _rule_score(src_field, tgt_field):
+        # Same scoring rules for the greedy and the optimal assignment modes; None leaves it to the engine
+        if src_field == tgt_field:
+            return 1.0
+        if src_field in tgt_field or tgt_field in src_field:
+            return 0.8
+        return None
+
+    def _field_score(self, src_field, tgt_field):
+        score = self._rule_score(src_field, tgt_field)
+        return self.engine.score(src_field, tgt_field) if score is None else score
+
+    def score_field_pairs(self, source_paths, target_paths, min_score=0.3, max_candidates=20):
+        """
+        Batch-score every source path against every target path by field name.
+        Scores are computed once per distinct (source field, target field) pair; only
+        pairs above min_score are kept, and of those only the max_candidates best
+        target field names per source field (None keeps them all).
+        Returns {source_index: [(target_index, score), ...]}.
+        """
+        src_fields = [self._field_name(p).lower() for p in source_paths]
+        tgt_fields = [self._field_name(p).lower() for p in target_paths]
+        tgt_by_field = {}
+        for j, field in enumerate(tgt_fields):
+            tgt_by_field.setdefault(field, []).append(j)
+        field_scores = {src_field: [] for src_field in src_fields}
+        for tgt_field in tgt_by_field:
+            rule_scores = {src_field: self._rule_score(src_field, tgt_field) for src_field in field_scores}
+            # One batch per target field, so the engine can reuse its analysis across sources
+            fuzzy = [src_field for src_field, score in rule_scores.items() if score is None]
+            fuzzy_scores = dict(self.engine.score_many(fuzzy, tgt_field, min_score))
+            for src_field, score in rule_scores.items():
+                if score is None:
+                    score = fuzzy_scores.get(src_field, 0.0)
+                if score > min_score:
+                    field_scores[src_field].append((tgt_field, score))
+        if max_candidates is not None:
+            for src_field, scored in field_scores.items():
+                field_scores[src_field] = heapq.nlargest(max_candidates, scored, key=lambda pair: (pair[1], pair[0]))
+        candidates = {}
+        for i, src_field in enumerate(src_fields):
+            candidates[i] = [(j, score) for tgt_field, score in field_scores[src_field] for j in tgt_by_field[tgt_field]]
+        return candidates
+
+    def assign_paths(self, source_paths, target_paths, min_score=0.3, max_candidates=20):
+        """
+        One-to-one assignment of source paths to target paths maximizing the total field
+        name score (see score_field_pairs); sources may stay unassigned.
+        Returns {source_index: (target_index, score)} for the assigned sources.
+        """
+        candidates = self.score_field_pairs(source_paths, target_paths, min_score, max_candidates)
+        return _max_weight_assignment(candidates, len(target_paths))
+
+    def generate_mapping_from_schemas(self, source_schema, target_schema, source_struct=None, target_struct=None, assignment='greedy'):
         # source_schema/target_schema: dicts representing the schema (already loaded)
         # source_struct/target_struct: root keys to use (if any)
+        # assignment: 'greedy' walks the source paths in order and takes the best unused
+        #   target; 'optimal' solves a one-to-one assignment maximizing the total score
         # Returns: list of mapping rows (dicts)
         if source_struct:
             source_schema = source_schema.get(source_struct, source_schema)
@@ -70,32 +135,56 @@ class ExcelMappingService:
         source_paths = self.flatten_schema(source_schema)
         target_paths = self.flatten_schema(target_schema)
         
+        if assignment == 'optimal':
+            assigned = self.assign_paths(source_paths, target_paths)
+            mapping_rows = []
+            used_target_paths = set()
+            for i, src_path in enumerate(source_paths):
+                if i in assigned:
+                    j, score = assigned[i]
+                    used_target_paths.add(target_paths[j])
+                    mapping_rows.append({
+                        'Source Path': src_path, 
+                        'Target Path': target_paths[j],
+                        'Match Score': f"{score:.2f}"
+                    })
+                else:
+                    mapping_rows.append({
+                        'Source Path': src_path, 
+                        'Target Path': '',
+                        'Match Score': '0.00'
+                    })
+            for tgt_path in target_paths:
+                if tgt_path not in used_target_paths:
+                    mapping_rows.append({
+                        'Source Path': '', 
+                        'Target Path': tgt_path,
+                        'Match Score': '0.00'
+                    })
+            return mapping_rows
+        elif assignment != 'greedy':
+            raise ValueError(f"Unsupported assignment mode: {assignment}")
+        
         # Create a more intelligent mapping based on field name similarity
         mapping_rows = []
         used_target_paths = set()
+        tgt_fields = [self._field_name(p).lower() for p in target_paths]
+        pair_scores = {}  # field names repeat a lot, so score each pair once
         
         for src_path in source_paths:
             # Try to find the best matching target path
             best_match = None
             best_score = 0
+            src_field = self._field_name(src_path).lower()
             
-            for tgt_path in target_paths:
+            for tgt_path, tgt_field in zip(target_paths, tgt_fields):
                 if tgt_path in used_target_paths:
                     continue  # Skip already used target paths
                 
                 # Calculate similarity score based on field names
-                src_field = src_path.split('.')[-1] if '.' in src_path else src_path
-                tgt_field = tgt_path.split('.')[-1] if '.' in tgt_path else tgt_path
-                
-                # Simple similarity based on field name
-                if src_field.lower() == tgt_field.lower():
-                    score = 1.0
-                elif src_field.lower() in tgt_field.lower() or tgt_field.lower() in src_field.lower():
-                    score = 0.8
-                else:
-                    # Use difflib for fuzzy matching
-                    import difflib
-                    score = difflib.SequenceMatcher(None, src_field.lower(), tgt_field.lower()).ratio()
+                score = pair_scores.get((src_field, tgt_field))
+                if score is None:
+                    score = pair_scores[(src_field, tgt_field)] = self._field_score(src_field, tgt_field)
                 
                 if score > best_score and score > 0.3:  # Minimum threshold
                     best_score = score
@@ -125,4 +214,75 @@ class ExcelMappingService:
                     'Match Score': '0.00'
                 })
         
-        return mapping_rows 
\ No newline at end of file
+        return mapping_rows
+
+
+def _max_weight_assignment(candidates, n_targets):
+    """
+    Maximum-weight one-to-one assignment over sparse candidate pairs.
+
+    candidates maps each source index to [(target_index, score), ...]. Every source
+    may also stay unassigned (score 0), so the problem is solved as a min-cost
+    assignment where each source owns a private zero-cost dummy target, using
+    successive shortest augmenting paths (Dijkstra with potentials) over the sparse
+    edges only. Returns {source_index: (target_index, score)} for assigned sources.
+    """
+    # Column ids: real targets are 0..n_targets-1, the dummy of source i is n_targets+i
+    u = {}
+    v = {}
+    col_owner = {}
+    row_col = {}
+    for i in sorted(candidates):
+        edges = candidates[i]
+        u[i] = min([0.0] + [-score for _, score in edges])
+    for i in sorted(candidates):
+        dist_col = {}
+        dist_row = {i: 0.0}
+        pred = {}
+        done = set()
+        heap = []
+        row = i
+        terminal = None
+        while True:
+            d_row = dist_row[row]
+            edges = [(j, -score) for j, score in candidates[row]] + [(n_targets + row, 0.0)]
+            for j, cost in edges:
+                if j in done:
+                    continue
+                nd = d_row + cost - u[row] - v.get(j, 0.0)
+                if nd < dist_col.get(j, float('inf')):
+                    dist_col[j] = nd
+                    pred[j] = row
+                    heapq.heappush(heap, (nd, j))
+            while heap:
+                d_col, j = heapq.heappop(heap)
+                if j not in done and d_col == dist_col[j]:
+                    break
+            else:
+                break
+            done.add(j)
+            if j not in col_owner:
+                terminal = j
+                break
+            row = col_owner[j]
+            dist_row[row] = d_col
+        if terminal is None:
+            continue
+        shortest = dist_col[terminal]
+        # Keep reduced costs non-negative and matched edges tight
+        for r, d in dist_row.items():
+            u[r] += shortest - d
+        for j in done:
+            v[j] = v.get(j, 0.0) - (shortest - dist_col[j])
+        # Augment along the shortest path
+        j = terminal
+        while True:
+            r = pred[j]
+            previous = row_col.get(r)
+            row_col[r] = j
+            col_owner[j] = r
+            if r == i:
+                break
+            j = previous
+    scores = {i: dict(edges) for i, edges in candidates.items()}
+    return {i: (j, scores[i][j]) for i, j in row_col.items() if j < n_targets}
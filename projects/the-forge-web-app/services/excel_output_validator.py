@@ -21,6 +21,22 @@ def excel_sheet_name(name):
     return name[:31]
 
 
+def excel_path_series(df, prefix):
+    """
+    Builds the hierarchical path of every row column-wise from the Level1_src...Level8_src
+    or Level1_tgt...Level8_tgt columns (non-null, non-blank levels joined with '/').
+    Returns a string Series aligned with df ('' for rows without levels).
+    """
+    level_cols = [f'Level{i}_{prefix}' for i in range(1, 9) if f'Level{i}_{prefix}' in df.columns]
+    path = pd.Series('', index=df.index, dtype=object)
+    for col in level_cols:
+        values = df[col].astype(str)
+        present = df[col].notnull() & values.str.strip().ne('')
+        joined = (path + '/').where(path.ne(''), '') + values
+        path = path.mask(present, joined)
+    return path
+
+
 def reconstruct_excel_paths(df, prefix):
     """
     Reconstructs hierarchical paths from Level1_src...Level8_src or Level1_tgt...Level8_tgt columns.
@@ -29,17 +45,179 @@ def reconstruct_excel_paths(df, prefix):
     if not PANDAS_AVAILABLE:
         return {}
     
-    level_cols = [f'Level{i}_{prefix}' for i in range(1, 9) if f'Level{i}_{prefix}' in df.columns]
+    path = excel_path_series(df, prefix)
+    path = path[path.ne('')]
+    return dict(zip(path.values, path.index))
+
+
+def reconstruct_row_paths(headers, rows, prefix):
+    """
+    Same as reconstruct_excel_paths, for rows held in memory as value lists.
+    Returns a dict: {path: row_dict}
+    """
+    level_idx = [headers.index(f'Level{i}_{prefix}') for i in range(1, 9) if f'Level{i}_{prefix}' in headers]
     paths = {}
-    for idx, row in df.iterrows():
-        levels = [str(row[col]) for col in level_cols if pd.notnull(row[col]) and str(row[col]).strip()]
+    for row in rows:
+        levels = [str(row[i]) for i in level_idx if row[i] is not None and str(row[i]).strip()]
         if levels:
-            path = '/'.join(levels)
-            paths[path] = idx
+            paths['/'.join(levels)] = dict(zip(headers, row))
     return paths
 
 
-def validate_excel_output(xsd_path: str, excel_path: str) -> None:
+def group_message_fields(xsd_rows):
+    """Group parsed XSD rows by message (top-level element): {message: {path: row}}"""
+    message_fields = {}
+    for row in xsd_rows:
+        if not row['levels'] or not row['levels'][0]:
+            continue
+        msg = row['levels'][0]
+        path = '/'.join([lvl for lvl in row['levels'] if lvl])
+        if msg not in message_fields:
+            message_fields[msg] = {}
+        message_fields[msg][path] = row
+    return message_fields
+
+
+def _report_sheet(msg, field_checks, symmetry_mismatches):
+    """
+    Log the outcome of one sheet and return (errors, warnings, verified).
+    field_checks: (path, found, type_mismatch, expected_type, excel_type, card_mismatch, expected_card, excel_card)
+    per XSD field; symmetry_mismatches: (path, column, src_value, tgt_value).
+    """
+    sheet_errors = 0
+    sheet_warnings = 0
+    sheet_verified = 0
+    log_to_ui(f"\n[VALIDATE] Validating message '{msg}' in sheet '{msg}'")
+    for path, found, type_mismatch, expected_type, excel_type, card_mismatch, expected_card, excel_card in field_checks:
+        if not found:
+            log_to_ui(f"[ERROR] Field [{path}] missing from Excel (sheet '{msg}').")
+            sheet_errors += 1
+            continue
+        if type_mismatch:
+            log_to_ui(f"[WARNING] Type mismatch for [{path}] in sheet '{msg}': expected '{expected_type}', found '{excel_type}'")
+            sheet_warnings += 1
+        if card_mismatch:
+            log_to_ui(f"[WARNING] Cardinality mismatch for [{path}] in sheet '{msg}': expected '{expected_card}', found '{excel_card}'")
+            sheet_warnings += 1
+        log_to_ui(f"[SUCCESS] Field [{path}] validated successfully in sheet '{msg}'.")
+        sheet_verified += 1
+    for path, col, src_val, tgt_val in symmetry_mismatches:
+        log_to_ui(f"[WARNING] Source/Target mismatch for [{path}] column '{col}' in sheet '{msg}': src='{src_val}', tgt='{tgt_val}'")
+        sheet_warnings += 1
+    log_to_ui(f"[VALIDATE] Message '{msg}' validation: {sheet_errors} errors, {sheet_warnings} warning(s), {sheet_verified} fields verified.")
+    return sheet_errors, sheet_warnings, sheet_verified
+
+
+def _check_sheet_rows(fields, src_paths, tgt_paths):
+    """Row-by-row checks for in-memory rows ({path: row_dict}); see _report_sheet for the output."""
+    field_checks = []
+    for path, meta in fields.items():
+        if path not in src_paths:
+            field_checks.append((path, False, False, meta['Type'], '', False, meta['Cardinality'], ''))
+            continue
+        row = src_paths[path]
+        excel_type = str(row.get('Type_src', '')).strip()
+        excel_card = str(row.get('Cardinality_src', '')).strip()
+        field_checks.append((
+            path, True,
+            bool(meta['Type'] and excel_type and meta['Type'] != excel_type), meta['Type'], excel_type,
+            bool(excel_card and excel_card != meta['Cardinality']), meta['Cardinality'], excel_card,
+        ))
+    symmetry_mismatches = []
+    # If source and target XSD are the same, check symmetry
+    if set(src_paths.keys()) == set(tgt_paths.keys()) and src_paths:
+        for path in src_paths:
+            for col in ['Type', 'Cardinality']:
+                src_val = str(src_paths[path].get(f'{col}_src', '')).strip()
+                tgt_val = str(tgt_paths[path].get(f'{col}_tgt', '')).strip()
+                if src_val != tgt_val:
+                    symmetry_mismatches.append((path, col, src_val, tgt_val))
+    return field_checks, symmetry_mismatches
+
+
+def _sheet_table(df, prefix):
+    """
+    One row per distinct path of a mapping sheet side, in first-seen order with the
+    values of the last row carrying that path (same semantics as reconstruct_excel_paths).
+    """
+    paths = reconstruct_excel_paths(df, prefix)
+    rows = list(paths.values())
+    table = pd.DataFrame({'path': list(paths.keys())})
+    for col in ['Type', 'Cardinality']:
+        name = f'{col}_{prefix}'
+        if name in df.columns:
+            table[name] = df[name].loc[rows].astype(str).str.strip().values
+        else:
+            table[name] = ''
+    return table
+
+
+def _check_sheet_frame(fields, df):
+    """Vectorized checks of a sheet DataFrame, joined against the XSD field table; see _report_sheet."""
+    src = _sheet_table(df, 'src')
+    tgt = _sheet_table(df, 'tgt')
+    xsd = pd.DataFrame({
+        'path': list(fields.keys()),
+        'Type': [meta['Type'] for meta in fields.values()],
+        'Cardinality': [meta['Cardinality'] for meta in fields.values()],
+    })
+    merged = xsd.merge(src, on='path', how='left', indicator=True)
+    found = merged['_merge'].eq('both')
+    excel_type = merged['Type_src'].fillna('')
+    excel_card = merged['Cardinality_src'].fillna('')
+    type_mismatch = found & merged['Type'].ne('') & excel_type.ne('') & merged['Type'].ne(excel_type)
+    card_mismatch = found & excel_card.ne('') & excel_card.ne(merged['Cardinality'])
+    field_checks = list(zip(merged['path'], found, type_mismatch, merged['Type'], excel_type,
+                            card_mismatch, merged['Cardinality'], excel_card))
+    symmetry_mismatches = []
+    # If source and target XSD are the same, check symmetry
+    if len(src) and set(src['path']) == set(tgt['path']):
+        pairs = src.merge(tgt, on='path', how='left')
+        type_diff = pairs['Type_src'].ne(pairs['Type_tgt'])
+        card_diff = pairs['Cardinality_src'].ne(pairs['Cardinality_tgt'])
+        for path, t_diff, src_t, tgt_t, c_diff, src_c, tgt_c in zip(
+                pairs['path'], type_diff, pairs['Type_src'], pairs['Type_tgt'],
+                card_diff, pairs['Cardinality_src'], pairs['Cardinality_tgt']):
+            if t_diff:
+                symmetry_mismatches.append((path, 'Type', src_t, tgt_t))
+            if c_diff:
+                symmetry_mismatches.append((path, 'Cardinality', src_c, tgt_c))
+    return field_checks, symmetry_mismatches
+
+
+def validate_mapping_rows(xsd_rows, sheets):
+    """
+    Validate a mapping that was just generated, straight from memory.
+    xsd_rows: the already parsed source rows (XSDParser output).
+    sheets: {sheet_name: (headers, data_rows)} with the value lists written to each sheet.
+    Returns (errors, warnings, verified).
+    """
+    log_to_ui(f"[VALIDATE] Starting in-memory validation of {len(sheets)} sheet(s)")
+    message_fields = group_message_fields(xsd_rows)
+    total_errors = 0
+    total_warnings = 0
+    total_verified = 0
+    for msg, fields in message_fields.items():
+        if excel_sheet_name(msg) not in sheets:
+            log_to_ui(f"[ERROR] Sheet for message '{msg}' is missing in Excel.")
+            total_errors += 1
+            continue
+        headers, rows = sheets[excel_sheet_name(msg)]
+        src_paths = reconstruct_row_paths(headers, rows, 'src')
+        tgt_paths = reconstruct_row_paths(headers, rows, 'tgt')
+        errors, warnings, verified = _report_sheet(msg, *_check_sheet_rows(fields, src_paths, tgt_paths))
+        total_errors += errors
+        total_warnings += warnings
+        total_verified += verified
+    log_to_ui(f"\n[VALIDATE] Validation completed: {total_errors} errors, {total_warnings} warning(s), {total_verified} fields verified across {len(message_fields)} messages.")
+    return total_errors, total_warnings, total_verified
+
+
+def validate_excel_output(xsd_path: str, excel_path: str, schema_model=None) -> None:
+    """
+    Validate a mapping workbook on disk against its source XSD.
+    Pass the SchemaModel already compiled for the mapping to avoid parsing the XSD again.
+    """
     if not PANDAS_AVAILABLE:
         log_to_ui("[WARNING] Pandas not available - skipping validation. Install pandas with: pip install pandas")
         return
@@ -48,20 +226,14 @@ def validate_excel_output(xsd_path: str, excel_path: str) -> None:
     # 1. Parse XSD and build message->fields mapping
     try:
         parser = XSDParser()
-        xsd_rows = parser.parse_xsd_file(xsd_path)
+        if schema_model is None:
+            schema_model = parser.load_schema_model(xsd_path)
+        xsd_rows = parser.parse_schema_model(schema_model)
     except Exception as e:
         log_to_ui(f"[ERROR] Failed to parse XSD: {e}")
         return
     # Group fields by message (top-level element)
-    message_fields = {}
-    for row in xsd_rows:
-        if not row['levels'] or not row['levels'][0]:
-            continue
-        msg = row['levels'][0]
-        path = '/'.join([lvl for lvl in row['levels'] if lvl])
-        if msg not in message_fields:
-            message_fields[msg] = {}
-        message_fields[msg][path] = row
+    message_fields = group_message_fields(xsd_rows)
     # 2. Load Excel (all sheets)
     try:
         xl = pd.ExcelFile(excel_path)
@@ -83,47 +255,10 @@ def validate_excel_output(xsd_path: str, excel_path: str) -> None:
             log_to_ui(f"[ERROR] Failed to read sheet '{msg}': {e}")
             total_errors += 1
             continue
-        sheet_errors = 0
-        sheet_warnings = 0
-        sheet_verified = 0
-        log_to_ui(f"\n[VALIDATE] Validating message '{msg}' in sheet '{msg}'")
-        src_paths = reconstruct_excel_paths(df, 'src')
-        tgt_paths = reconstruct_excel_paths(df, 'tgt')
-        for path, meta in fields.items():
-            if path not in src_paths:
-                log_to_ui(f"[ERROR] Field [{path}] missing from Excel (sheet '{msg}').")
-                sheet_errors += 1
-                continue
-            idx = src_paths[path]
-            row = df.iloc[idx]
-            excel_type = str(row.get('Type_src', '')).strip()
-            if meta['Type'] and excel_type and meta['Type'] != excel_type:
-                log_to_ui(f"[WARNING] Type mismatch for [{path}] in sheet '{msg}': expected '{meta['Type']}', found '{excel_type}'")
-                sheet_warnings += 1
-            excel_card = str(row.get('Cardinality_src', '')).strip()
-            expected_card = meta['Cardinality']
-            if excel_card and excel_card != expected_card:
-                log_to_ui(f"[WARNING] Cardinality mismatch for [{path}] in sheet '{msg}': expected '{expected_card}', found '{excel_card}'")
-                sheet_warnings += 1
-            log_to_ui(f"[SUCCESS] Field [{path}] validated successfully in sheet '{msg}'.")
-            sheet_verified += 1
-        # If source and target XSD are the same, check symmetry
-        if set(src_paths.keys()) == set(tgt_paths.keys()) and src_paths:
-            for path in src_paths:
-                src_idx = src_paths[path]
-                tgt_idx = tgt_paths[path]
-                src_row = df.iloc[src_idx]
-                tgt_row = df.iloc[tgt_idx]
-                for col in ['Type', 'Cardinality']:
-                    src_val = str(src_row.get(f'{col}_src', '')).strip()
-                    tgt_val = str(tgt_row.get(f'{col}_tgt', '')).strip()
-                    if src_val != tgt_val:
-                        log_to_ui(f"[WARNING] Source/Target mismatch for [{path}] column '{col}' in sheet '{msg}': src='{src_val}', tgt='{tgt_val}'")
-                        sheet_warnings += 1
-        log_to_ui(f"[VALIDATE] Message '{msg}' validation: {sheet_errors} errors, {sheet_warnings} warning(s), {sheet_verified} fields verified.")
-        total_errors += sheet_errors
-        total_warnings += sheet_warnings
-        total_verified += sheet_verified
+        errors, warnings, verified = _report_sheet(msg, *_check_sheet_frame(fields, df))
+        total_errors += errors
+        total_warnings += warnings
+        total_verified += verified
     log_to_ui(f"\n[VALIDATE] Validation completed: {total_errors} errors, {total_warnings} warning(s), {total_verified} fields verified across {len(message_fields)} messages.")
     # Optionally export report
     if total_errors or total_warnings:
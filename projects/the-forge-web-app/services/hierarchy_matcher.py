@@ -0,0 +1,134 @@
+from .path_match_index import PathMatchIndex
+from .similarity_engine import SimilarityEngine
+
+
+class HierarchyMatcher:
+    """
+    Tree-aware path matching over the 'levels' of parsed schema rows.
+
+    Built once per target schema. match() aligns the source's top-level
+    structures with the target's, then recursively pairs the children of each
+    aligned node only against the children of its counterpart, so matches stay
+    inside corresponding subtrees and each comparison is between sibling names.
+    Source paths that do not end on an aligned target path fall back to the
+    global PathMatchIndex search used by the flat path mode, except structures
+    whose children all matched under one target structure. Learned synonyms
+    from a SynonymTable pair siblings before any fuzzy scoring.
+    """
+    def __init__(self, target_levels, engine=None, cutoff=0.6, synonyms=None):
+        self.engine = engine or SimilarityEngine('sequence')
+        self.cutoff = cutoff
+        self.synonyms = synonyms if synonyms else None
+        self.target_paths = dict.fromkeys(tuple(levels) for levels in target_levels)
+        self.target_children = self._children(self.target_paths)
+        self._joined_paths = {'.'.join(path): path for path in self.target_paths}
+        self.fallback = PathMatchIndex(list(self._joined_paths), synonyms=self.synonyms) if self._joined_paths else None
+
+    @staticmethod
+    def _children(paths):
+        # prefix tuple -> child names in first-seen order
+        children = {}
+        for path in paths:
+            for depth in range(len(path)):
+                names = children.setdefault(path[:depth], {})
+                names.setdefault(path[depth], None)
+        return {prefix: list(names) for prefix, names in children.items()}
+
+    def _align(self, src_names, tgt_names, is_root):
+        """Pair sibling names: exact, case-insensitive, learned synonym, then best unused fuzzy match."""
+        pairs = {}
+        tgt_set = set(tgt_names)
+        for name in src_names:
+            if name in tgt_set:
+                pairs[name] = name
+        used = set(pairs.values())
+        by_lower = {}
+        for name in tgt_names:
+            if name not in used:
+                by_lower.setdefault(name.lower(), name)
+        for name in src_names:
+            if name not in pairs and name.lower() in by_lower and by_lower[name.lower()] not in used:
+                pairs[name] = by_lower[name.lower()]
+                used.add(pairs[name])
+        if self.synonyms:
+            by_canonical = {}
+            for name in tgt_names:
+                if name not in used:
+                    by_canonical.setdefault(self.synonyms.canonical_name(name), []).append(name)
+            for name in src_names:
+                if name in pairs:
+                    continue
+                synonyms = [tgt for form in self.synonyms.name_forms(name) for tgt in by_canonical.get(form, ()) if tgt not in used]
+                if synonyms:
+                    pairs[name] = self.synonyms.pick(name, synonyms, self.engine)
+                    used.add(pairs[name])
+        for name in src_names:
+            if name in pairs:
+                continue
+            remaining = {}
+            for tgt in tgt_names:
+                if tgt not in used:
+                    remaining.setdefault(tgt.lower(), tgt)
+            if not remaining:
+                break
+            best, score = self.engine.best_match(name.lower(), remaining)
+            if best is not None and score >= self.cutoff:
+                pairs[name] = remaining[best]
+                used.add(remaining[best])
+        # A lone root on both sides is the same message whatever it is called
+        if is_root and not pairs and len(src_names) == 1 and len(tgt_names) == 1:
+            pairs[src_names[0]] = tgt_names[0]
+        return pairs
+
+    def align(self, source_levels):
+        """Return {source path tuple: aligned target path tuple} for every aligned node."""
+        source_paths = dict.fromkeys(tuple(levels) for levels in source_levels)
+        source_children = self._children(source_paths)
+        aligned = {}
+        stack = [((), ())]
+        while stack:
+            src_prefix, tgt_prefix = stack.pop()
+            src_names = source_children.get(src_prefix)
+            tgt_names = self.target_children.get(tgt_prefix)
+            if not src_names or not tgt_names:
+                continue
+            for src_name, tgt_name in self._align(src_names, tgt_names, not src_prefix).items():
+                src_path, tgt_path = src_prefix + (src_name,), tgt_prefix + (tgt_name,)
+                aligned[src_path] = tgt_path
+                stack.append((src_path, tgt_path))
+        return aligned
+
+    def match(self, source_levels):
+        """
+        Return {source path tuple: target path tuple or None}: the same path if the
+        target has it, else the aligned target node, else the closest target path
+        overall (difflib ratio >= cutoff), else None.
+        """
+        source_paths = list(dict.fromkeys(tuple(levels) for levels in source_levels))
+        aligned = self.align(source_paths)
+        matches = {}
+        unaligned = []
+        for path in source_paths:
+            if path in self.target_paths:
+                matches[path] = path
+                continue
+            tgt_path = aligned.get(path)
+            if tgt_path not in self.target_paths:
+                unaligned.append(path)
+                tgt_path = None
+                if self.fallback:
+                    close = self.fallback.get_close_matches('.'.join(path), n=1, cutoff=self.cutoff)
+                    if close:
+                        tgt_path = self._joined_paths[close[0]]
+            matches[path] = tgt_path
+        # An unaligned structure whose children all matched under one target structure is that structure
+        children = {}
+        for path in source_paths:
+            children.setdefault(path[:-1], []).append(path)
+        for path in sorted(unaligned, key=len, reverse=True):
+            parents = {matches[child][:-1] for child in children.get(path, ()) if matches[child]}
+            if len(parents) == 1:
+                parent = parents.pop()
+                if parent in self.target_paths:
+                    matches[path] = parent
+        return matches
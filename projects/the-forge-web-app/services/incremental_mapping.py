@@ -0,0 +1,180 @@
+import re
+
+from .similarity_engine import SimilarityEngine
+
+DESTINATION_HEADER = 'Destination Fields'
+
+
+class SchemaDiff:
+    """
+    Structural diff between the paths of two versions of a schema.
+
+    Paths are tuples of levels. Every old path ends up in exactly one of
+    unchanged, removed, renamed or moved; renamed and moved map it to its new
+    path, and added holds the new paths nothing was mapped to. A path is
+    renamed when its leaf changed under the same (or already renamed/moved)
+    parent, and moved when it kept its leaf under another parent, so the
+    children of a renamed structure move along with it. Old paths are handled
+    parents first, comparing only siblings, then the leaf name anywhere.
+    """
+    def __init__(self, old_paths, new_paths, engine=None, cutoff=0.6):
+        engine = engine or SimilarityEngine('sequence')
+        old_paths = list(dict.fromkeys(old_paths))
+        new_paths = list(dict.fromkeys(new_paths))
+        self._old = set(old_paths)
+        self._new = set(new_paths)
+        self._new_prefixes = {path[:depth] for path in new_paths for depth in range(len(path) + 1)}
+        self.unchanged = [path for path in old_paths if path in self._new]
+        self.renamed = {}
+        self.moved = {}
+        self.removed = []
+        unclaimed = dict.fromkeys(path for path in new_paths if path not in self._old)
+        by_parent, by_leaf = {}, {}
+        for path in unclaimed:
+            by_parent.setdefault(path[:-1], []).append(path)
+            by_leaf.setdefault(path[-1].lower(), []).append(path)
+        for path in sorted((path for path in old_paths if path not in self._new), key=len):
+            parent = self.new_path(path[:-1])
+            target, moved = None, False
+            if parent is not None:
+                if parent + path[-1:] in unclaimed:
+                    target, moved = parent + path[-1:], True
+                else:
+                    siblings = {}
+                    for sibling in by_parent.get(parent, ()):
+                        if sibling in unclaimed:
+                            siblings.setdefault(sibling[-1].lower(), sibling)
+                    best, score = engine.best_match(path[-1].lower(), siblings)
+                    if best is not None and score >= cutoff:
+                        target = siblings[best]
+            if target is None:
+                candidates = [other for other in by_leaf.get(path[-1].lower(), ()) if other in unclaimed]
+                if len(candidates) == 1:
+                    target, moved = candidates[0], True
+            if target is None:
+                self.removed.append(path)
+                continue
+            del unclaimed[target]
+            (self.moved if moved else self.renamed)[path] = target
+        # A removed structure whose children all moved under one new structure was renamed
+        moved_under = {}
+        for old, new in self.moved.items():
+            moved_under.setdefault(old[:-1], set()).add(new[:-1])
+        for path in list(self.removed):
+            parents = moved_under.get(path, ())
+            if len(parents) == 1 and next(iter(parents)) in unclaimed:
+                target = next(iter(parents))
+                del unclaimed[target]
+                self.removed.remove(path)
+                self.renamed[path] = target
+        self.added = list(unclaimed)
+        self._old_of = {new: old for old, new in list(self.renamed.items()) + list(self.moved.items())}
+
+    def new_path(self, old_path):
+        """The path old_path has in the new version, None if it was removed."""
+        if old_path in self._old:
+            if old_path in self._new:
+                return old_path
+            return self.renamed.get(old_path) or self.moved.get(old_path)
+        # A prefix without a row of its own: the same if the new version still has it
+        return old_path if old_path in self._new_prefixes else None
+
+    def old_path(self, new_path):
+        """The path new_path had in the old version, None if it was added."""
+        if new_path in self._old:
+            return new_path
+        return self._old_of.get(new_path)
+
+    def summary(self):
+        return {'unchanged': len(self.unchanged), 'added': len(self.added), 'removed': len(self.removed),
+                'renamed': len(self.renamed), 'moved': len(self.moved)}
+
+
+def read_mapping_workbook(workbook):
+    """
+    Rows of a mapping workbook written by the mapping page (a path or file object).
+    Returns a list of dicts: sheet, src_levels (the filled LevelN_src values),
+    dest_field, tgt_levels (the filled LevelN_tgt values) and tgt_values
+    ({attribute column: value} from the *_tgt columns). The blank second header
+    row and the summary rows have no source levels and are skipped.
+    """
+    import openpyxl
+    wb = openpyxl.load_workbook(workbook, read_only=True, data_only=True)
+    rows = []
+    try:
+        for ws in wb.worksheets:
+            values = ws.iter_rows(values_only=True)
+            headers = [str(h) if h is not None else '' for h in next(values, ())]
+            if DESTINATION_HEADER not in headers:
+                continue
+            dest_idx = headers.index(DESTINATION_HEADER)
+            src_idx = [i for i, h in enumerate(headers) if re.fullmatch(r'Level\d+_src', h)]
+            tgt_idx = [i for i, h in enumerate(headers) if re.fullmatch(r'Level\d+_tgt', h)]
+            attr_idx = {h[:-len('_tgt')]: i for i, h in enumerate(headers)
+                        if h.endswith('_tgt') and i not in tgt_idx}
+
+            def cell(row, i):
+                value = row[i] if i < len(row) else None
+                return '' if value is None else str(value)
+
+            for row in values:
+                src_levels = [cell(row, i) for i in src_idx if cell(row, i).strip()]
+                if not src_levels:
+                    continue
+                rows.append({
+                    'sheet': ws.title,
+                    'src_levels': src_levels,
+                    'dest_field': cell(row, dest_idx).strip(),
+                    'tgt_levels': [cell(row, i) for i in tgt_idx if cell(row, i).strip()],
+                    'tgt_values': {col: cell(row, i) for col, i in attr_idx.items()},
+                })
+    finally:
+        wb.close()
+    return rows
+
+
+class IncrementalMappingPlan:
+    """
+    Decides, for every path of a new source schema, whether its previous mapping
+    row can be carried over or the field has to be matched again.
+
+    previous_rows come from read_mapping_workbook(); source_paths and
+    target_paths are level tuples of the new schemas, with the same case
+    conversion as the previous workbook. A row is carried over when its source
+    field is unchanged, renamed or moved and its destination still exists.
+    Renamed or moved destinations (then dest_changed is set) can only be told
+    apart from removed ones with previous_target_paths, the paths of the whole
+    previous target schema: the workbook only lists the mapped ones, and
+    diffing those would take unmapped target fields for renames. Without it a
+    destination must still exist under the same path. New fields, fields whose
+    destination disappeared and, with rematch_unmatched, fields left unmatched
+    before are listed in rematch.
+    """
+    def __init__(self, previous_rows, source_paths, target_paths, rematch_unmatched=False, previous_target_paths=None):
+        previous = {}
+        for row in previous_rows:
+            previous.setdefault(tuple(row['src_levels']), row)
+        self.source_diff = SchemaDiff(list(previous), source_paths)
+        target_paths = list(target_paths)
+        self.target_diff = SchemaDiff(previous_target_paths, target_paths) if previous_target_paths else None
+        new_targets = set(target_paths)
+        self.carried = {}
+        self.rematch = []
+        for path in dict.fromkeys(source_paths):
+            old_path = self.source_diff.old_path(path)
+            row = previous.get(old_path) if old_path is not None else None
+            if row is None or (not row['dest_field'] and rematch_unmatched):
+                self.rematch.append(path)
+                continue
+            if not row['dest_field']:
+                self.carried[path] = dict(row, dest_changed=False)
+                continue
+            old_dest = tuple(row['dest_field'].split('.'))
+            if self.target_diff is not None:
+                new_dest = self.target_diff.new_path(old_dest)
+            else:
+                new_dest = old_dest if old_dest in new_targets else None
+            if new_dest is None:
+                self.rematch.append(path)
+            else:
+                self.carried[path] = dict(row, dest_field='.'.join(new_dest), dest_changed=new_dest != old_dest)
@@ -5,11 +5,12 @@ Generates JSON schemas from JSON examples, extracting structure without repeatin
 """
 
 import json
-import re
-from typing import Dict, List, Any, Optional, Set
+from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 import logging
 
+from .json_to_schema_converter import FormatDetector, SchemaAccumulator
+
 
 @dataclass
 class SchemaField:
@@ -30,6 +31,28 @@ class SchemaField:
     maximum: Optional[float] = None
 
 
+TYPE_PATTERNS = {
+    'email': r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$',
+    'date': r'^\d{4}-\d{2}-\d{2}$',
+    'datetime': r'^\d{4}-\d{2}-\d{2}[T\s]\d{2}:\d{2}:\d{2}',
+    'uuid': r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$',
+    'url': r'^https?://[^\s/$.?#].[^\s]*$',
+    'ipv4': r'^(\d{1,3}\.){3}\d{1,3}$',
+    'ipv6': r'^([0-9a-fA-F]{1,4}:){7}[0-9a-fA-F]{1,4}$'
+}
+
+# Same order and results as matching TYPE_PATTERNS one by one, compiled once at import
+detect_example_format = FormatDetector([
+    ("email", lambda v: "@" in v, TYPE_PATTERNS['email']),
+    ("date", lambda v: len(v) >= 10 and v[4] == "-", TYPE_PATTERNS['date']),
+    ("date-time", lambda v: len(v) >= 19 and v[4] == "-", TYPE_PATTERNS['datetime']),
+    ("uuid", lambda v: len(v) >= 36 and v[8] == "-", TYPE_PATTERNS['uuid']),
+    ("uri", lambda v: v[0] == "h", TYPE_PATTERNS['url']),
+    ("ipv4", lambda v: v.count(".") == 3, TYPE_PATTERNS['ipv4']),
+    ("ipv6", lambda v: v.count(":") >= 7, TYPE_PATTERNS['ipv6']),
+])
+
+
 class JSONExampleToSchemaService:
     """
     Service for generating JSON schemas from JSON examples.
@@ -38,17 +61,8 @@ class JSONExampleToSchemaService:
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.processed_arrays = set()  # Track processed arrays to avoid repetition
         self.schema_cache = {}  # Cache for generated schemas
-        self.type_patterns = {
-            'email': r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$',
-            'date': r'^\d{4}-\d{2}-\d{2}$',
-            'datetime': r'^\d{4}-\d{2}-\d{2}[T\s]\d{2}:\d{2}:\d{2}',
-            'uuid': r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$',
-            'url': r'^https?://[^\s/$.?#].[^\s]*$',
-            'ipv4': r'^(\d{1,3}\.){3}\d{1,3}$',
-            'ipv6': r'^([0-9a-fA-F]{1,4}:){7}[0-9a-fA-F]{1,4}$'
-        }
+        self.type_patterns = dict(TYPE_PATTERNS)
     
     def generate_schema_from_example(self, json_example: str, schema_name: str = "GeneratedSchema") -> Dict[str, Any]:
         """
@@ -66,7 +80,6 @@ class JSONExampleToSchemaService:
             data = json.loads(json_example)
             
             # Reset tracking for new generation
-            self.processed_arrays.clear()
             self.schema_cache.clear()
             
             # Generate schema from the data
@@ -154,62 +167,89 @@ class JSONExampleToSchemaService:
         return schema
     
     def _generate_array_schema(self, arr: List, name: str, path: str) -> Dict[str, Any]:
-        """Generate schema for array, avoiding repetition of array fields."""
+        """Generate schema for array by merging all items into one item schema."""
         if not arr:
             return {
                 "type": "array",
                 "items": {"type": "object"}
             }
         
-        # Check if we've already processed this array structure
-        array_key = f"{path}:{len(arr)}"
-        if array_key in self.processed_arrays:
-            # Return a reference to avoid repetition
-            return {
-                "type": "array",
-                "items": {"$ref": f"#/definitions/{name}Array"}
-            }
+        # Fold every item in a single pass instead of comparing each one with the first
+        accumulator = SchemaAccumulator()
+        for item in arr:
+            accumulator.add(item, self._detect_string_format)
         
-        # Mark this array as processed
-        self.processed_arrays.add(array_key)
+        return {
+            "type": "array",
+            "items": self._generate_schema_from_accumulator(accumulator),
+            "minItems": 1,
+            "uniqueItems": self._has_unique_items(arr)
+        }
+    
+    def _generate_schema_from_accumulator(self, accumulator: SchemaAccumulator) -> Dict[str, Any]:
+        """
+        Generate schema for the merged values of one path.
+        Properties are required only when present and not null in every object, a type
+        seen together with null becomes nullable and different types become anyOf.
+        """
+        types = [t for t in accumulator.types if t != "null"]
+        if "integer" in types and "number" in types:
+            types.remove("integer")
+        if not types:
+            return {"type": "null"}
         
-        # Generate schema for the first item (representative)
-        first_item = arr[0]
-        items_schema = self._generate_schema_from_data(first_item, f"{name}Item", f"{path}[0]")
+        schemas = [self._generate_merged_type_schema(accumulator, t) for t in types]
+        nullable = "null" in accumulator.types
+        if len(schemas) == 1:
+            schema = schemas[0]
+            if nullable:
+                schema["type"] = [schema["type"], "null"]
+            return schema
+        if nullable:
+            schemas.append({"type": "null"})
+        return {"anyOf": schemas}
+    
+    def _generate_merged_type_schema(self, accumulator: SchemaAccumulator, json_type: str) -> Dict[str, Any]:
+        """Generate schema for one of the types seen at a merged path."""
+        if json_type == "object":
+            schema = {"type": "object", "properties": {}}
+            for key, child in accumulator.properties.items():
+                if accumulator.present[key]:  # Skip properties that were only ever null
+                    schema["properties"][key] = self._generate_schema_from_accumulator(child)
+            required = [key for key, count in accumulator.present.items()
+                        if count == accumulator.objects]
+            if required:
+                schema["required"] = required
+            return schema
         
-        # Check if all items have the same structure
-        uniform_structure = all(
-            self._compare_structures(first_item, item) 
-            for item in arr[1:]
-        )
+        if json_type == "array":
+            if accumulator.items is None:
+                return {"type": "array", "items": {"type": "object"}}
+            schema = {"type": "array", "items": self._generate_schema_from_accumulator(accumulator.items)}
+            if accumulator.min_items:
+                schema["minItems"] = 1
+            return schema
         
-        if uniform_structure:
-            return {
-                "type": "array",
-                "items": items_schema,
-                "minItems": 1,
-                "uniqueItems": self._has_unique_items(arr)
-            }
-        else:
-            # Mixed array - use oneOf for different item types
-            item_schemas = []
-            for i, item in enumerate(arr):
-                item_schema = self._generate_schema_from_data(item, f"{name}Item{i}", f"{path}[{i}]")
-                if item_schema not in item_schemas:
-                    item_schemas.append(item_schema)
-            
-            if len(item_schemas) == 1:
-                return {
-                    "type": "array",
-                    "items": item_schemas[0]
-                }
-            else:
-                return {
-                    "type": "array",
-                    "items": {
-                        "oneOf": item_schemas
-                    }
-                }
+        if json_type in ("integer", "number"):
+            schema = {"type": json_type}
+            if accumulator.minimum >= 0:
+                schema["minimum"] = 0
+            return schema
+        
+        if json_type == "string":
+            schema = {"type": "string"}
+            detected_format = accumulator.string_format
+            if detected_format:
+                schema["format"] = detected_format
+            if accumulator.min_length:
+                schema["minLength"] = 1
+            if accumulator.max_length:
+                schema["maxLength"] = accumulator.max_length * 2  # Allow some flexibility
+            if detected_format in ("email", "date", "uuid"):
+                schema["pattern"] = self.type_patterns[detected_format]
+            return schema
+        
+        return {"type": json_type}
     
     def _generate_primitive_schema(self, value: Any, name: str, path: str) -> Dict[str, Any]:
         """Generate schema for primitive values with type detection and constraints."""
@@ -263,55 +303,7 @@ class JSONExampleToSchemaService:
     
     def _detect_string_format(self, value: str) -> Optional[str]:
         """Detect the format of a string value."""
-        import re
-        
-        # Check for email
-        if re.match(self.type_patterns["email"], value):
-            return "email"
-        
-        # Check for date
-        if re.match(self.type_patterns["date"], value):
-            return "date"
-        
-        # Check for datetime
-        if re.match(self.type_patterns["datetime"], value):
-            return "date-time"
-        
-        # Check for UUID
-        if re.match(self.type_patterns["uuid"], value):
-            return "uuid"
-        
-        # Check for URL
-        if re.match(self.type_patterns["url"], value):
-            return "uri"
-        
-        # Check for IPv4
-        if re.match(self.type_patterns["ipv4"], value):
-            return "ipv4"
-        
-        # Check for IPv6
-        if re.match(self.type_patterns["ipv6"], value):
-            return "ipv6"
-        
-        return None
-    
-    def _compare_structures(self, obj1: Any, obj2: Any) -> bool:
-        """Compare if two objects have the same structure."""
-        if type(obj1) != type(obj2):
-            return False
-        
-        if isinstance(obj1, dict):
-            if set(obj1.keys()) != set(obj2.keys()):
-                return False
-            return all(self._compare_structures(obj1[k], obj2[k]) for k in obj1.keys())
-        
-        elif isinstance(obj1, list):
-            if len(obj1) != len(obj2):
-                return False
-            return all(self._compare_structures(obj1[i], obj2[i]) for i in range(len(obj1)))
-        
-        else:
-            return True
+        return detect_example_format(value)
     
     def _has_unique_items(self, arr: List) -> bool:
         """Check if array has unique items."""
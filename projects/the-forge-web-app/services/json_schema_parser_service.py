@@ -9,6 +9,9 @@ from typing import Dict, List, Any, Optional
 
 
 class JSONSchemaParser:
+    # Bump whenever the produced rows change, so cached parse results are invalidated
+    PARSER_VERSION = 1
+
     def __init__(self, max_level=8):
         self.max_level = max_level
         self.schema_cache = {}  # Cache for resolved references
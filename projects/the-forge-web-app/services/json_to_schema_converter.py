@@ -1,16 +1,276 @@
 import json
+import os
+import random
 import re
-from typing import Any, Dict, List, Set, Optional
+from typing import Any, Callable, Dict, Iterator, Optional
 from jsonschema import validate, ValidationError
 
 
-class JSONToSchemaConverter:
+class JSONRecordStream:
     """
-    Service for converting JSON examples to JSON schemas.
+    Incrementally decode the records of a JSON file without loading it whole.
+    
+    With ndjson, every whitespace separated JSON value is a record (NDJSON / JSON Lines),
+    whatever its type. Otherwise a top-level array yields its items one at a time
+    (is_array is True), and anything else is read as whitespace separated values too;
+    a single top-level object is then one record and is decoded whole, so only arrays
+    and NDJSON are streamed. Only the record being decoded is held in memory, plus a
+    read buffer of about chunk_size characters.
+    """
+    
+    def __init__(self, fp, chunk_size: int = 1 << 20, ndjson: bool = False):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self.is_array = not ndjson and self._skip_whitespace() and self._buffer[self._pos] == "["
+        if self.is_array:
+            self._pos += 1
+    
+    def _read_more(self, size: int = 0) -> bool:
+        """Append at least one chunk, and at least size unread characters in all; False at end of input."""
+        chunks = []
+        missing = size - (len(self._buffer) - self._pos)
+        while True:
+            chunk = self.fp.read(self.chunk_size)
+            if not chunk:
+                self._eof = True
+                break
+            chunks.append(chunk)
+            missing -= len(chunk)
+            if missing <= 0:
+                break
+        if not chunks:
+            return False
+        self._buffer = self._buffer[self._pos:] + "".join(chunks)
+        self._pos = 0
+        return True
+    
+    def _skip_whitespace(self) -> bool:
+        """Advance to the next non-whitespace character; False at end of input."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return True
+            if not self._read_more():
+                return False
+    
+    def _cut_by_buffer_end(self, error: json.JSONDecodeError) -> bool:
+        # Unterminated strings are reported where they start; any other value cut by the
+        # end of the buffer fails within the length of a literal or escape of the end
+        return error.msg.startswith("Unterminated string") or error.pos >= len(self._buffer) - 6
+    
+    def _decode_value(self) -> Any:
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                # Retry only a record cut by the buffer end, with at least twice as much of
+                # it read, so a long record is decoded a logarithmic number of times
+                if self._cut_by_buffer_end(e) and self._read_more(2 * (len(self._buffer) - self._pos)):
+                    continue
+                raise
+            # A value ending at (or a '.', 'e' or exponent sign before) the end of the
+            # buffer may be a number cut by the chunk boundary
+            if end >= len(self._buffer) - 2 and not self._eof and self._read_more():
+                continue
+            self._pos = end
+            return value
+    
+    def __iter__(self) -> Iterator[Any]:
+        if not self.is_array:
+            while self._skip_whitespace():
+                yield self._decode_value()
+            return
+        
+        expect_value = True
+        while self._skip_whitespace():
+            char = self._buffer[self._pos]
+            if char == "]":
+                self._pos += 1
+                if self._skip_whitespace():
+                    raise json.JSONDecodeError("Extra data", self._buffer, self._pos)
+                return
+            if char == "," and not expect_value:
+                self._pos += 1
+                expect_value = True
+                continue
+            if not expect_value:
+                raise json.JSONDecodeError("Expecting ',' delimiter", self._buffer, self._pos)
+            yield self._decode_value()
+            expect_value = False
+        raise json.JSONDecodeError("Unterminated array", self._buffer, self._pos)
+
+
+class FormatDetector:
+    """
+    Ordered string format checks with their regexes compiled once.
+    
+    Each check is (format, prefilter, pattern[, flags]). The prefilter is a cheap test
+    that every matching value passes (a required character, length or prefix), so most
+    values are rejected without running the regex at all. The first matching format wins.
     """
     
+    def __init__(self, checks):
+        self.checks = [(check[0], check[1], re.compile(check[2], *check[3:])) for check in checks]
+    
+    def __call__(self, value: str) -> Optional[str]:
+        if not value:
+            return None
+        for format_name, prefilter, regex in self.checks:
+            if prefilter(value) and regex.match(value):
+                return format_name
+        return None
+
+
+EMAIL_PATTERN = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
+
+detect_string_format = FormatDetector([
+    ("email", lambda v: "@" in v, EMAIL_PATTERN),
+    ("date", lambda v: len(v) >= 10 and v[4] == "-", r"^\d{4}-\d{2}-\d{2}$"),
+    ("date-time", lambda v: len(v) >= 19 and v[10] == "T", r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}"),
+    ("uuid", lambda v: len(v) >= 36 and v[8] == "-", r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.IGNORECASE),
+    ("uri", lambda v: v[0] == "h", r"^https?://"),
+    ("ipv4", lambda v: v.count(".") == 3, r"^(\d{1,3}\.){3}\d{1,3}$"),
+    ("ipv6", lambda v: ":" in v, r"^[0-9a-fA-F:]+$"),
+])
+
+
+class SchemaAccumulator:
+    """
+    Type, format, minimum and structure statistics for one path of a JSON document.
+    
+    Values are folded in one at a time with add(); child paths (object properties and
+    array items) get their own accumulators, so memory grows with the number of distinct
+    paths rather than with the number of values seen. to_schema() turns the statistics
+    into a JSON schema in the same shape JSONToSchemaConverter produces for one value.
+    
+    String formats are detected only until they are settled: not at all once two
+    strings disagree, and no more after format_check_limit strings agreed.
+    """
+    
+    format_check_limit = 100
+    
     def __init__(self):
-        self.processed_arrays: Set[str] = set()
+        self.types: Dict[str, int] = {}  # JSON type -> occurrences, in first-seen order
+        self.minimum = None
+        self.string_format: Optional[str] = None
+        self.format_checks = 0
+        self.min_length: Optional[int] = None
+        self.max_length = 0
+        self.objects = 0
+        self.properties: Dict[str, "SchemaAccumulator"] = {}
+        self.present: Dict[str, int] = {}  # property -> objects where it is not null
+        self.min_items: Optional[int] = None
+        self.items: Optional["SchemaAccumulator"] = None
+    
+    def add(self, value: Any, detect_format: Callable[[str], Optional[str]]):
+        if value is None:
+            json_type = "null"
+        elif isinstance(value, bool):
+            json_type = "boolean"
+        elif isinstance(value, (int, float)):
+            json_type = "integer" if isinstance(value, int) else "number"
+            self.minimum = value if self.minimum is None else min(self.minimum, value)
+        elif isinstance(value, str):
+            json_type = "string"
+            # A format survives only while every string at this path has it
+            if "string" not in self.types:
+                self.string_format = detect_format(value)
+                self.format_checks = 1
+            elif self.string_format is not None and self.format_checks < self.format_check_limit:
+                self.format_checks += 1
+                if detect_format(value) != self.string_format:
+                    self.string_format = None
+            self.min_length = len(value) if self.min_length is None else min(self.min_length, len(value))
+            self.max_length = max(self.max_length, len(value))
+        elif isinstance(value, list):
+            json_type = "array"
+            self.min_items = len(value) if self.min_items is None else min(self.min_items, len(value))
+            if value and self.items is None:
+                self.items = SchemaAccumulator()
+            for item in value:
+                self.items.add(item, detect_format)
+        elif isinstance(value, dict):
+            json_type = "object"
+            self.objects += 1
+            for key, child in value.items():
+                if key not in self.properties:
+                    self.properties[key] = SchemaAccumulator()
+                    self.present[key] = 0
+                self.properties[key].add(child, detect_format)
+                if child is not None:
+                    self.present[key] += 1
+        else:
+            json_type = "string"
+        self.types[json_type] = self.types.get(json_type, 0) + 1
+    
+    def to_schema(self) -> Dict[str, Any]:
+        types = list(self.types)
+        if "integer" in types and "number" in types:
+            types.remove("integer")
+        if not types:
+            return {}
+        nullable = "null" in types and len(types) > 1
+        if nullable:
+            types.remove("null")
+        schemas = [self._type_schema(json_type) for json_type in types]
+        if len(schemas) == 1:
+            schema = schemas[0]
+            if nullable:
+                schema["type"] = [schema["type"], "null"]
+            return schema
+        if nullable:
+            schemas.append({"type": "null"})
+        return {"anyOf": schemas}
+    
+    def _type_schema(self, json_type: str) -> Dict[str, Any]:
+        if json_type in ("integer", "number"):
+            schema = {"type": json_type}
+            if self.minimum >= 0:
+                schema["minimum"] = 0
+            return schema
+        
+        if json_type == "string":
+            schema = {"type": "string"}
+            if self.string_format:
+                schema["format"] = self.string_format
+            if self.min_length:
+                schema["minLength"] = 1
+            if self.max_length:
+                schema["maxLength"] = self.max_length
+                if self.string_format == "email":
+                    schema["pattern"] = EMAIL_PATTERN
+            return schema
+        
+        if json_type == "array":
+            if self.items is None:
+                return {"type": "array", "items": {}}
+            schema = {"type": "array", "items": self.items.to_schema()}
+            if self.min_items:
+                schema["minItems"] = 1
+            schema["uniqueItems"] = True
+            return schema
+        
+        if json_type == "object":
+            properties = {key: child.to_schema() for key, child in self.properties.items()}
+            # Required only when present and not null in every object seen at this path
+            required = [key for key, count in self.present.items() if count == self.objects]
+            schema = {"type": "object", "properties": properties}
+            if required:
+                schema["required"] = required
+            return schema
+        
+        return {"type": json_type}
+
+
+class JSONToSchemaConverter:
+    """
+    Service for converting JSON examples to JSON schemas.
+    """
     
     def convert_json_example_to_schema(self, json_data: Any, schema_name: str = "GeneratedSchema") -> Dict[str, Any]:
         """
@@ -23,8 +283,6 @@ class JSONToSchemaConverter:
         Returns:
             Dict containing the generated JSON schema
         """
-        self.processed_arrays.clear()
-        
         if isinstance(json_data, dict):
             schema = {
                 "$schema": "http://json-schema.org/draft-07/schema#",
@@ -49,12 +307,14 @@ class JSONToSchemaConverter:
                     "title": schema_name
                 }
             
-            # Use the first item as template
-            item_schema = self._generate_schema_from_data(json_data[0], "item")
+            # Fold every item into one schema instead of templating on the first
+            accumulator = SchemaAccumulator()
+            for item in json_data:
+                accumulator.add(item, self._detect_string_format)
             return {
                 "$schema": "http://json-schema.org/draft-07/schema#",
                 "type": "array",
-                "items": item_schema,
+                "items": accumulator.to_schema(),
                 "title": schema_name,
                 "minItems": 1,
                 "uniqueItems": True
@@ -66,6 +326,87 @@ class JSONToSchemaConverter:
             schema["title"] = schema_name
             return schema
     
+    def convert_json_stream_to_schema(self, source, schema_name: str = "GeneratedSchema",
+                                      sample_size: Optional[int] = None, seed: Optional[int] = None,
+                                      ndjson: bool = False) -> Dict[str, Any]:
+        """
+        Infer a JSON schema from a large JSON or NDJSON file in constant memory.
+        
+        Records (the items of a top-level array, or the values of an NDJSON / JSON Lines
+        file) are decoded one at a time and their per-path type and format statistics
+        are merged as they arrive, so every record contributes, not just the first one.
+        With sample_size, a uniform reservoir sample of that many records is kept and
+        only the sample is merged, which bounds the work for very long logs. A top-level
+        object is a single record and is decoded whole.
+        
+        Args:
+            source: Path or text file object of the JSON data
+            schema_name: Name for the generated schema
+            sample_size: Number of records to sample (None merges every record)
+            seed: Random seed for the reservoir sample
+            ndjson: Read every line as a record, even when the records are arrays
+            
+        Returns:
+            Dict containing the generated JSON schema: an array schema for a top-level
+            array, otherwise the schema of one record
+        """
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'r', encoding='utf-8') as f:
+                return self.convert_json_stream_to_schema(f, schema_name, sample_size, seed, ndjson)
+        
+        stream = JSONRecordStream(source, ndjson=ndjson)
+        accumulator = SchemaAccumulator()
+        records = 0
+        if sample_size:
+            rng = random.Random(seed)
+            reservoir = []
+            for record in stream:
+                records += 1
+                if len(reservoir) < sample_size:
+                    reservoir.append(record)
+                else:
+                    slot = rng.randrange(records)
+                    if slot < sample_size:
+                        reservoir[slot] = record
+            for record in reservoir:
+                accumulator.add(record, self._detect_string_format)
+        else:
+            for record in stream:
+                records += 1
+                accumulator.add(record, self._detect_string_format)
+        
+        if stream.is_array:
+            if records == 0:
+                return {
+                    "$schema": "http://json-schema.org/draft-07/schema#",
+                    "type": "array",
+                    "items": {},
+                    "title": schema_name
+                }
+            return {
+                "$schema": "http://json-schema.org/draft-07/schema#",
+                "type": "array",
+                "items": accumulator.to_schema(),
+                "title": schema_name,
+                "minItems": 1,
+                "uniqueItems": True
+            }
+        
+        if records == 0:
+            raise ValueError("No JSON records found")
+        schema = accumulator.to_schema()
+        if schema.get("type") == "object":
+            return {
+                "$schema": "http://json-schema.org/draft-07/schema#",
+                "type": "object",
+                "title": schema_name,
+                "properties": schema["properties"],
+                "required": schema.get("required", [])
+            }
+        schema["$schema"] = "http://json-schema.org/draft-07/schema#"
+        schema["title"] = schema_name
+        return schema
+    
     def _generate_schema_from_data(self, data: Any, name: str = "root", path: str = "") -> Dict[str, Any]:
         """
         Recursively generate schema from data structure.
@@ -77,16 +418,16 @@ class JSONToSchemaConverter:
             return {"type": "boolean"}
         
         if isinstance(data, int):
-            return {
-                "type": "integer",
-                "minimum": 0 if data >= 0 else None
-            }
+            schema = {"type": "integer"}
+            if data >= 0:
+                schema["minimum"] = 0
+            return schema
         
         if isinstance(data, float):
-            return {
-                "type": "number",
-                "minimum": 0 if data >= 0 else None
-            }
+            schema = {"type": "number"}
+            if data >= 0:
+                schema["minimum"] = 0
+            return schema
         
         if isinstance(data, str):
             schema = {"type": "string"}
@@ -103,40 +444,15 @@ class JSONToSchemaConverter:
                 
                 # Add pattern for email
                 if format_type == "email":
-                    schema["pattern"] = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
+                    schema["pattern"] = EMAIL_PATTERN
             
             return schema
         
         if isinstance(data, list):
-            array_key = f"{path}.{name}" if path else name
-            
-            # Check if we've already processed this array structure
-            if array_key in self.processed_arrays:
-                return {"type": "array", "items": {}}  # Avoid repetition
-            
-            self.processed_arrays.add(array_key)
-            
-            if len(data) == 0:
-                return {"type": "array", "items": {}}
-            
-            # Use the first item as template, but check for consistency
-            first_item_schema = self._generate_schema_from_data(data[0], "item", array_key)
-            
-            # Check if all items have the same structure
-            consistent = True
-            for item in data[1:]:
-                if not self._compare_structures(first_item_schema, self._generate_schema_from_data(item, "item", array_key)):
-                    consistent = False
-                    break
-            
-            schema = {
-                "type": "array",
-                "items": first_item_schema,
-                "minItems": 1,
-                "uniqueItems": True
-            }
-            
-            return schema
+            # One pass over all items: property sets, nullable types and lengths are merged per path
+            accumulator = SchemaAccumulator()
+            accumulator.add(data, self._detect_string_format)
+            return accumulator.to_schema()
         
         if isinstance(data, dict):
             properties = {}
@@ -160,52 +476,7 @@ class JSONToSchemaConverter:
         """
         Detect the format of a string value.
         """
-        if not value:
-            return None
-        
-        # Email
-        if re.match(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$", value):
-            return "email"
-        
-        # Date (ISO format)
-        if re.match(r"^\d{4}-\d{2}-\d{2}$", value):
-            return "date"
-        
-        # DateTime (ISO format)
-        if re.match(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}", value):
-            return "date-time"
-        
-        # UUID
-        if re.match(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", value, re.IGNORECASE):
-            return "uuid"
-        
-        # URL
-        if re.match(r"^https?://", value):
-            return "uri"
-        
-        # IPv4
-        if re.match(r"^(\d{1,3}\.){3}\d{1,3}$", value):
-            return "ipv4"
-        
-        # IPv6
-        if ":" in value and re.match(r"^[0-9a-fA-F:]+$", value):
-            return "ipv6"
-        
-        return None
-    
-    def _compare_structures(self, schema1: Dict[str, Any], schema2: Dict[str, Any]) -> bool:
-        """
-        Compare two schema structures for consistency.
-        """
-        if schema1.get("type") != schema2.get("type"):
-            return False
-        
-        if schema1.get("type") == "object":
-            props1 = set(schema1.get("properties", {}).keys())
-            props2 = set(schema2.get("properties", {}).keys())
-            return props1 == props2
-        
-        return True
+        return detect_string_format(value)
     
     def validate_schema(self, schema: Dict[str, Any]) -> bool:
         """
@@ -223,7 +494,13 @@ class JSONToSchemaConverter:
         """
         Create a minimal test instance from a schema that satisfies all constraints.
         """
+        if "anyOf" in schema:
+            return self._create_test_instance(schema["anyOf"][0])
+        
         schema_type = schema.get("type")
+        if isinstance(schema_type, list):
+            # Nullable type: build an instance of the non-null type
+            schema_type = schema_type[0]
         
         if schema_type == "object":
             instance = {}
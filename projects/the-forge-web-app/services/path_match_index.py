@@ -0,0 +1,125 @@
+import difflib
+import heapq
+
+from .similarity_engine import SimilarityEngine, length_bound
+
+
+class PathMatchIndex:
+    """
+    Q-gram inverted index over a list of target paths.
+
+    Built once per target schema, it shortlists the few candidates that share
+    the most distinctive q-grams (or the same leaf name) with a source path and
+    scores those first with the similarity engine (difflib's ratio by default).
+    The other targets are then visited from the closest length outwards and only
+    scored while their length (and, for difflib, quick_ratio) bound can still
+    reach the n-th best score, so get_close_matches() returns exactly what
+    difflib.get_close_matches over all targets would. With a SynonymTable, a target whose canonical
+    form equals one of the source's forms is returned first without any
+    scoring (SynonymTable.pick decides between the targets found).
+    """
+    def __init__(self, paths, q=3, shortlist_size=40, max_gram_share=0.2, engine=None, synonyms=None):
+        self.paths = list(paths)
+        self.engine = engine or SimilarityEngine('sequence')
+        self.synonyms = synonyms if synonyms else None
+        self.canonical = {}
+        if self.synonyms:
+            for path in self.paths:
+                self.canonical.setdefault(self.synonyms.canonical(path), []).append(path)
+        self.q = q
+        self.shortlist_size = shortlist_size
+        self.grams = {}
+        self.leaves = {}
+        by_length = {}
+        for idx, path in enumerate(self.paths):
+            by_length.setdefault(len(path), []).append(idx)
+            for gram in self._grams(path):
+                self.grams.setdefault(gram, []).append(idx)
+            leaf = self._leaf(path)
+            if leaf:
+                self.leaves.setdefault(leaf, []).append(idx)
+        self.by_length = sorted(by_length.items())
+        # Grams shared by a large part of the targets (common prefixes, separators)
+        # do not discriminate and would make every lookup touch the whole list
+        max_postings = max(shortlist_size, int(len(self.paths) * max_gram_share))
+        self.grams = {gram: ids for gram, ids in self.grams.items() if len(ids) <= max_postings}
+
+    def _grams(self, text):
+        # Case-sensitive on purpose: SequenceMatcher scores are case-sensitive too
+        if len(text) <= self.q:
+            return {text} if text else set()
+        return {text[i:i+self.q] for i in range(len(text) - self.q + 1)}
+
+    @staticmethod
+    def _leaf(path):
+        parts = [part for part in path.replace('/', '.').split('.') if part]
+        return parts[-1].lower() if parts else ''
+
+    def candidates(self, word):
+        """Return the indexes of the target paths worth scoring against word."""
+        counts = {}
+        for gram in self._grams(word):
+            for idx in self.grams.get(gram, ()):
+                counts[idx] = counts.get(idx, 0) + 1
+        shortlist = set(heapq.nlargest(self.shortlist_size, counts, key=lambda idx: (counts[idx], -idx)))
+        shortlist.update(self.leaves.get(self._leaf(word), ()))
+        return shortlist
+
+    def get_close_matches(self, word, n=3, cutoff=0.6):
+        """Same contract and result as difflib.get_close_matches over all target paths."""
+        synonym = None
+        if self.synonyms:
+            synonyms = [path for form in self.synonyms.forms(word) for path in self.canonical.get(form, ())]
+            if synonyms:
+                synonym = self.synonyms.pick(word, synonyms, self.engine)
+        if synonym is not None and n == 1:
+            return [synonym]
+        matches = self._close_matches(word, n, cutoff)
+        if synonym is not None:
+            matches = [synonym] + [match for match in matches if match != synonym][:n - 1]
+        return matches
+
+    def _close_matches(self, word, n, cutoff):
+        if not self.engine.length_bounded:
+            return self.engine.close_matches(word, self.paths, n, cutoff)
+        if not n > 0:
+            raise ValueError("n must be > 0: %r" % (n,))
+        if not 0.0 <= cutoff <= 1.0:
+            raise ValueError("cutoff must be in [0.0, 1.0]: %r" % (cutoff,))
+        if self.engine.name == 'sequence':
+            # Scored like difflib.get_close_matches: word is seq2, analysed once
+            matcher = difflib.SequenceMatcher(None, '', word)
+
+            def score(path, bar):
+                matcher.set_seq1(path)
+                if matcher.quick_ratio() < bar:
+                    return 0.0
+                return matcher.ratio()
+        else:
+            def score(path, bar):
+                return self.engine.score(word, path)
+        # The n best (score, path) pairs so far; ties go to the larger path, as in difflib
+        best = []
+
+        def consider(path):
+            bar = best[0][0] if len(best) == n else cutoff
+            sim = score(path, bar)
+            if sim >= cutoff:
+                if len(best) < n:
+                    heapq.heappush(best, (sim, path))
+                elif (sim, path) > best[0]:
+                    heapq.heapreplace(best, (sim, path))
+
+        shortlist = self.candidates(word)
+        for idx in sorted(shortlist):
+            consider(self.paths[idx])
+        word_len = len(word)
+        for bound, indexes in sorted(((length_bound(word_len, length), indexes) for length, indexes in self.by_length),
+                                     key=lambda item: -item[0]):
+            # The small margin keeps bounds that round differently from pruning a tie
+            if bound + 1e-9 < (best[0][0] if len(best) == n else cutoff):
+                break
+            for idx in indexes:
+                if idx not in shortlist:
+                    consider(self.paths[idx])
+        return [path for sim, path in sorted(best, reverse=True)]
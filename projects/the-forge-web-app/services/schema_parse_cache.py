@@ -0,0 +1,83 @@
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+
+
+def estimate_size(value):
+    """Rough memory footprint in bytes of nested lists/tuples/dicts of plain values."""
+    total = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set)):
+            stack.extend(item)
+    return total
+
+
+class SchemaParseCache:
+    """
+    Content-addressed LRU cache of parsed schema rows.
+
+    Entries are keyed by the SHA-256 of the uploaded bytes plus the parser
+    settings that shape the rows (parser kind, PARSER_VERSION, max_level, ...),
+    so the same file uploaded again on a rerun is never parsed twice while any
+    setting change misses. Least recently used entries are evicted once the
+    estimated size of all entries exceeds max_bytes.
+    Cached rows are shared between callers and must be treated as read-only.
+    """
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(content, settings):
+        return (hashlib.sha256(content).hexdigest(),) + tuple(settings)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return  # Larger than the whole budget: parse it every time instead
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+
+    def get_or_parse(self, content, settings, parse):
+        """Return the cached result for (content, settings), calling parse() on a miss."""
+        key = self.make_key(content, settings)
+        value = self.get(key)
+        if value is None:
+            value = parse()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,55 @@
+import importlib
+import threading
+import time
+
+
+class ServiceRegistry:
+    """
+    Dict-like registry that imports and constructs each service on first use.
+
+    Services are declared as name -> (module, class name); neither the module
+    nor its dependencies (openpyxl, jsonschema, lxml, ...) are imported until a
+    page asks for the service, so the home page renders without paying for
+    them. The import and construction time of every service is recorded, along
+    with any other startup step passed to record(), for timing_report().
+    """
+    def __init__(self, specs):
+        self._specs = dict(specs)
+        self._instances = {}
+        self._lock = threading.Lock()
+        self.timings = {}  # step -> seconds
+
+    def __getitem__(self, name):
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        module_name, class_name = self._specs[name]
+        with self._lock:
+            if name not in self._instances:
+                start = time.perf_counter()
+                service_class = getattr(importlib.import_module(module_name), class_name)
+                self._instances[name] = service_class()
+                self.timings[f"service:{name}"] = time.perf_counter() - start
+            return self._instances[name]
+
+    def get(self, name, default=None):
+        if name not in self._specs:
+            return default
+        return self[name]
+
+    def __contains__(self, name):
+        return name in self._specs
+
+    def __len__(self):
+        return len(self._specs)
+
+    def is_loaded(self, name):
+        return name in self._instances
+
+    def record(self, step, seconds):
+        """Record the duration of a startup step; only the first (cold) value is kept."""
+        self.timings.setdefault(step, seconds)
+
+    def timing_report(self):
+        """Rows of (step, milliseconds) in the order the steps happened."""
+        return [(step, round(seconds * 1000, 1)) for step, seconds in self.timings.items()]
@@ -0,0 +1,65 @@
+"""
+XML parsing backend shared by the XSD/XML services.
+
+Uses lxml when it is installed (C parser, several times faster on large
+schemas, line numbers in syntax errors) and falls back to
+xml.etree.ElementTree otherwise. Either way callers get elements with the
+ElementTree API; comments and processing instructions are dropped, as
+ElementTree does, so iterating a tree only ever yields elements.
+"""
+import xml.etree.ElementTree as ET
+
+try:
+    from lxml import etree as lxml_etree
+    LXML_AVAILABLE = True
+except ImportError:
+    lxml_etree = None
+    LXML_AVAILABLE = False
+
+BACKEND = 'lxml' if LXML_AVAILABLE else 'etree'
+
+# Catch this instead of ET.ParseError so both backends' syntax errors are handled
+ParseError = (ET.ParseError, lxml_etree.XMLSyntaxError) if LXML_AVAILABLE else ET.ParseError
+
+
+def _lxml_parser(encoding=None):
+    return lxml_etree.XMLParser(
+        encoding=encoding,
+        remove_comments=True,
+        remove_pis=True,
+        resolve_entities=False,
+        no_network=True,
+        huge_tree=True,
+    )
+
+
+def parse_file(path):
+    """Parse an XML file and return its root element."""
+    if LXML_AVAILABLE:
+        return lxml_etree.parse(path, _lxml_parser()).getroot()
+    return ET.parse(path).getroot()
+
+
+def parse_string(content):
+    """Parse XML from a str or bytes and return its root element."""
+    if LXML_AVAILABLE:
+        if isinstance(content, str):
+            # lxml rejects str input with an encoding declaration; the text is already decoded
+            return lxml_etree.fromstring(content.encode('utf-8'), _lxml_parser('utf-8'))
+        return lxml_etree.fromstring(content, _lxml_parser())
+    return ET.fromstring(content)
+
+
+def iterparse(source, events=('end',)):
+    """Incrementally parse an XML file path or binary file object, yielding (event, element)."""
+    if LXML_AVAILABLE:
+        return lxml_etree.iterparse(
+            source,
+            events=events,
+            remove_comments=True,
+            remove_pis=True,
+            resolve_entities=False,
+            no_network=True,
+            huge_tree=True,
+        )
+    return ET.iterparse(source, events=events)
@@ -1,6 +1,7 @@
 import xml.etree.ElementTree as ET
 from typing import Dict, List, Set, Any, Optional
 import re
+from .xml_backend import iterparse, parse_string, ParseError
 
 
 class XMLToXSDConverter:
@@ -25,84 +26,147 @@ class XMLToXSDConverter:
         Returns:
             String containing the generated XSD schema
         """
-        self.processed_elements.clear()
-        self.element_types.clear()
-        self.complex_types.clear()
-        self.simple_types.clear()
+        self._reset()
         
         try:
             # Parse XML
-            root = ET.fromstring(xml_data)
+            root = parse_string(xml_data)
             
             # Analyze XML structure
-            self._analyze_element(root, "root")
+            self._analyze_events(self._walk_events(root))
             
             # Generate XSD
             xsd_content = self._generate_xsd_content(schema_name, root.tag)
             
             return xsd_content
             
-        except ET.ParseError as e:
+        except ParseError as e:
             raise ValueError(f"Invalid XML: {str(e)}")
     
-    def _analyze_element(self, element: ET.Element, path: str):
-        """
-        Recursively analyze XML element structure.
+    def convert_xml_file_to_xsd(self, source, schema_name: str = "GeneratedSchema") -> str:
         """
-        element_name = element.tag
-        full_path = f"{path}.{element_name}" if path != "root" else element_name
-        
-        # Check if we've already processed this element structure
-        if full_path in self.processed_elements:
-            return
-        
-        self.processed_elements.add(full_path)
-        
-        # Analyze attributes
-        attributes = {}
-        for attr_name, attr_value in element.attrib.items():
-            attr_type = self._detect_attribute_type(attr_value)
-            attributes[attr_name] = {
-                "type": attr_type,
-                "value": attr_value
-            }
+        Convert an XML example file to an XSD schema without loading the whole document.
         
-        # Analyze child elements
-        child_elements = {}
-        child_counts = {}
+        The file is read with iterparse and every element is discarded once its end tag
+        has been analyzed, so memory grows with the number of distinct element paths
+        rather than with the document size. Produces the same XSD as
+        convert_xml_example_to_xsd.
         
-        for child in element:
-            child_name = child.tag
-            if child_name not in child_elements:
-                child_elements[child_name] = []
-                child_counts[child_name] = 0
-            
-            child_elements[child_name].append(child)
-            child_counts[child_name] += 1
+        Args:
+            source: Path or binary file object of the XML example
+            schema_name: Name for the generated schema
             
-            # Recursively analyze child
-            self._analyze_element(child, full_path)
+        Returns:
+            String containing the generated XSD schema
+        """
+        self._reset()
+        
+        try:
+            root_tag = self._analyze_events(iterparse(source, events=('start', 'end')), release=True)
+        except ParseError as e:
+            raise ValueError(f"Invalid XML: {str(e)}")
+        if root_tag is None:
+            raise ValueError("Invalid XML: no root element")
+        
+        return self._generate_xsd_content(schema_name, root_tag)
+    
+    def _reset(self):
+        self.processed_elements.clear()
+        self.element_types.clear()
+        self.complex_types.clear()
+        self.simple_types.clear()
+    
+    @staticmethod
+    def _walk_events(root: ET.Element):
+        """
+        Yield iterparse-style ('start'/'end', element) events for an in-memory tree.
+        """
+        stack = [(root, iter(root))]
+        yield 'start', root
+        while stack:
+            element, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                yield 'end', element
+            else:
+                stack.append((child, iter(child)))
+                yield 'start', child
+    
+    def _analyze_events(self, events, release: bool = False):
+        """
+        Analyze the XML structure from a stream of ('start'/'end', element) events.
         
+        Only the first occurrence of each element path is analyzed, together with its
+        subtree; later occurrences are skipped like the earlier recursive analysis did.
+        Attributes are read on 'start', text and child counts are complete on 'end'.
+        With release=True every element is cleared and detached from its parent after
+        its 'end' event. Returns the root element tag.
+        """
+        root_tag = None
+        stack = []
+        for event, element in events:
+            if event == 'start':
+                element_name = element.tag
+                if not stack:
+                    root_tag = element_name
+                    full_path = element_name
+                    active = True
+                else:
+                    parent = stack[-1]
+                    full_path = f"{parent['path']}.{element_name}" if parent['path'] != "root" else element_name
+                    active = parent['active']
+                    if active:
+                        parent['counts'][element_name] = parent['counts'].get(element_name, 0) + 1
+                
+                # Check if we've already processed this element structure
+                active = active and full_path not in self.processed_elements
+                attributes = {}
+                if active:
+                    self.processed_elements.add(full_path)
+                    # Analyze attributes
+                    for attr_name, attr_value in element.attrib.items():
+                        attr_type = self._detect_attribute_type(attr_value)
+                        attributes[attr_name] = {
+                            "type": attr_type,
+                            "value": attr_value
+                        }
+                stack.append({'path': full_path, 'active': active, 'attributes': attributes,
+                              'counts': {}, 'element': element})
+            else:
+                frame = stack.pop()
+                if frame['active']:
+                    self._record_element(frame['path'], frame['attributes'], frame['counts'], element.text)
+                if release:
+                    element.clear()
+                    # Earlier siblings are gone already, so this is the parent's first child
+                    if stack:
+                        del stack[-1]['element'][0]
+        return root_tag
+    
+    def _record_element(self, full_path: str, attributes: Dict[str, Any], child_counts: Dict[str, int], text: Optional[str]):
+        """
+        Classify an analyzed element as empty, simple or complex.
+        """
         # Determine element type
-        if len(child_elements) == 0 and not element.text:
+        if len(child_counts) == 0 and not text:
             # Empty element
             element_type = "empty"
-        elif len(child_elements) == 0 and element.text and element.text.strip():
+        elif len(child_counts) == 0 and text and text.strip():
             # Simple element with text content
             element_type = "simple"
-            text_type = self._detect_text_type(element.text.strip())
+            text_type = self._detect_text_type(text.strip())
             self.simple_types[full_path] = {
                 "type": text_type,
-                "value": element.text.strip()
+                "value": text.strip()
             }
         else:
             # Complex element with children
             element_type = "complex"
             self.complex_types[full_path] = {
                 "attributes": attributes,
-                "children": child_elements,
                 "counts": child_counts,
-                "has_text": bool(element.text and element.text.strip())
+                "has_text": bool(text and text.strip())
             }
         
         self.element_types[full_path] = element_type
@@ -223,9 +287,7 @@ class XMLToXSDConverter:
         ]
         
         # Add child elements
-        for child_name, children in complex_type["children"].items():
-            child_count = complex_type["counts"][child_name]
-            
+        for child_name, child_count in complex_type["counts"].items():
             if child_count == 1:
                 # Single occurrence
                 lines.append(f'      <xs:element name="{child_name}" type="tns:{child_name}Type"/>')
@@ -279,9 +341,9 @@ class XMLToXSDConverter:
         Basic validation of generated XSD.
         """
         try:
-            ET.fromstring(xsd_content)
+            parse_string(xsd_content)
             return True
-        except ET.ParseError:
+        except ParseError:
             return False
     
     def get_schema_statistics(self, xsd_content: str) -> Dict[str, int]:
@@ -289,7 +351,7 @@ class XMLToXSDConverter:
         Get statistics about a generated XSD schema.
         """
         try:
-            root = ET.fromstring(xsd_content)
+            root = parse_string(xsd_content)
             stats = {
                 'total_elements': 0,
                 'complex_types': 0,
@@ -300,7 +362,7 @@ class XMLToXSDConverter:
             
             self._analyze_xsd_schema(root, stats, 0)
             return stats
-        except ET.ParseError:
+        except ParseError:
             return {
                 'total_elements': 0,
                 'complex_types': 0,
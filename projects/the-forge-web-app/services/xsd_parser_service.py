@@ -1,11 +1,83 @@
-import xml.etree.ElementTree as ET
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .xml_backend import parse_file, parse_string
 
 XSD_NS = '{http://www.w3.org/2001/XMLSchema}'
 
+
+class SchemaModel:
+    """
+    Indexed view of an XSD document built in a single walk over the tree.
+
+    Holds the named simple types (base + restriction facets), named complex
+    types, global elements, named groups and named attribute groups so every
+    parse entry point can share one compiled model instead of re-scanning.
+    """
+    def __init__(self, root):
+        self.root = root
+        self.simple_types = {}
+        self.complex_types = {}
+        self.groups = {}
+        self.attribute_groups = {}
+        # Relative row templates of expanded named complexTypes, filled lazily by XSDParser
+        self.type_templates = {}
+        self.elements = [child for child in root if child.tag == XSD_NS+'element']
+        self.global_elements = {el.get('name'): el for el in self.elements if el.get('name')}
+        for node in root.iter():
+            tag = node.tag
+            if not isinstance(tag, str) or not tag.startswith(XSD_NS):
+                continue
+            name = node.get('name')
+            if not name:
+                continue
+            local = tag[len(XSD_NS):]
+            if local == 'simpleType':
+                self.simple_types[name] = self._compile_simple_type(node)
+            elif local == 'complexType':
+                self.complex_types[name] = node
+            elif local == 'group':
+                self.groups[name] = node
+            elif local == 'attributeGroup':
+                self.attribute_groups[name] = node
+
+    @staticmethod
+    def _compile_simple_type(st):
+        restriction = st.find(XSD_NS+'restriction')
+        base = restriction.get('base') if restriction is not None else None
+        restrictions = {}
+        if restriction is not None:
+            for cons in restriction:
+                cons_name = cons.tag.replace(XSD_NS, '')
+                val = cons.get('value')
+                if val:
+                    restrictions[cons_name] = val
+        return {'base': base, 'restrictions': restrictions}
+
+
+class TypeExpansion:
+    """
+    Bookkeeping for named complexType expansion during one parse.
+
+    templates caches the rows of each fully expanded named type relative to
+    its parent element so later references only re-base them; stack holds the
+    named types currently being expanded and is used to cut recursive types.
+    """
+    def __init__(self, templates=None):
+        self.templates = templates if templates is not None else {}
+        self.stack = []
+        self.cutoffs = 0
+
+
 class XSDParser:
-    def __init__(self, max_level=8):
+    # Bump whenever the produced rows change, so cached parse results are invalidated
+    PARSER_VERSION = 1
+
+    def __init__(self, max_level=8, type_recursion_limit=1):
         self.max_level = max_level
+        # How many times one named complexType may be open on the expansion
+        # stack; deeper self references are replaced by a marker row
+        self.type_recursion_limit = type_recursion_limit
 
     def get_attr(self, el, attr, default=None):
         return el.get(attr) if el.get(attr) is not None else default
@@ -104,8 +176,65 @@ class XSDParser:
                 return doc.text or ''
         return ''
 
-    def parse_complex_type_children(self, complex_type, complex_types, simple_types, level, parent_path, req_param, category='element'):
+    def expand_named_type(self, type_name, complex_types, simple_types, level, parent_path, req_param, category='element', expansion=None):
+        """
+        Expand the children of a named complexType under parent_path.
+
+        Fully expanded types are cached as rows relative to their parent and
+        re-based on every later reference. A type that re-enters its own
+        expansion more than type_recursion_limit times yields a single marker
+        row instead of recursing.
+        """
+        if expansion is None:
+            expansion = TypeExpansion()
+        if expansion.stack.count(type_name) >= self.type_recursion_limit:
+            expansion.cutoffs += 1
+            return [self._recursion_marker_row(type_name, parent_path, req_param)]
+        key = (type_name, req_param, self.max_level)
+        template = expansion.templates.get(key)
+        if template is None:
+            cutoffs = expansion.cutoffs
+            expansion.stack.append(type_name)
+            try:
+                rel_rows = self.parse_complex_type_children(
+                    complex_types[type_name], complex_types, simple_types, level, [], req_param, category, expansion)
+            finally:
+                expansion.stack.pop()
+            template = [([lvl for lvl in row['levels'] if lvl], row) for row in rel_rows]
+            # Expansions cut by a recursion marker depend on the enclosing
+            # stack, so only self-contained expansions are reused
+            if expansion.cutoffs == cutoffs:
+                expansion.templates[key] = template
+        return self._rebase_rows(template, parent_path)
+
+    def _rebase_rows(self, template, parent_path):
+        rows = []
+        for rel_path, rel_row in template:
+            path = parent_path + rel_path
+            row = dict(rel_row)
+            row['levels'] = path[:self.max_level] + [''] * (self.max_level - len(path))
+            rows.append(row)
+        return rows
+
+    def _recursion_marker_row(self, type_name, parent_path, req_param):
+        path = parent_path + [f'<{type_name}>']
+        return {
+            'levels': path[:self.max_level] + [''] * (self.max_level - len(path)),
+            'Request Parameter': req_param,
+            'GDPR': '',
+            'Cardinality': '',
+            'Type': type_name,
+            'Base Type': '',
+            'Details': '',
+            'Description': f"Recursive reference to complexType '{type_name}' (expansion stopped)",
+            'Category': 'recursion',
+            'Example': ''
+        }
+
+    def parse_complex_type_children(self, complex_type, complex_types, simple_types, level, parent_path, req_param, category='element', expansion=None):
         """Parse all children of a complexType, including inherited ones"""
+        if expansion is None:
+            expansion = TypeExpansion()
         rows = []
         
         # First, check if this complexType extends another one
@@ -115,15 +244,16 @@ class XSDParser:
                 if ext is not None:
                     base_type_name = ext.get('base')
                     if base_type_name and base_type_name in complex_types:
-                        # Recursively parse the base type first
-                        base_rows = self.parse_complex_type_children(
-                            complex_types[base_type_name], 
+                        # Expand the base type first
+                        base_rows = self.expand_named_type(
+                            base_type_name, 
                             complex_types, 
                             simple_types, 
                             level, 
                             parent_path, 
                             req_param, 
-                            category
+                            category,
+                            expansion
                         )
                         rows.extend(base_rows)
                     
@@ -132,7 +262,7 @@ class XSDParser:
                         if ext_child.tag == XSD_NS+'sequence':
                             for seq_child in ext_child:
                                 if seq_child.tag == XSD_NS+'element':
-                                    rows.extend(self.parse_element(seq_child, complex_types, simple_types, level+1, parent_path, req_param, 'element'))
+                                    rows.extend(self.parse_element(seq_child, complex_types, simple_types, level+1, parent_path, req_param, 'element', expansion))
                                 elif seq_child.tag == XSD_NS+'attribute':
                                     rows.extend(self.parse_attribute(seq_child, parent_path, req_param, complex_types, simple_types))
                         elif ext_child.tag == XSD_NS+'attribute':
@@ -144,7 +274,7 @@ class XSDParser:
             if child.tag == XSD_NS+'sequence':
                 for seq_child in child:
                     if seq_child.tag == XSD_NS+'element':
-                        rows.extend(self.parse_element(seq_child, complex_types, simple_types, level+1, parent_path, req_param, 'element'))
+                        rows.extend(self.parse_element(seq_child, complex_types, simple_types, level+1, parent_path, req_param, 'element', expansion))
                     elif seq_child.tag == XSD_NS+'attribute':
                         rows.extend(self.parse_attribute(seq_child, parent_path, req_param, complex_types, simple_types))
             elif child.tag == XSD_NS+'attribute':
@@ -158,9 +288,11 @@ class XSDParser:
         
         return rows
 
-    def parse_element(self, element, complex_types, simple_types, level=1, parent_path=None, req_param='Body', category='element'):
+    def parse_element(self, element, complex_types, simple_types, level=1, parent_path=None, req_param='Body', category='element', expansion=None):
         if parent_path is None:
             parent_path = []
+        if expansion is None:
+            expansion = TypeExpansion()
         rows = []
         name = self.get_attr(element, 'name')
         if not name:
@@ -181,12 +313,11 @@ class XSDParser:
         rows.append(row)
         type_name = self.get_type(element, simple_types)
         if type_name and type_name in complex_types:
-            ct = complex_types[type_name]
-            # Use the new method to parse complex type children (including inheritance)
-            rows.extend(self.parse_complex_type_children(ct, complex_types, simple_types, level, path, req_param, category))
+            # Named types are expanded once and re-based (including inheritance)
+            rows.extend(self.expand_named_type(type_name, complex_types, simple_types, level, path, req_param, category, expansion))
         else:
             for ct in element.findall(XSD_NS+'complexType'):
-                rows.extend(self.parse_complex_type_children(ct, complex_types, simple_types, level, path, req_param, category))
+                rows.extend(self.parse_complex_type_children(ct, complex_types, simple_types, level, path, req_param, category, expansion))
         # Direct attributes on the element itself (not in complexType)
         for child in element:
             if child.tag == XSD_NS+'attribute':
@@ -212,99 +343,91 @@ class XSDParser:
         }
         return [row]
 
-    def parse_xsd_file(self, xsd_path):
-        tree = ET.parse(xsd_path)
-        root = tree.getroot()
-        # Collect all simpleTypes and their restrictions
-        simple_types = {}
-        for st in root.findall(f'.//{XSD_NS}simpleType'):
-            name = st.get('name')
-            if not name:
-                continue
-            restriction = st.find(XSD_NS+'restriction')
-            base = restriction.get('base') if restriction is not None else None
-            restrictions = {}
-            if restriction is not None:
-                for cons in restriction:
-                    cons_name = cons.tag.replace(XSD_NS, '')
-                    val = cons.get('value')
-                    if val:
-                        restrictions[cons_name] = val
-            simple_types[name] = {'base': base, 'restrictions': restrictions}
-        complex_types = {ct.get('name'): ct for ct in root.findall(f'.//{XSD_NS}complexType') if ct.get('name')}
+    def build_schema_model(self, root):
+        """Compile an XSD root element into a SchemaModel in a single tree walk."""
+        return SchemaModel(root)
+
+    def load_schema_model(self, xsd_path):
+        """Parse an XSD file and compile its SchemaModel."""
+        return self.build_schema_model(parse_file(xsd_path))
+
+    def parse_schema_model(self, model):
+        """Return the rows of every global element in a compiled SchemaModel."""
         rows = []
-        for elem in root.findall(f'{XSD_NS}element'):
-            rows.extend(self.parse_element(elem, complex_types, simple_types, 1, category='message'))
+        expansion = TypeExpansion(model.type_templates)
+        for elem in model.elements:
+            rows.extend(self.parse_element(elem, model.complex_types, model.simple_types, 1, category='message', expansion=expansion))
         return rows
 
-    def parse_xsd_directory(self, dir_path):
+    def parse_xsd_file(self, xsd_path):
+        return self.parse_schema_model(self.load_schema_model(xsd_path))
+
+    def iter_xsd_directory(self, dir_path, workers=None, file_names=None):
+        """
+        Parse every .xsd file in dir_path (or the given file_names in it) and yield
+        (file_name, rows, error) as each file completes. Files are parsed in a process
+        pool of `workers` processes (default: CPU count); workers=1 parses them one by
+        one in this process. A file that fails yields its error message instead of
+        stopping the others.
+        """
+        if file_names is None:
+            file_names = [fname for fname in os.listdir(dir_path) if fname.lower().endswith('.xsd')]
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(file_names) <= 1:
+            for fname in file_names:
+                yield _parse_xsd_file_task(self.max_level, self.type_recursion_limit, dir_path, fname)
+            return
+        with ProcessPoolExecutor(max_workers=min(workers, len(file_names))) as pool:
+            futures = [pool.submit(_parse_xsd_file_task, self.max_level, self.type_recursion_limit, dir_path, fname)
+                       for fname in file_names]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def parse_xsd_directory(self, dir_path, workers=None, progress=None, errors=None):
+        """
+        Parse every .xsd file in dir_path into {sheet name: rows}, keeping the directory order.
+        progress(done, total, file_name, error) is called as each file completes; files that
+        fail are left out of the result and, if an errors dict is given, recorded in it as
+        {file_name: message}.
+        """
+        order = [fname for fname in os.listdir(dir_path) if fname.lower().endswith('.xsd')]
+        parsed = {}
+        for done, (fname, rows, error) in enumerate(self.iter_xsd_directory(dir_path, workers, order), 1):
+            if error is None:
+                parsed[fname] = rows
+            elif errors is not None:
+                errors[fname] = error
+            if progress:
+                progress(done, len(order), fname, error)
         result = {}
-        for fname in os.listdir(dir_path):
-            if fname.lower().endswith('.xsd'):
-                xsd_path = os.path.join(dir_path, fname)
-                rows = self.parse_xsd_file(xsd_path)
+        for fname in order:
+            if fname in parsed:
                 sheet_name = os.path.splitext(fname)[0]
-                result[sheet_name] = rows
+                result[sheet_name] = parsed[fname]
         return result
 
     def parse_xsd_string(self, xsd_string):
-        root = ET.fromstring(xsd_string)
-        # Collect all simpleTypes and their restrictions
-        simple_types = {}
-        for st in root.findall(f'.//{XSD_NS}simpleType'):
-            name = st.get('name')
-            if not name:
-                continue
-            restriction = st.find(XSD_NS+'restriction')
-            base = restriction.get('base') if restriction is not None else None
-            restrictions = {}
-            if restriction is not None:
-                for cons in restriction:
-                    cons_name = cons.tag.replace(XSD_NS, '')
-                    val = cons.get('value')
-                    if val:
-                        restrictions[cons_name] = val
-            simple_types[name] = {'base': base, 'restrictions': restrictions}
-        complex_types = {ct.get('name'): ct for ct in root.findall(f'.//{XSD_NS}complexType') if ct.get('name')}
-        rows = []
-        for elem in root.findall(f'{XSD_NS}element'):
-            rows.extend(self.parse_element(elem, complex_types, simple_types, 1, category='message'))
-        return rows 
+        return self.parse_schema_model(self.build_schema_model(parse_string(xsd_string)))
 
-    def parse_xsd_file_by_messages(self, xsd_path):
+    def parse_xsd_file_by_messages(self, xsd_path, model=None):
         """
         Parse XSD file and group results by message/element name.
         Returns a dictionary where keys are message names and values are lists of rows.
+        An already compiled SchemaModel can be passed to skip re-reading the file.
         """
-        tree = ET.parse(xsd_path)
-        root = tree.getroot()
-        # Collect all simpleTypes and their restrictions
-        simple_types = {}
-        for st in root.findall(f'.//{XSD_NS}simpleType'):
-            name = st.get('name')
-            if not name:
-                continue
-            restriction = st.find(XSD_NS+'restriction')
-            base = restriction.get('base') if restriction is not None else None
-            restrictions = {}
-            if restriction is not None:
-                for cons in restriction:
-                    cons_name = cons.tag.replace(XSD_NS, '')
-                    val = cons.get('value')
-                    if val:
-                        restrictions[cons_name] = val
-            simple_types[name] = {'base': base, 'restrictions': restrictions}
-        complex_types = {ct.get('name'): ct for ct in root.findall(f'.//{XSD_NS}complexType') if ct.get('name')}
+        if model is None:
+            model = self.load_schema_model(xsd_path)
         
         # Group rows by element name
         messages = {}
-        for elem in root.findall(f'{XSD_NS}element'):
+        expansion = TypeExpansion(model.type_templates)
+        for elem in model.elements:
             element_name = self.get_attr(elem, 'name')
             if not element_name:
                 continue
             
             # Parse this element's rows
-            rows = self.parse_element(elem, complex_types, simple_types, 1, category='message')
+            rows = self.parse_element(elem, model.complex_types, model.simple_types, 1, category='message', expansion=expansion)
             
             # Use element name as sheet name (sanitized for Excel)
             sheet_name = self._sanitize_sheet_name(element_name)
@@ -331,4 +454,13 @@ class XSDParser:
         if not sanitized:
             sanitized = "Sheet"
         
-        return sanitized 
\ No newline at end of file
+        return sanitized 
+
+
+def _parse_xsd_file_task(max_level, type_recursion_limit, dir_path, fname):
+    """Worker entry point for iter_xsd_directory; returns (file_name, rows, error)."""
+    try:
+        parser = XSDParser(max_level, type_recursion_limit)
+        return fname, parser.parse_xsd_file(os.path.join(dir_path, fname)), None
+    except Exception as e:
+        return fname, None, f"{type(e).__name__}: {e}"
@@ -2,6 +2,7 @@ import json
 import xml.etree.ElementTree as ET
 from typing import Dict, Any, List, Optional
 import re
+from .xml_backend import parse_string
 
 
 class XSDToJSONSchemaConverter:
@@ -55,7 +56,7 @@ class XSDToJSONSchemaConverter:
         """
         try:
             # Parse XSD
-            root = ET.fromstring(xsd_content)
+            root = parse_string(xsd_content)
             
             # Find the root element
             root_element = self._find_root_element(root)
@@ -2,6 +2,7 @@ import xml.etree.ElementTree as ET
 from typing import Dict, List, Any, Optional
 import random
 import string
+from .xml_backend import parse_string, ParseError
 
 
 class XSDToXMLConverter:
@@ -29,7 +30,7 @@ class XSDToXMLConverter:
         """
         try:
             # Parse XSD
-            root = ET.fromstring(xsd_content)
+            root = parse_string(xsd_content)
             
             # Extract namespace information
             self._extract_namespaces(root)
@@ -49,7 +50,7 @@ class XSDToXMLConverter:
             
             return xml_example
             
-        except ET.ParseError as e:
+        except ParseError as e:
             raise ValueError(f"Invalid XSD: {str(e)}")
     
     def _extract_namespaces(self, root: ET.Element):
@@ -328,9 +329,9 @@ class XSDToXMLConverter:
         Basic validation of generated XML.
         """
         try:
-            ET.fromstring(xml_content)
+            parse_string(xml_content)
             return True
-        except ET.ParseError:
+        except ParseError:
             return False
     
     def get_example_statistics(self, xml_content: str) -> Dict[str, int]:
@@ -338,7 +339,7 @@ class XSDToXMLConverter:
         Get statistics about a generated XML example.
         """
         try:
-            root = ET.fromstring(xml_content)
+            root = parse_string(xml_content)
             stats = {
                 'total_elements': 0,
                 'attributes': 0,
@@ -348,7 +349,7 @@ class XSDToXMLConverter:
             
             self._analyze_xml_example(root, stats, 0)
             return stats
-        except ET.ParseError:
+        except ParseError:
             return {
                 'total_elements': 0,
                 'attributes': 0,
@@ -0,0 +1,45 @@
+"""
+Tests for the one-to-one assignment of ExcelMappingService.
+"""
+
+import itertools
+
+from services.excel_mapping_service import ExcelMappingService
+
+
+def _brute_force_total(service, source_paths, target_paths, min_score=0.3):
+    """Best total score over every one-to-one assignment, sources allowed to stay unmapped."""
+    score = {}
+    for i, src in enumerate(source_paths):
+        for j, tgt in enumerate(target_paths):
+            value = service._field_score(service._field_name(src).lower(), service._field_name(tgt).lower())
+            if value > min_score:
+                score[i, j] = value
+    best = 0.0
+    options = [None] + list(range(len(target_paths)))
+    for choice in itertools.product(options, repeat=len(source_paths)):
+        picked = [j for j in choice if j is not None]
+        if len(picked) != len(set(picked)) or any(j is not None and (i, j) not in score for i, j in enumerate(choice)):
+            continue
+        best = max(best, sum(score[i, j] for i, j in enumerate(choice) if j is not None))
+    return best
+
+
+def _total(rows):
+    return sum(float(row['Match Score']) for row in rows if row['Source Path'] and row['Target Path'])
+
+
+def test_optimal_assignment_matches_brute_force():
+    service = ExcelMappingService()
+    source = {'username': 'x', 'user': 'x', 'order': {'total': 'x', 'qty': 'x'}}
+    target = {'user': 'x', 'usernames': 'x', 'order': {'totals': 'x', 'quantity': 'x', 'note': 'x'}}
+    source_paths, target_paths = service.flatten_schema(source), service.flatten_schema(target)
+
+    optimal = service.generate_mapping_from_schemas(source, target, assignment='optimal')
+    greedy = service.generate_mapping_from_schemas(source, target)
+
+    assigned = service.assign_paths(source_paths, target_paths)
+    assert abs(sum(score for _, score in assigned.values()) - _brute_force_total(service, source_paths, target_paths)) < 1e-9
+    assert _total(greedy) < _total(optimal)
+    mapped = [row['Target Path'] for row in optimal if row['Source Path'] and row['Target Path']]
+    assert len(mapped) == len(set(mapped))
@@ -0,0 +1,28 @@
+"""
+Tests for the q-gram PathMatchIndex.
+"""
+
+import difflib
+from pathlib import Path
+
+from services.path_match_index import PathMatchIndex
+from services.xsd_parser_service import XSDParser
+
+ASSETS = Path(__file__).resolve().parents[2] / 'the-forge' / 'dev' / 'the-forge-v5.0.0-dev' / 'assets'
+
+
+def _paths(xsd_path):
+    return list(dict.fromkeys('.'.join(row['levels']) for row in XSDParser().parse_xsd_file(str(xsd_path))))
+
+
+def test_close_matches_equal_difflib_on_real_schemas():
+    source = _paths(ASSETS / 'UtilityArena_WSDLToXSD.xsd')
+    target = _paths(ASSETS / 'outputs' / 'merged.xsd')
+    index = PathMatchIndex(target)
+    # Its best match shares few q-grams with it and is not on the shortlist
+    queries = [path for path in source if path.startswith('SalesOrderBulkRequest.SalesOrder.Partner.Address.Communication.')]
+    queries += source[::7]
+
+    for query in queries:
+        assert index.get_close_matches(query, n=1) == difflib.get_close_matches(query, target, n=1), query
+        assert index.get_close_matches(query, n=4, cutoff=0.3) == difflib.get_close_matches(query, target, n=4, cutoff=0.3), query
@@ -13,6 +13,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.core.schema_processor import SchemaProcessor
 from src.core.mapping_engine import MappingEngine
+from src.core.similarity_engine import SynonymTable
 from src.core.excel_generator import ExcelGenerator
 from src.core.converter import SchemaConverter
 from src.utils.path_utils import PathUtils
@@ -186,7 +187,7 @@ def handle_mapping(args) -> None:
     
     try:
         processor = SchemaProcessor()
-        engine = MappingEngine(threshold=args.threshold)
+        engine = MappingEngine(threshold=args.threshold, synonyms=SynonymTable())
         generator = ExcelGenerator()
         
         # Extract fields from both schemas
@@ -5,6 +5,7 @@ Mapping engine for creating correspondences between schema fields.
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 from .schema_processor import SchemaField
+from .similarity_engine import SimilarityEngine, CandidateIndex, SynonymTable
 
 
 @dataclass
@@ -20,28 +21,12 @@ class MappingResult:
 class MappingEngine:
     """Handles mapping between schema fields using similarity algorithms."""
     
-    def __init__(self, threshold: float = 0.7):
+    def __init__(self, threshold: float = 0.7, scorer: str = 'levenshtein',
+                 synonyms: Optional[SynonymTable] = None):
         self.threshold = threshold
-        self._setup_similarity_function()
-    
-    def _setup_similarity_function(self):
-        """Setup the similarity function with fallback."""
-        try:
-            from Levenshtein import ratio as levenshtein_ratio
-            self._similarity_func = levenshtein_ratio
-        except ImportError:
-            self._similarity_func = self._fallback_similarity
-    
-    def _fallback_similarity(self, a: str, b: str) -> float:
-        """Fallback similarity function using common prefix ratio."""
-        min_len = min(len(a), len(b))
-        common = 0
-        for i in range(min_len):
-            if a[i] == b[i]:
-                common += 1
-            else:
-                break
-        return common / max(len(a), len(b)) if max(len(a), len(b)) > 0 else 0
+        self.engine = SimilarityEngine(scorer)
+        self.synonyms = synonyms
+        self._similarity_func = self.engine.score
     
     def normalize_levels(self, levels: List[str]) -> List[str]:
         """Normalize field levels for comparison."""
@@ -62,56 +47,45 @@ class MappingEngine:
     def map_fields(self, source_fields: List[SchemaField], 
                    target_fields: List[SchemaField]) -> List[MappingResult]:
         """Map source fields to target fields based on similarity."""
-        # Build normalized path lists
+        # Build normalized path lists, once per field
         source_paths = [self.normalized_path_from_levels(f.levels) for f in source_fields]
         target_paths = [self.normalized_path_from_levels(f.levels) for f in target_fields]
         
-        # Create field maps for lookup
-        source_field_map = {self.normalized_path_from_levels(f.levels): f for f in source_fields}
-        target_field_map = {self.normalized_path_from_levels(f.levels): f for f in target_fields}
+        # Create field map for lookup
+        target_field_map = dict(zip(target_paths, target_fields))
+        
+        # Exact and learned-synonym matches come from the index's dicts; only the rest are fuzzy scored
+        targets = CandidateIndex(target_paths, self.engine, synonyms=self.synonyms)
         
         mapping = []
         
         for s_path, s_field in zip(source_paths, source_fields):
-            # Try exact match first
-            exact_match = None
-            for t_path in target_paths:
-                if s_path == t_path:
-                    exact_match = t_path
-                    break
+            t_path, sim = targets.best_match(s_path)
             
-            if exact_match:
+            if t_path == s_path:
                 mapping.append(MappingResult(
                     source=s_path,
-                    target=exact_match,
+                    target=t_path,
                     similarity=1.0,
                     source_field=s_field,
-                    target_field=target_field_map[exact_match]
+                    target_field=target_field_map[t_path]
+                ))
+            elif t_path is not None and sim >= self.threshold:
+                mapping.append(MappingResult(
+                    source=s_path,
+                    target=t_path,
+                    similarity=round(sim, 3),
+                    source_field=s_field,
+                    target_field=target_field_map.get(t_path)
                 ))
             else:
-                # Find best similarity match
-                best_match = ('', 0.0)
-                for t_path in target_paths:
-                    sim = self._similarity_func(s_path, t_path)
-                    if sim > best_match[1]:
-                        best_match = (t_path, sim)
-                
-                if best_match[1] >= self.threshold:
-                    mapping.append(MappingResult(
-                        source=s_path,
-                        target=best_match[0],
-                        similarity=round(best_match[1], 3),
-                        source_field=s_field,
-                        target_field=target_field_map.get(best_match[0])
-                    ))
-                else:
-                    mapping.append(MappingResult(
-                        source=s_path,
-                        target='',
-                        similarity=0.0,
-                        source_field=s_field,
-                        target_field=None
-                    ))
+                mapping.append(MappingResult(
+                    source=s_path,
+                    target='',
+                    similarity=0.0,
+                    source_field=s_field,
+                    target_field=None
+                ))
         
         return mapping
     
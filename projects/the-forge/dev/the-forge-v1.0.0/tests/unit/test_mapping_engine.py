@@ -0,0 +1,117 @@
+"""
+Unit tests for the MappingEngine class.
+"""
+
+from src.core.mapping_engine import MappingEngine
+from src.core.schema_processor import SchemaField
+from src.core.similarity_engine import SimilarityEngine, CandidateIndex, SynonymTable
+
+
+def _field(*levels):
+    return SchemaField(levels=list(levels), type='string', description='', cardinality='1', details='')
+
+
+class TestMappingEngine:
+    """Test cases for MappingEngine."""
+
+    def test_map_fields_exact_and_fuzzy(self):
+        """Test exact, normalized-exact, fuzzy and unmatched fields."""
+        engine = MappingEngine(threshold=0.7)
+        source = [_field('Order', 'Id'), _field('order', 'item', 'code'), _field('order', 'customerName'), _field('zzz')]
+        target = [_field('order', 'id'), _field('order', '[]', 'code'), _field('order', 'customer_name')]
+
+        mapping = engine.map_fields(source, target)
+
+        assert [(m.target, m.similarity) for m in mapping[:2]] == [('order.id', 1.0), ('order.arrayitem.code', 1.0)]
+        assert mapping[1].target_field is target[1]
+        assert mapping[2].target == 'order.customer_name' and 0.7 <= mapping[2].similarity < 1.0
+        assert (mapping[3].target, mapping[3].similarity, mapping[3].target_field) == ('', 0.0, None)
+
+    def test_candidate_index_matches_full_scan(self):
+        """Test that the pruned lookup returns the same best match as scoring every target."""
+        targets = ['a.b.name', 'a.b.names', 'a.c.name', 'x.name', 'a.b.nome', 'order.total']
+        engine = SimilarityEngine('levenshtein')
+        index = CandidateIndex(targets, engine)
+
+        for query in ['a.b.nam', 'a.c.name', 'b.name', 'order.totals', 'q']:
+            expected = (query, 1.0) if query in targets else engine.best_match(query, targets)
+            assert index.best_match(query) == expected
+
+    def test_map_fields_learned_synonyms(self, temp_dir):
+        """Test that learned synonyms map without fuzzy scoring and persist."""
+        import os
+        path = os.path.join(temp_dir, 'synonyms.json.gz')
+        synonyms = SynonymTable(path)
+        assert synonyms.learn('custNo', 'customerNumber')
+        assert synonyms.learn('vendor', 'supplier')
+        assert not synonyms.learn('vendor', 'supplier')
+        synonyms.save()
+
+        engine = MappingEngine(threshold=0.9, synonyms=SynonymTable(path))
+        source = [_field('order', 'custNo'), _field('order', 'vendor')]
+        target = [_field('order', 'customerNumber'), _field('order', 'supplier')]
+
+        mapping = engine.map_fields(source, target)
+
+        assert [(m.target, m.similarity) for m in mapping] == [('order.customernumber', 1.0), ('order.supplier', 1.0)]
+
+    def test_candidate_index_prefers_case_insensitive_synonym(self, temp_dir):
+        """Test that of several synonymous candidates the one equal but for case wins."""
+        import os
+        synonyms = SynonymTable(os.path.join(temp_dir, 'synonyms.json.gz'))
+        synonyms.learn('Id', 'customerId')
+        index = CandidateIndex(['Order.customerId', 'Order.Id'], SimilarityEngine('levenshtein'), synonyms=synonyms)
+
+        assert index.best_match('Order.ID') == ('Order.Id', 1.0)
+        assert index.best_match('Order.customer_id') == ('Order.customerId', 1.0)
+
+    def test_synonym_table_shared_between_threads(self, temp_dir):
+        """Test that concurrent learn and save calls on one table lose nothing."""
+        import os
+        from concurrent.futures import ThreadPoolExecutor
+        path = os.path.join(temp_dir, 'synonyms.json.gz')
+        synonyms = SynonymTable(path)
+
+        def learn(n):
+            synonyms.learn(f'src{n}', f'target{n}')
+            synonyms.save()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(learn, range(200)))
+
+        loaded = SynonymTable(path)
+        assert all(loaded.synonymous(f'src{n}', f'target{n}') for n in range(200))
+
+    def test_learn_workbook_keeps_unrelated_fields_apart(self, temp_dir):
+        """Test that rows mapped to a structure or a shared destination teach nothing and pairs stay pairwise."""
+        import os
+        import openpyxl
+        path = os.path.join(temp_dir, 'mapping.xlsx')
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.append(['Level1_src', 'Level2_src', 'Destination Fields'])
+        for row in [('Header', None, 'Root.Header'), ('Header', 'CompanyCode', 'Root.Header'),
+                    ('Header', 'Plant', 'Root.Header'), ('Header', 'Currency', 'Root.Header.Currency'),
+                    ('Header', 'Qty', 'Root.Header.Quantity'), ('Header', 'Vendor', 'Root.Header.Supplier'),
+                    ('Header', 'Supplier', 'Root.Header.Creditor')]:
+            ws.append(list(row))
+        wb.save(path)
+        synonyms = SynonymTable(os.path.join(temp_dir, 'synonyms.json.gz'))
+
+        assert synonyms.learn_workbook(path) == 3
+
+        assert synonyms.synonymous('Header.Vendor', 'Header.Supplier')
+        assert synonyms.canonical_name('lineQty') == 'linequantity'
+        assert not synonyms.synonymous('Vendor', 'Creditor')
+        assert not synonyms.synonymous('CompanyCode', 'Plant')
+        assert not synonyms.synonymous('Plant', 'Header')
+        index = CandidateIndex(['Header.CompanyCode', 'Header.Plnt'], SimilarityEngine('sequence'), synonyms=synonyms)
+        assert index.best_match('Header.Plant')[0] == 'Header.Plnt'
+
+    def test_score_many_matches_score(self):
+        """Test that batch scoring keeps exactly the pairs scoring above min_score."""
+        candidates = ['customer', 'customerName', 'name', 'nome', 'id', 'orderTotal']
+        for scorer in ['sequence', 'levenshtein', 'jaro_winkler']:
+            engine = SimilarityEngine(scorer)
+            expected = [(c, engine.score(c, 'customername')) for c in candidates if engine.score(c, 'customername') > 0.4]
+            assert list(engine.score_many(candidates, 'customername', 0.4)) == expected
@@ -60,19 +60,11 @@ def extract_paths_from_xsd(filepath, keep_case=False):
     return paths
 
 # --- Heurística de correspondência ---
-try:
-    from Levenshtein import ratio as levenshtein_ratio
-except ImportError:
-    def levenshtein_ratio(a, b):
-        # Fallback simples: proporção de prefixo comum
-        min_len = min(len(a), len(b))
-        common = 0
-        for i in range(min_len):
-            if a[i] == b[i]:
-                common += 1
-            else:
-                break
-        return common / max(len(a), len(b)) if max(len(a), len(b)) > 0 else 0
+# Levenshtein.ratio em C quando disponível, senão a mesma métrica em Python puro
+from src.core.similarity_engine import SimilarityEngine, CandidateIndex, SynonymTable
+
+# Sinónimos aprendidos de mapeamentos exportados, lidos só na primeira utilização
+SYNONYMS = SynonymTable()
 
 def normalize_levels(levels):
     # Lower-case, replace 'item' and '[]' with 'ARRAYITEM'
@@ -91,24 +83,17 @@ def map_paths(source_fields, target_fields, threshold=0.7):
     # Build normalized path lists
     source_paths = [normalized_path_from_levels(f['levels']) for f in source_fields]
     target_paths = [normalized_path_from_levels(f['levels']) for f in target_fields]
+    # Correspondências exatas e sinónimos vêm de dicts; só o resto passa pela similaridade
+    targets = CandidateIndex(target_paths, SimilarityEngine('levenshtein'), synonyms=SYNONYMS)
     mapping = []
-    for s, s_field in zip(source_paths, source_fields):
-        # Exact match
-        for t, t_field in zip(target_paths, target_fields):
-            if s == t:
-                mapping.append({'source': s, 'target': t, 'similarity': 1.0})
-                break
+    for s in source_paths:
+        t, sim = targets.best_match(s)
+        if t == s:
+            mapping.append({'source': s, 'target': t, 'similarity': 1.0})
+        elif t is not None and sim >= threshold:
+            mapping.append({'source': s, 'target': t, 'similarity': round(sim, 3)})
         else:
-            # Similarity
-            best = ('', 0.0)
-            for t in target_paths:
-                sim = levenshtein_ratio(s, t)
-                if sim > best[1]:
-                    best = (t, sim)
-            if best[1] >= threshold:
-                mapping.append({'source': s, 'target': best[0], 'similarity': round(best[1], 3)})
-            else:
-                mapping.append({'source': s, 'target': '', 'similarity': 0.0})
+            mapping.append({'source': s, 'target': '', 'similarity': 0.0})
     return mapping
 
 # --- Extração detalhada de campos ---
@@ -0,0 +1,176 @@
+"""
+Batch mapping for The Forge v2.0.0 CLI
+Maps many source/target schema pairs in a process pool and writes a summary report
+"""
+
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+SUPPORTED_EXTENSIONS = ('.xsd', '.json')
+
+REPORT_COLUMNS = [
+    'source', 'target', 'output', 'status', 'seconds', 'source_fields',
+    'target_fields', 'mapped_fields', 'match_rate', 'average_similarity', 'error',
+]
+
+# Per worker process state, created once by _init_worker instead of once per pair
+_worker_state: Dict[str, Any] = {}
+
+def default_output_path(output_dir: str, source: str, target: str) -> str:
+    """Output workbook name for a pair without an explicit output"""
+    return str(Path(output_dir) / f"mapping_{Path(source).stem}_to_{Path(target).stem}.xlsx")
+
+def load_manifest(manifest_path: str, output_dir: Optional[str] = None) -> List[Tuple[str, str, str]]:
+    """
+    Read (source, target, output) triples from a CSV file with a source,target[,output]
+    header or from a JSON list of objects with the same keys.
+    Relative paths are resolved against the manifest's folder; a missing output is
+    named after the pair inside output_dir (default: the manifest's folder).
+    """
+    manifest = Path(manifest_path)
+    base_dir = manifest.parent
+    if manifest.suffix.lower() == '.json':
+        with open(manifest, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+    else:
+        with open(manifest, 'r', encoding='utf-8', newline='') as f:
+            entries = list(csv.DictReader(f))
+
+    pairs = []
+    for number, entry in enumerate(entries, 1):
+        source = (entry.get('source') or '').strip()
+        target = (entry.get('target') or '').strip()
+        if not source or not target:
+            raise ValueError(f"Manifest entry {number} needs both 'source' and 'target'")
+        source = str(base_dir / source)
+        target = str(base_dir / target)
+        output = (entry.get('output') or '').strip()
+        if output:
+            output = str(base_dir / output)
+        else:
+            output = default_output_path(output_dir or str(base_dir), source, target)
+        pairs.append((source, target, output))
+    return pairs
+
+def pair_directories(source_dir: str, target_dir: str, output_dir: str) -> List[Tuple[str, str, str]]:
+    """
+    Pair the schemas of two folders by file name (without extension).
+    Sources without a target of the same name are skipped.
+    """
+    def schemas_by_name(folder):
+        found = {}
+        for path in sorted(Path(folder).iterdir()):
+            if path.is_file() and path.suffix.lower() in SUPPORTED_EXTENSIONS:
+                found.setdefault(path.stem, path)
+        return found
+
+    targets = schemas_by_name(target_dir)
+    pairs = []
+    for name, source in schemas_by_name(source_dir).items():
+        if name in targets:
+            pairs.append((str(source), str(targets[name]), str(Path(output_dir) / f"mapping_{name}.xlsx")))
+    return pairs
+
+def _init_worker(threshold: float):
+    """Import the core modules and build the reusable services once per worker process"""
+    from core.schema_processor import SchemaProcessor
+    from core.mapping_engine import MappingEngine
+    from core.excel_generator import ExcelGenerator
+    from core.similarity_engine import SynonymTable
+    synonyms = SynonymTable()
+    _worker_state['processor'] = SchemaProcessor()
+    _worker_state['generator'] = ExcelGenerator()
+    _worker_state['engine_factory'] = lambda: MappingEngine(threshold=threshold, synonyms=synonyms)
+
+def _load_fields(processor, path: str):
+    extension = Path(path).suffix.lower()
+    if extension == '.xsd':
+        return processor.extract_fields_from_xsd(path)
+    if extension == '.json':
+        return processor.extract_fields_from_json_schema(path)
+    raise ValueError(f"Unsupported file type: {extension}")
+
+def map_pair(pair: Tuple[str, str, str]) -> Dict[str, Any]:
+    """Map one source/target pair inside a worker process and return its report row"""
+    source, target, output = pair
+    result = {'source': source, 'target': target, 'output': output, 'status': 'failed',
+              'source_fields': 0, 'target_fields': 0, 'mapped_fields': 0,
+              'match_rate': 0.0, 'average_similarity': 0.0, 'error': ''}
+    start = time.perf_counter()
+    try:
+        processor = _worker_state['processor']
+        source_fields = _load_fields(processor, source)
+        target_fields = _load_fields(processor, target)
+        result['source_fields'] = len(source_fields)
+        result['target_fields'] = len(target_fields)
+        # The processor reports a schema it cannot parse by returning no fields
+        for path, fields in ((source, source_fields), (target, target_fields)):
+            if not fields:
+                raise ValueError(f"No fields extracted from {path}")
+
+        mappings = _worker_state['engine_factory']().map_fields(source_fields, target_fields)
+        result['mapped_fields'] = len(mappings)
+        if source_fields:
+            result['match_rate'] = round(len(mappings) / len(source_fields), 4)
+        if mappings:
+            result['average_similarity'] = round(sum(m.similarity for m in mappings) / len(mappings), 4)
+
+        output_dir = os.path.dirname(output)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        if _worker_state['generator'].create_mapping_excel(source_fields, target_fields, mappings, output):
+            result['status'] = 'ok'
+        else:
+            result['error'] = 'Mapping creation failed'
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = round(time.perf_counter() - start, 3)
+    return result
+
+def run_batch(pairs: List[Tuple[str, str, str]], workers: Optional[int] = None,
+              threshold: float = 0.7, progress=None) -> List[Dict[str, Any]]:
+    """
+    Map all pairs in a process pool of `workers` processes (default: CPU count).
+    progress(done, total, row) is called as each pair completes.
+    Returns the report rows in the order of pairs.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(pairs)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(threshold,)) as pool:
+        futures = {pool.submit(map_pair, pair): index for index, pair in enumerate(pairs)}
+        for done, future in enumerate(as_completed(futures), 1):
+            row = future.result()
+            results[futures[future]] = row
+            if progress:
+                progress(done, len(pairs), row)
+    return results
+
+def summarize(results: List[Dict[str, Any]], wall_seconds: float) -> Dict[str, Any]:
+    """Totals over all report rows"""
+    succeeded = [row for row in results if row['status'] == 'ok']
+    return {
+        'pairs': len(results),
+        'succeeded': len(succeeded),
+        'failed': len(results) - len(succeeded),
+        'wall_seconds': round(wall_seconds, 3),
+        'pair_seconds': round(sum(row['seconds'] for row in results), 3),
+        'average_match_rate': round(sum(row['match_rate'] for row in succeeded) / len(succeeded), 4) if succeeded else 0.0,
+    }
+
+def write_report(results: List[Dict[str, Any]], summary: Dict[str, Any], report_path: str):
+    """Write the per-pair rows as CSV, or rows plus summary as JSON for a .json path"""
+    report_dir = os.path.dirname(report_path)
+    if report_dir:
+        os.makedirs(report_dir, exist_ok=True)
+    if Path(report_path).suffix.lower() == '.json':
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump({'summary': summary, 'pairs': results}, f, indent=2)
+        return
+    with open(report_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=REPORT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(results)
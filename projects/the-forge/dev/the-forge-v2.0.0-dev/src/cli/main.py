@@ -4,12 +4,14 @@ Command Line Interface for The Forge v2.0.0
 """
 
 import sys
+import time
 import argparse
 from pathlib import Path
 from typing import Optional
 
 from core.schema_processor import SchemaProcessor
 from core.mapping_engine import MappingEngine
+from core.similarity_engine import SynonymTable
 from core.excel_generator import ExcelGenerator
 from core.converter import SchemaConverter
 
@@ -32,6 +34,10 @@ Examples:
   # Create field mapping
   the-forge-cli map --source source.xsd --target target.json --output mapping.xlsx
   
+  # Create field mappings for many pairs in parallel
+  the-forge-cli map-batch --manifest pairs.csv --workers 8
+  the-forge-cli map-batch --source-dir sources/ --target-dir targets/ --output-dir mappings/
+  
   # Validate schema
   the-forge-cli validate --input schema.xsd
         """
@@ -60,6 +66,18 @@ Examples:
     map_parser.add_argument('--threshold', type=float, default=0.7, 
                           help='Similarity threshold (0.0-1.0)')
     
+    # Map batch command
+    batch_parser = subparsers.add_parser('map-batch', help='Create field mappings for many schema pairs in parallel')
+    batch_parser.add_argument('--manifest', '-m', help='CSV/JSON manifest with source, target and optional output columns')
+    batch_parser.add_argument('--source-dir', help='Folder of source schemas (paired with --target-dir by file name)')
+    batch_parser.add_argument('--target-dir', help='Folder of target schemas')
+    batch_parser.add_argument('--output-dir', '-o', help='Folder for generated mappings (required with --source-dir)')
+    batch_parser.add_argument('--workers', '-w', type=int, default=None,
+                            help='Number of worker processes (default: CPU count)')
+    batch_parser.add_argument('--threshold', type=float, default=0.7,
+                            help='Similarity threshold (0.0-1.0)')
+    batch_parser.add_argument('--report', '-r', help='Summary report file, .csv or .json (default: mapping_batch_report.csv in the output folder)')
+    
     # Validate command
     validate_parser = subparsers.add_parser('validate', help='Validate schema file')
     validate_parser.add_argument('--input', '-i', required=True, help='Schema file to validate')
@@ -77,6 +95,8 @@ Examples:
             return handle_document(args)
         elif args.command == 'map':
             return handle_map(args)
+        elif args.command == 'map-batch':
+            return handle_map_batch(args)
         elif args.command == 'validate':
             return handle_validate(args)
         else:
@@ -146,7 +166,7 @@ def handle_document(args) -> int:
 def handle_map(args) -> int:
     """Handle schema mapping"""
     processor = SchemaProcessor()
-    engine = MappingEngine(threshold=args.threshold)
+    engine = MappingEngine(threshold=args.threshold, synonyms=SynonymTable())
     generator = ExcelGenerator()
     
     print(f"Creating mapping between {args.source} and {args.target}...")
@@ -194,6 +214,44 @@ def handle_map(args) -> int:
         print("❌ Mapping creation failed")
         return 1
 
+def handle_map_batch(args) -> int:
+    """Handle batch schema mapping"""
+    from cli.batch import load_manifest, pair_directories, run_batch, summarize, write_report
+    
+    if args.manifest:
+        pairs = load_manifest(args.manifest, args.output_dir)
+        report_dir = args.output_dir or str(Path(args.manifest).parent)
+    elif args.source_dir and args.target_dir and args.output_dir:
+        pairs = pair_directories(args.source_dir, args.target_dir, args.output_dir)
+        report_dir = args.output_dir
+    else:
+        print("❌ Use --manifest, or --source-dir with --target-dir and --output-dir")
+        return 1
+    
+    if not pairs:
+        print("❌ No schema pairs found")
+        return 1
+    
+    report_path = args.report or str(Path(report_dir) / 'mapping_batch_report.csv')
+    print(f"Creating {len(pairs)} mappings...")
+    
+    def progress(done, total, row):
+        status = "✅" if row['status'] == 'ok' else "❌"
+        detail = f"{row['match_rate']:.0%} matched" if row['status'] == 'ok' else row['error']
+        print(f"{status} [{done}/{total}] {Path(row['output']).name} ({row['seconds']:.2f}s, {detail})")
+    
+    start = time.perf_counter()
+    results = run_batch(pairs, workers=args.workers, threshold=args.threshold, progress=progress)
+    summary = summarize(results, time.perf_counter() - start)
+    write_report(results, summary, report_path)
+    
+    print(f"📊 {summary['succeeded']}/{summary['pairs']} mappings created, {summary['failed']} failed")
+    print(f"📈 Average match rate: {summary['average_match_rate']:.1%}")
+    print(f"⏱️  {summary['wall_seconds']:.2f}s wall time, {summary['pair_seconds']:.2f}s total pair time")
+    print(f"📝 Report: {report_path}")
+    
+    return 0 if summary['failed'] == 0 else 1
+
 def handle_validate(args) -> int:
     """Handle schema validation"""
     processor = SchemaProcessor()
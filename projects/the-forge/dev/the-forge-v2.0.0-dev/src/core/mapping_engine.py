@@ -6,9 +6,9 @@ Maps fields between schemas with exact name preservation
 import re
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
-from difflib import SequenceMatcher
 
 from .schema_field import SchemaField
+from .similarity_engine import SimilarityEngine, SynonymTable
 
 class FieldMapping:
     def __init__(self, source_field: SchemaField, target_field: SchemaField, similarity: float, confidence: str = "auto"):
@@ -17,18 +17,53 @@ class FieldMapping:
         self.similarity = similarity
         self.confidence = confidence
 
+    @property
+    def is_unmapped(self) -> bool:
+        return self.target_field is None
+
+    @property
+    def is_exact_match(self) -> bool:
+        return not self.is_unmapped and self.similarity >= 1.0
+
+    @property
+    def is_good_match(self) -> bool:
+        return not self.is_unmapped and 0.8 <= self.similarity < 1.0
+
+    @property
+    def is_weak_match(self) -> bool:
+        return not self.is_unmapped and self.similarity < 0.8
+
 class MappingEngine:
+    def __init__(self, threshold: float = 0.5, scorer='sequence', synonyms: Optional[SynonymTable] = None):
+        self.threshold = threshold
+        self.mappings = []
+        self.engine = SimilarityEngine(scorer)
+        self.synonyms = synonyms
+
     def map_fields(self, source_fields: List[SchemaField], target_fields: List[SchemaField]) -> List[FieldMapping]:
         mappings = []
+        target_names = [tgt.name.lower() for tgt in target_fields]
+        # Equal names and learned synonyms are dict lookups and skip the similarity scan
+        exact_idx, synonym_idx = {}, {}
+        if self.synonyms:
+            for idx, tgt in enumerate(target_fields):
+                exact_idx.setdefault(target_names[idx], idx)
+                synonym_idx.setdefault(self.synonyms.canonical_name(tgt.name), idx)
         for src in source_fields:
+            if synonym_idx:
+                idx = exact_idx.get(src.name.lower())
+                if idx is None:
+                    idx = next((synonym_idx[form] for form in self.synonyms.name_forms(src.name) if form in synonym_idx), None)
+                if idx is not None:
+                    mappings.append(FieldMapping(src, target_fields[idx], 1.0, confidence="auto"))
+                    continue
             # Find best match by name similarity
-            best_match = None
-            best_score = 0.0
-            for tgt in target_fields:
-                score = difflib.SequenceMatcher(None, src.name.lower(), tgt.name.lower()).ratio()
+            best_idx, best_score = None, 0.0
+            src_name = src.name.lower()
+            for idx, tgt_name in enumerate(target_names):
+                score = self.engine.score(src_name, tgt_name)
                 if score > best_score:
-                    best_score = score
-                    best_match = tgt
-            if best_match and best_score > 0.5:  # Threshold for auto-mapping
-                mappings.append(FieldMapping(src, best_match, best_score, confidence="auto"))
-        return mappings 
\ No newline at end of file
+                    best_idx, best_score = idx, score
+            if best_idx is not None and best_score > self.threshold:  # Threshold for auto-mapping
+                mappings.append(FieldMapping(src, target_fields[best_idx], best_score, confidence="auto"))
+        return mappings
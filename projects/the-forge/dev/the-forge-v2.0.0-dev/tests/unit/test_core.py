@@ -72,6 +72,46 @@ class TestMappingEngine:
         assert mapping.confidence == "auto"
         assert mapping.is_good_match is True
 
+class TestSimilarityEngine:
+    """Test the shared similarity engine"""
+    
+    def test_scorers(self):
+        """Test the built-in scorers and the pure-Python fallbacks"""
+        from src.core import similarity_engine as se
+        
+        assert se.exact_score("name", "name") == 1.0
+        assert se.token_set_score("customerID", "customer_id") == 1.0
+        assert se.path_score("order.customer.name", "order.customer.name") == 1.0
+        assert abs(se._python_levenshtein_ratio("kitten", "sitting") - 8 / 13) < 1e-9
+        assert abs(se._python_jaro_winkler("MARTHA", "MARHTA") - 0.9611) < 1e-4
+    
+    def test_engine_matches(self):
+        """Test close_matches, weighted blends and unknown scorer names"""
+        import difflib
+        from src.core.similarity_engine import SimilarityEngine
+        
+        candidates = ["firstName", "lastName", "email", "first_name"]
+        assert SimilarityEngine("sequence").close_matches("firstname", candidates) == \
+            difflib.get_close_matches("firstname", candidates)
+        engine = SimilarityEngine({"exact": 1, "token_set": 1})
+        assert engine.best_match("first_name", candidates) == ("first_name", 1.0)
+        with pytest.raises(ValueError):
+            SimilarityEngine("soundex")
+    
+    def test_synonym_table(self, tmp_path):
+        """Test learning, canonical forms and the lazily loaded on-disk table"""
+        from src.core.similarity_engine import SynonymTable
+        
+        synonyms = SynonymTable(str(tmp_path / "synonyms.json.gz"))
+        synonyms.learn("qty", "quantity")
+        synonyms.learn("vendor", "supplier")
+        synonyms.save()
+        
+        loaded = SynonymTable(str(tmp_path / "synonyms.json.gz"))
+        assert loaded.synonymous("order.Vendor.qty", "order.supplier.quantity")
+        assert loaded.canonical_name("lineQty") == "linequantity"
+        assert not loaded.synonymous("vendor", "customer")
+
 class TestExcelGenerator:
     """Test the Excel generator functionality"""
     
@@ -158,5 +198,71 @@ class TestIntegration:
         assert is_valid is False
         assert "No fields found" in message or "Error" in message
 
+class TestBatchMapping:
+    """Test the map-batch pair discovery"""
+    
+    def test_load_manifest(self, tmp_path):
+        """Test CSV and JSON manifests with relative paths and default outputs"""
+        from src.cli.batch import load_manifest
+        
+        (tmp_path / "pairs.csv").write_text("source,target,output\na.xsd,b.json,out/a.xlsx\nc.xsd,d.xsd,\n", encoding="utf-8")
+        pairs = load_manifest(str(tmp_path / "pairs.csv"))
+        assert pairs[0] == (str(tmp_path / "a.xsd"), str(tmp_path / "b.json"), str(tmp_path / "out" / "a.xlsx"))
+        assert pairs[1][2] == str(tmp_path / "mapping_c_to_d.xlsx")
+        
+        (tmp_path / "pairs.json").write_text(json.dumps([{"source": "a.xsd", "target": "b.json"}]), encoding="utf-8")
+        pairs = load_manifest(str(tmp_path / "pairs.json"), output_dir=str(tmp_path / "maps"))
+        assert pairs == [(str(tmp_path / "a.xsd"), str(tmp_path / "b.json"), str(tmp_path / "maps" / "mapping_a_to_b.xlsx"))]
+    
+    def test_pair_directories(self, tmp_path):
+        """Test pairing source and target folders by file name"""
+        from src.cli.batch import pair_directories
+        
+        (tmp_path / "src").mkdir()
+        (tmp_path / "tgt").mkdir()
+        for name in ["orders.xsd", "users.xsd", "notes.txt"]:
+            (tmp_path / "src" / name).write_text("", encoding="utf-8")
+        for name in ["orders.json", "products.xsd"]:
+            (tmp_path / "tgt" / name).write_text("", encoding="utf-8")
+        
+        pairs = pair_directories(str(tmp_path / "src"), str(tmp_path / "tgt"), str(tmp_path / "out"))
+        assert pairs == [(str(tmp_path / "src" / "orders.xsd"), str(tmp_path / "tgt" / "orders.json"),
+                          str(tmp_path / "out" / "mapping_orders.xlsx"))]
+    
+    def test_map_pair(self, tmp_path, monkeypatch):
+        """Test mapping one pair the way a batch worker does"""
+        from src.cli import batch
+        
+        monkeypatch.syspath_prepend(str(Path(__file__).parents[2] / "src"))
+        monkeypatch.setattr(batch, "_worker_state", {})
+        schema = {"type": "object", "properties": {"orderId": {"type": "string"}, "total": {"type": "number"}}}
+        (tmp_path / "orders.json").write_text(json.dumps(schema), encoding="utf-8")
+        
+        batch._init_worker(0.7)
+        output = tmp_path / "out" / "mapping_orders.xlsx"
+        row = batch.map_pair((str(tmp_path / "orders.json"), str(tmp_path / "orders.json"), str(output)))
+        
+        assert row['status'] == 'ok', row['error']
+        assert (row['source_fields'], row['mapped_fields'], row['match_rate']) == (2, 2, 1.0)
+        assert output.exists()
+    
+    def test_map_pair_unparsable_schema_fails(self, tmp_path, monkeypatch):
+        """Test that a pair whose schema yields no fields is reported as failed"""
+        from src.cli import batch
+        
+        monkeypatch.syspath_prepend(str(Path(__file__).parents[2] / "src"))
+        monkeypatch.setattr(batch, "_worker_state", {})
+        schema = {"type": "object", "properties": {"orderId": {"type": "string"}}}
+        (tmp_path / "orders.json").write_text(json.dumps(schema), encoding="utf-8")
+        (tmp_path / "broken.xsd").write_text("<bad", encoding="utf-8")
+        
+        batch._init_worker(0.7)
+        output = tmp_path / "out" / "mapping_broken.xlsx"
+        row = batch.map_pair((str(tmp_path / "orders.json"), str(tmp_path / "broken.xsd"), str(output)))
+        
+        assert row['status'] == 'failed'
+        assert row['error'] == f"ValueError: No fields extracted from {tmp_path / 'broken.xsd'}"
+        assert not output.exists()
+
 if __name__ == "__main__":
     pytest.main([__file__]) 
\ No newline at end of file
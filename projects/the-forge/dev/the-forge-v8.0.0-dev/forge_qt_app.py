@@ -1,11 +1,14 @@
 import sys
 import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QLineEdit,
     QFileDialog, QTextEdit, QFrame, QToolButton, QCheckBox, QMessageBox, QSplitter, QStatusBar, QSizePolicy, QTabWidget, QSpacerItem, QComboBox
 )
 from PySide6.QtGui import QIcon, QFont, QFontDatabase, QPixmap
-from PySide6.QtCore import Qt, Signal, QTimer, QSize
+from PySide6.QtCore import Qt, Signal, QTimer, QSize, QObject, QThread
 from openpyxl.utils import get_column_letter
 from shiboken6 import isValid
 
@@ -220,6 +223,287 @@ class DropZone(QFrame):
         self.label_main.setStyleSheet('border: none; background: none; color: #263CC8;')
         self._set_default_style()
 
+class MappingCancelled(Exception):
+    pass
+
+
+def _parse_xsd_types(root):
+    simple_types = {}
+    for st in root.findall(f'.//{{http://www.w3.org/2001/XMLSchema}}simpleType'):
+        name = st.get('name')
+        if not name:
+            continue
+        restriction = st.find('{http://www.w3.org/2001/XMLSchema}restriction')
+        base = restriction.get('base') if restriction is not None else None
+        restrictions = {}
+        if restriction is not None:
+            for cons in restriction:
+                cons_name = cons.tag.replace('{http://www.w3.org/2001/XMLSchema}', '')
+                val = cons.get('value')
+                if val:
+                    restrictions[cons_name] = val
+        simple_types[name] = {'base': base, 'restrictions': restrictions}
+    complex_types = {ct.get('name'): ct for ct in root.findall(f'.//{{http://www.w3.org/2001/XMLSchema}}complexType') if ct.get('name')}
+    return simple_types, complex_types
+
+
+def parse_mapping_inputs(src, tgt):
+    """Parse the source XSD into {message: rows} and the target XSD into a single row list."""
+    # --- v4 logic: parse source and target, multi-message, row matching, column structure ---
+    from microservices.xsd_parser_service import XSDParser
+    import xml.etree.ElementTree as ET
+    parser = XSDParser()
+    # Parse source XSD
+    root = ET.parse(src).getroot()
+    simple_types, complex_types = _parse_xsd_types(root)
+    src_messages = {}
+    for elem in root.findall('{http://www.w3.org/2001/XMLSchema}element'):
+        name = elem.get('name')
+        if name:
+            rows = parser.parse_element(elem, complex_types, simple_types, 1, category='message')
+            src_messages[name] = rows
+    # Parse target XSD (single sheet)
+    tgt_rows = []
+    if tgt and os.path.exists(tgt):
+        tgt_root = ET.parse(tgt).getroot()
+        tgt_simple_types, tgt_complex_types = _parse_xsd_types(tgt_root)
+        for elem in tgt_root.findall('{http://www.w3.org/2001/XMLSchema}element'):
+            rows = parser.parse_element(elem, tgt_complex_types, tgt_simple_types, 1, category='message')
+            tgt_rows.extend(rows)
+    return src_messages, tgt_rows
+
+
+def write_mapping_workbook(src_messages, tgt_rows, out, on_sheet=None, check_cancelled=None, synonyms=None):
+    """
+    Match every source message against the target rows and save one sheet per message to out.
+    on_sheet(msg_name, index, total) is called before each sheet; check_cancelled() may raise
+    MappingCancelled between sheets and rows, in which case nothing is saved. With a
+    SynonymTable, a target path synonymous with the source path wins over fuzzy matching.
+    """
+    import openpyxl
+    from microservices.similarity_engine import SimilarityEngine
+    engine = SimilarityEngine('sequence')
+    synonyms = synonyms if synonyms else None
+    # --- Remove case conversion logic ---
+    # (No conversion of row['levels'] for source or target)
+    # Build Excel file
+    wb = openpyxl.Workbook()
+    first = True
+    def row_path(row):
+        return '.'.join(row['levels'])
+    tgt_path_dict = {row_path(row): row for row in tgt_rows}
+    tgt_paths = list(tgt_path_dict.keys())
+    tgt_by_canonical = {}
+    if synonyms:
+        for path in tgt_paths:
+            tgt_by_canonical.setdefault(synonyms.canonical(path), []).append(path)
+    for index, (msg_name, src_full_rows) in enumerate(src_messages.items()):
+        if check_cancelled:
+            check_cancelled()
+        if on_sheet:
+            on_sheet(msg_name, index + 1, len(src_messages))
+        if not first:
+            ws = wb.create_sheet(title=excel_sheet_name(msg_name))
+        else:
+            ws = wb.active
+            ws.title = excel_sheet_name(msg_name)
+            first = False
+        max_src_level = max((len(row['levels']) for row in src_full_rows), default=1)
+        max_tgt_level = max((len(row['levels']) for row in tgt_rows), default=1) if tgt_rows else 1
+        src_cols = [f'Level{i+1}_src' for i in range(max_src_level)] + ['Request Parameter_src', 'GDPR_src', 'Cardinality_src', 'Type_src', 'Base Type_src', 'Details_src', 'Description_src', 'Category_src', 'Example_src']
+        tgt_cols = [f'Level{i+1}_tgt' for i in range(max_tgt_level)] + ['Request Parameter_tgt', 'GDPR_tgt', 'Cardinality_tgt', 'Type_tgt', 'Base Type_tgt', 'Details_tgt', 'Description_tgt', 'Category_tgt', 'Example_tgt']
+        headers = src_cols + ['Destination Fields'] + tgt_cols
+        ws.append(headers)
+        ws.append([''] * len(headers))  # Second header row blank for now
+        for row_index, src_row in enumerate(src_full_rows):
+            # Fuzzy matching dominates, so give cancel a chance every few rows
+            if check_cancelled and row_index % 50 == 0:
+                check_cancelled()
+            src_levels = src_row['levels'] + [''] * (max_src_level - len(src_row['levels']))
+            src_vals = src_levels + [
+                src_row.get('Request Parameter',''),
+                src_row.get('GDPR',''),
+                src_row.get('Cardinality',''),
+                src_row.get('Type',''),
+                src_row.get('Base Type',''),
+                src_row.get('Details',''),
+                src_row.get('Description',''),
+                src_row.get('Category','element'),
+                src_row.get('Example','')
+            ]
+            src_path_str = row_path(src_row)
+            tgt_row = tgt_path_dict.get(src_path_str)
+            best_match = ''
+            if not tgt_row and tgt_by_canonical:
+                same = [path for form in synonyms.forms(src_path_str) for path in tgt_by_canonical.get(form, ())]
+                if same:
+                    best_match = synonyms.pick(src_path_str, same, engine)
+                    tgt_row = tgt_path_dict[best_match]
+            if not tgt_row and tgt_paths:
+                matches = engine.close_matches(src_path_str, tgt_paths, n=1, cutoff=0.0)
+                if matches:
+                    best_match = matches[0]
+                    tgt_row = tgt_path_dict[best_match]
+            tgt_levels = tgt_row['levels'] + [''] * (max_tgt_level - len(tgt_row['levels'])) if tgt_row else ['']*max_tgt_level
+            tgt_vals = tgt_levels + [
+                tgt_row.get('Request Parameter','') if tgt_row else '',
+                tgt_row.get('GDPR','') if tgt_row else '',
+                tgt_row.get('Cardinality','') if tgt_row else '',
+                tgt_row.get('Type','') if tgt_row else '',
+                tgt_row.get('Base Type','') if tgt_row else '',
+                tgt_row.get('Details','') if tgt_row else '',
+                tgt_row.get('Description','') if tgt_row else '',
+                tgt_row.get('Category','element') if tgt_row else '',
+                tgt_row.get('Example','') if tgt_row else ''
+            ]
+            dest_field = '.'.join([lvl for lvl in tgt_row['levels'] if lvl]) if tgt_row else ''
+            ws.append(src_vals + [dest_field] + tgt_vals)
+        # Prune unused source level columns
+        def last_nonempty_level_col(start_col, num_levels):
+            for col in range(start_col + max_src_level - 1, start_col - 1, -1):
+                for row in ws.iter_rows(min_row=3, min_col=col, max_col=col):
+                    if any(cell.value not in (None, '') for cell in row):
+                        return col
+            return start_col - 1
+        src_level_start = 1
+        last_src_col = last_nonempty_level_col(src_level_start, max_src_level)
+        for col in range(src_level_start + max_src_level - 1, last_src_col, -1):
+            ws.delete_cols(col)
+        header_row = [cell.value for cell in ws[1]]
+        try:
+            tgt_level_start = header_row.index('Level1_tgt') + 1
+        except ValueError:
+            tgt_level_start = len(header_row) + 1
+        for col in range(tgt_level_start + max_tgt_level - 1, tgt_level_start - 1, -1):
+            col_letter = get_column_letter(col)
+            if col > tgt_level_start and all((ws.cell(row=row, column=col).value in (None, '')) for row in range(3, ws.max_row + 1)):
+                ws.delete_cols(col)
+    if check_cancelled:
+        check_cancelled()
+    wb.save(out)
+
+
+class MappingWorker(QObject):
+    """
+    Runs queued mapping jobs on a QThread so the window stays responsive.
+
+    Jobs are dicts (src, tgt, out, reorder_attributes) taken from a queue.Queue
+    shared with the window. While one job is matched and written, the XSDs of
+    the next queued job are already parsed on a helper thread. cancel() stops
+    the running job at the next sheet/row checkpoint and drops a prefetched one;
+    it only applies to the job running when it is called.
+    """
+    log = Signal(str, str)  # message, level
+    progress = Signal(str, str, int, int)  # output path, message sheet, index, total
+    job_started = Signal(str)  # output path
+    job_finished = Signal(str, str)  # output path, 'success' | 'cancelled' | 'failed'
+    drained = Signal()
+
+    def __init__(self, jobs):
+        super().__init__()
+        self.jobs = jobs
+        self._cancel = threading.Event()
+        from microservices.similarity_engine import SynonymTable
+        self.synonyms = SynonymTable()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def _check_cancelled(self):
+        if self._cancel.is_set():
+            raise MappingCancelled()
+
+    def _next_job(self):
+        try:
+            return self.jobs.get_nowait()
+        except queue.Empty:
+            return None
+
+    def run(self):
+        with ThreadPoolExecutor(max_workers=1) as prefetch:
+            job = self._next_job()
+            parsed = prefetch.submit(parse_mapping_inputs, job['src'], job['tgt']) if job else None
+            while job:
+                next_job = None
+                # A cancel meant for an earlier job does not carry over to this one
+                self._cancel.clear()
+                try:
+                    self.job_started.emit(job['out'])
+                    src_messages, tgt_rows = parsed.result()
+                    self._check_cancelled()
+                    # Pipeline: parse the next queued mapping while this one is written
+                    next_job = self._next_job()
+                    next_parsed = prefetch.submit(parse_mapping_inputs, next_job['src'], next_job['tgt']) if next_job else None
+                    self._run_job(job, src_messages, tgt_rows)
+                    self.job_finished.emit(job['out'], 'success')
+                    if self._cancel.is_set():
+                        # Cancelled after the last checkpoint: the workbook is already saved, only the prefetched job is dropped
+                        self.log.emit(f"[INFO] Cancel came after {job['out']} was saved; the file is kept.", "info")
+                        if next_job:
+                            self.job_finished.emit(next_job['out'], 'cancelled')
+                            next_job = None
+                except MappingCancelled:
+                    self.job_finished.emit(job['out'], 'cancelled')
+                    if next_job:
+                        self.job_finished.emit(next_job['out'], 'cancelled')
+                        next_job = None
+                except Exception as e:
+                    import traceback
+                    self.log.emit(f"Mapping Error: {e}\n{traceback.format_exc()}", "error")
+                    self.job_finished.emit(job['out'], 'failed')
+                if next_job is None:
+                    # Jobs queued after the prefetch point (or after a cancel) are picked up here
+                    next_job = self._next_job()
+                    next_parsed = prefetch.submit(parse_mapping_inputs, next_job['src'], next_job['tgt']) if next_job else None
+                job, parsed = next_job, next_parsed
+        self.drained.emit()
+
+    def _run_job(self, job, src_messages, tgt_rows):
+        src, tgt, out = job['src'], job['tgt'], job['out']
+        self.log.emit(f"[INFO] Source: {src}", "info")
+        self.log.emit(f"[INFO] Target: {tgt}", "info")
+        self.log.emit(f"[INFO] Output: {out}", "info")
+        # Ensure output directory exists
+        output_dir = os.path.dirname(out)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir, exist_ok=True)
+        write_mapping_workbook(
+            src_messages, tgt_rows, out,
+            on_sheet=lambda msg_name, index, total: self.progress.emit(out, msg_name, index, total),
+            check_cancelled=self._check_cancelled,
+            synonyms=self.synonyms,
+        )
+        self.log.emit(f"[SUCCESS] Output file created: {out}", "success")
+        # --- Post-processing QA: Excel Output Validator ---
+        xsd_path = src if src else tgt
+        try:
+            from microservices.excel_output_validator import validate_excel_output, _log_messages
+            _log_messages.clear()
+            validate_excel_output(xsd_path, out)
+            for line in _log_messages:
+                if line.startswith("[SUCCESS]"):
+                    level = "success"
+                elif line.startswith("[ERROR]"):
+                    level = "error"
+                elif line.startswith("[WARNING]"):
+                    level = "warning"
+                elif line.startswith("[VALIDATE]"):
+                    level = "validate"
+                else:
+                    level = "info"
+                self.log.emit(line, level)
+        except Exception as e:
+            self.log.emit(f"❌ Error in post-processing validator: {e}", "error")
+        # --- Attribute reordering if flag is set ---
+        if job['reorder_attributes']:
+            try:
+                from microservices.reorder_excel_attributes import reorder_attributes_in_excel
+                reorder_attributes_in_excel(out)
+                self.log.emit("[INFO] Reordered attributes to appear first in each parent structure.", "info")
+            except Exception as e:
+                self.log.emit(f"[ERROR] Failed to reorder attributes: {e}", "error")
+
+
 class ForgeMainWindow(QMainWindow):
     log_signal = Signal(str, str)  # message, level
     def __init__(self):
@@ -233,6 +517,10 @@ class ForgeMainWindow(QMainWindow):
         self.target_path_full = ''
         self.output_path_full = ''
         self.log_signal.connect(self._log)
+        # Mapping jobs run one after another on a background worker
+        self.mapping_jobs = queue.Queue()
+        self.mapping_thread = None
+        self.mapping_worker = None
         self.working_folder = ''
         self.field_case = "PascalCase" # Initialize field_case
         # Set initial theme
@@ -411,7 +699,15 @@ class ForgeMainWindow(QMainWindow):
         self.generate_btn.setMinimumHeight(28)
         self.generate_btn.clicked.connect(self._on_generate)
         self.generate_btn.setEnabled(False)
-        layout.addWidget(self.generate_btn)
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setMinimumHeight(28)
+        self.cancel_btn.clicked.connect(self._on_cancel_generate)
+        self.cancel_btn.setEnabled(False)
+        generate_row = QHBoxLayout()
+        generate_row.setSpacing(6)
+        generate_row.addWidget(self.generate_btn, 1)
+        generate_row.addWidget(self.cancel_btn)
+        layout.addLayout(generate_row)
         self.status_label = QLabel("")
         self.status_label.setFont(QFont('Mulish', 10, QFont.Medium))
         layout.addWidget(self.status_label)
@@ -494,196 +790,89 @@ class ForgeMainWindow(QMainWindow):
 
     def _on_generate(self):
         self._log("[INFO] Generate Mapping clicked.", level="info")
-        self.status_label.setText("Generating mapping...")
-        self.status_label.setStyleSheet(f"color: {EDP_COLORS['electric_green']};")
+        job = {
+            'src': self.source_path_full,
+            'tgt': self.target_path_full,
+            'out': self.output_path_full,
+            'reorder_attributes': hasattr(self, 'attr_first_checkbox') and self.attr_first_checkbox.isChecked(),
+        }
+        self.mapping_jobs.put(job)
+        if self.mapping_thread is not None:
+            self._log(f"[INFO] Mapping queued: {job['out']}", level="info")
+        else:
+            self._start_mapping_worker()
+        self._update_generate_status()
+        # Clear output path field and variable to release file reference
+        self.output_path.clear()
+        self.output_path_full = ''
         self.generate_btn.setEnabled(False)
-        QApplication.instance().processEvents()
-        try:
-            src = self.source_path_full
-            tgt = self.target_path_full
-            out = self.output_path_full
-            self._log(f"[INFO] Source: {src}", level="info")
-            self._log(f"[INFO] Target: {tgt}", level="info")
-            self._log(f"[INFO] Output: {out}", level="info")
-            # Ensure output directory exists
-            output_dir = os.path.dirname(out)
-            if output_dir and not os.path.exists(output_dir):
-                os.makedirs(output_dir, exist_ok=True)
-            # --- v4 logic: parse source and target, multi-message, row matching, column structure ---
-            from microservices.xsd_parser_service import XSDParser
-            import xml.etree.ElementTree as ET
-            import openpyxl
-            import difflib
-            XSD_NS = '{http://www.w3.org/2001/XMLSchema}'
-            parser = XSDParser()
-            # Parse source XSD
-            tree = ET.parse(src)
-            root = tree.getroot()
-            simple_types = {}
-            for st in root.findall(f'.//{{http://www.w3.org/2001/XMLSchema}}simpleType'):
-                name = st.get('name')
-                if not name:
-                    continue
-                restriction = st.find('{http://www.w3.org/2001/XMLSchema}restriction')
-                base = restriction.get('base') if restriction is not None else None
-                restrictions = {}
-                if restriction is not None:
-                    for cons in restriction:
-                        cons_name = cons.tag.replace('{http://www.w3.org/2001/XMLSchema}', '')
-                        val = cons.get('value')
-                        if val:
-                            restrictions[cons_name] = val
-                simple_types[name] = {'base': base, 'restrictions': restrictions}
-            complex_types = {ct.get('name'): ct for ct in root.findall(f'.//{{http://www.w3.org/2001/XMLSchema}}complexType') if ct.get('name')}
-            src_messages = {}
-            for elem in root.findall('{http://www.w3.org/2001/XMLSchema}element'):
-                name = elem.get('name')
-                if name:
-                    rows = parser.parse_element(elem, complex_types, simple_types, 1, category='message')
-                    src_messages[name] = rows
-            # Parse target XSD (single sheet)
-            tgt_rows = []
-            if tgt and os.path.exists(tgt):
-                tgt_tree = ET.parse(tgt)
-                tgt_root = tgt_tree.getroot()
-                tgt_simple_types = {}
-                for st in tgt_root.findall(f'.//{{http://www.w3.org/2001/XMLSchema}}simpleType'):
-                    name = st.get('name')
-                    if not name:
-                        continue
-                    restriction = st.find('{http://www.w3.org/2001/XMLSchema}restriction')
-                    base = restriction.get('base') if restriction is not None else None
-                    restrictions = {}
-                    if restriction is not None:
-                        for cons in restriction:
-                            cons_name = cons.tag.replace('{http://www.w3.org/2001/XMLSchema}', '')
-                            val = cons.get('value')
-                            if val:
-                                restrictions[cons_name] = val
-                    tgt_simple_types[name] = {'base': base, 'restrictions': restrictions}
-                tgt_complex_types = {ct.get('name'): ct for ct in tgt_root.findall(f'.//{{http://www.w3.org/2001/XMLSchema}}complexType') if ct.get('name')}
-                for elem in tgt_root.findall('{http://www.w3.org/2001/XMLSchema}element'):
-                    rows = parser.parse_element(elem, tgt_complex_types, tgt_simple_types, 1, category='message')
-                    tgt_rows.extend(rows)
-            # --- Remove case conversion logic ---
-            # (No conversion of row['levels'] for source or target)
-            # Build Excel file
-            wb = openpyxl.Workbook()
-            first = True
-            for msg_name, src_full_rows in src_messages.items():
-                if not first:
-                    ws = wb.create_sheet(title=excel_sheet_name(msg_name))
-                else:
-                    ws = wb.active
-                    ws.title = excel_sheet_name(msg_name)
-                    first = False
-                max_src_level = max((len(row['levels']) for row in src_full_rows), default=1)
-                max_tgt_level = max((len(row['levels']) for row in tgt_rows), default=1) if tgt_rows else 1
-                src_cols = [f'Level{i+1}_src' for i in range(max_src_level)] + ['Request Parameter_src', 'GDPR_src', 'Cardinality_src', 'Type_src', 'Base Type_src', 'Details_src', 'Description_src', 'Category_src', 'Example_src']
-                tgt_cols = [f'Level{i+1}_tgt' for i in range(max_tgt_level)] + ['Request Parameter_tgt', 'GDPR_tgt', 'Cardinality_tgt', 'Type_tgt', 'Base Type_tgt', 'Details_tgt', 'Description_tgt', 'Category_tgt', 'Example_tgt']
-                headers = src_cols + ['Destination Fields'] + tgt_cols
-                ws.append(headers)
-                ws.append([''] * len(headers))  # Second header row blank for now
-                def row_path(row):
-                    return '.'.join(row['levels'])
-                tgt_path_dict = {row_path(row): row for row in tgt_rows}
-                tgt_paths = list(tgt_path_dict.keys())
-                for src_row in src_full_rows:
-                    src_levels = src_row['levels'] + [''] * (max_src_level - len(src_row['levels']))
-                    src_vals = src_levels + [
-                        src_row.get('Request Parameter',''),
-                        src_row.get('GDPR',''),
-                        src_row.get('Cardinality',''),
-                        src_row.get('Type',''),
-                        src_row.get('Base Type',''),
-                        src_row.get('Details',''),
-                        src_row.get('Description',''),
-                        src_row.get('Category','element'),
-                        src_row.get('Example','')
-                    ]
-                    src_path_str = row_path(src_row)
-                    tgt_row = tgt_path_dict.get(src_path_str)
-                    best_match = ''
-                    if not tgt_row and tgt_paths:
-                        matches = difflib.get_close_matches(src_path_str, tgt_paths, n=1, cutoff=0.0)
-                        if matches:
-                            best_match = matches[0]
-                            tgt_row = tgt_path_dict[best_match]
-                    tgt_levels = tgt_row['levels'] + [''] * (max_tgt_level - len(tgt_row['levels'])) if tgt_row else ['']*max_tgt_level
-                    tgt_vals = tgt_levels + [
-                        tgt_row.get('Request Parameter','') if tgt_row else '',
-                        tgt_row.get('GDPR','') if tgt_row else '',
-                        tgt_row.get('Cardinality','') if tgt_row else '',
-                        tgt_row.get('Type','') if tgt_row else '',
-                        tgt_row.get('Base Type','') if tgt_row else '',
-                        tgt_row.get('Details','') if tgt_row else '',
-                        tgt_row.get('Description','') if tgt_row else '',
-                        tgt_row.get('Category','element') if tgt_row else '',
-                        tgt_row.get('Example','') if tgt_row else ''
-                    ]
-                    dest_field = '.'.join([lvl for lvl in tgt_row['levels'] if lvl]) if tgt_row else ''
-                    ws.append(src_vals + [dest_field] + tgt_vals)
-                # Prune unused source level columns
-                def last_nonempty_level_col(start_col, num_levels):
-                    for col in range(start_col + max_src_level - 1, start_col - 1, -1):
-                        for row in ws.iter_rows(min_row=3, min_col=col, max_col=col):
-                            if any(cell.value not in (None, '') for cell in row):
-                                return col
-                    return start_col - 1
-                src_level_start = 1
-                last_src_col = last_nonempty_level_col(src_level_start, max_src_level)
-                for col in range(src_level_start + max_src_level - 1, last_src_col, -1):
-                    ws.delete_cols(col)
-                header_row = [cell.value for cell in ws[1]]
-                try:
-                    tgt_level_start = header_row.index('Level1_tgt') + 1
-                except ValueError:
-                    tgt_level_start = len(header_row) + 1
-                for col in range(tgt_level_start + max_tgt_level - 1, tgt_level_start - 1, -1):
-                    col_letter = get_column_letter(col)
-                    if col > tgt_level_start and all((ws.cell(row=row, column=col).value in (None, '')) for row in range(3, ws.max_row + 1)):
-                        ws.delete_cols(col)
-            wb.save(out)
-            self._log(f"[SUCCESS] Output file created: {out}", level="success")
-            # --- Post-processing QA: Excel Output Validator ---
-            xsd_path = src if src else tgt
+
+    def _start_mapping_worker(self):
+        self.mapping_thread = QThread(self)
+        self.mapping_worker = MappingWorker(self.mapping_jobs)
+        self.mapping_worker.moveToThread(self.mapping_thread)
+        self.mapping_thread.started.connect(self.mapping_worker.run)
+        self.mapping_worker.log.connect(self.log_signal)
+        self.mapping_worker.progress.connect(self._on_generate_progress)
+        self.mapping_worker.job_started.connect(self._on_job_started)
+        self.mapping_worker.job_finished.connect(self._on_job_finished)
+        self.mapping_worker.drained.connect(self.mapping_thread.quit)
+        self.mapping_thread.finished.connect(self._on_mapping_thread_finished)
+        self.cancel_btn.setEnabled(True)
+        self.mapping_thread.start()
+
+    def _on_mapping_thread_finished(self):
+        self.mapping_worker.deleteLater()
+        self.mapping_thread.deleteLater()
+        self.mapping_worker = None
+        self.mapping_thread = None
+        # A job queued while the worker was shutting down starts a new one
+        if not self.mapping_jobs.empty():
+            self._start_mapping_worker()
+        else:
+            self.cancel_btn.setEnabled(False)
+
+    def _on_cancel_generate(self):
+        dropped = 0
+        while True:
             try:
-                from microservices.excel_output_validator import validate_excel_output, _log_messages
-                _log_messages.clear()
-                validate_excel_output(xsd_path, out)
-                for line in _log_messages:
-                    if line.startswith("[SUCCESS]"):
-                        level = "success"
-                    elif line.startswith("[ERROR]"):
-                        level = "error"
-                    elif line.startswith("[WARNING]"):
-                        level = "warning"
-                    elif line.startswith("[VALIDATE]"):
-                        level = "validate"
-                    else:
-                        level = "info"
-                    self.log_signal.emit(line, level)
-            except Exception as e:
-                self.log_signal.emit(f"❌ Error in post-processing validator: {e}", "error")
-            # --- Attribute reordering if flag is set ---
-            if hasattr(self, 'attr_first_checkbox') and self.attr_first_checkbox.isChecked():
-                try:
-                    from microservices.reorder_excel_attributes import reorder_attributes_in_excel
-                    reorder_attributes_in_excel(out)
-                    self._log("[INFO] Reordered attributes to appear first in each parent structure.", level="info")
-                except Exception as e:
-                    self._log(f"[ERROR] Failed to reorder attributes: {e}", level="error")
+                self.mapping_jobs.get_nowait()
+            except queue.Empty:
+                break
+            dropped += 1
+        if self.mapping_worker is not None:
+            self.mapping_worker.cancel()
+        self._log(f"[WARNING] Cancelling mapping generation ({dropped} queued mapping(s) dropped).", level="warning")
+        self.status_label.setText("Cancelling...")
+        self.status_label.setStyleSheet("color: #FFA500;")
+
+    def _update_generate_status(self, detail=""):
+        queued = self.mapping_jobs.qsize()
+        text = "Generating mapping..."
+        if detail:
+            text += f" {detail}"
+        if queued:
+            text += f" ({queued} queued)"
+        self.status_label.setText(text)
+        self.status_label.setStyleSheet(f"color: {EDP_COLORS['electric_green']};")
+
+    def _on_job_started(self, out):
+        self._log(f"[INFO] Generating mapping: {out}", level="info")
+        self._update_generate_status()
+
+    def _on_generate_progress(self, out, msg_name, index, total):
+        self._update_generate_status(f"sheet {index}/{total}: {msg_name}")
+
+    def _on_job_finished(self, out, status):
+        if status == 'success':
             self._finish_generate()
-            # Clear output path field and variable to release file reference
-            self.output_path.clear()
-            self.output_path_full = ''
-        except Exception as e:
-            import traceback
-            error_msg = f"Mapping Error: {e}\n{traceback.format_exc()}"
-            self._log(error_msg, level="error")
+        elif status == 'cancelled':
+            self._log(f"[WARNING] Mapping cancelled: {out}", level="warning")
+            self.status_label.setText("Mapping cancelled.")
+            self.status_label.setStyleSheet("color: #FFA500;")
+        else:
             self.status_label.setText("Mapping failed!")
             self.status_label.setStyleSheet("color: #FF3333;")
-        self.generate_btn.setEnabled(True)
 
     def _finish_generate(self):
         self.status_label.setText("Mapping generated successfully!")
@@ -712,6 +901,10 @@ class ForgeMainWindow(QMainWindow):
         widget.ensureCursorVisible()
 
     def closeEvent(self, event):
+        if self.mapping_thread is not None:
+            self._on_cancel_generate()
+            self.mapping_thread.quit()
+            self.mapping_thread.wait()
         try:
             self.log_signal.disconnect()
         except Exception:
@@ -0,0 +1,516 @@
+"""
+Similarity engine shared by The Forge field and path matchers.
+
+Every deployable folder (web app, desktop app, CLI) is shipped on its own and
+carries a vendored copy of this module, so the matchers score candidates the
+same way everywhere. Edit the copy in dev/the-forge-v1.0.0/src/core and run
+scripts/sync-similarity-engine.py to update the others.
+
+Scorers take two strings and return a similarity between 0.0 and 1.0:
+  exact         1.0 for equal strings, else 0.0
+  sequence      difflib.SequenceMatcher ratio (what difflib.get_close_matches uses)
+  levenshtein   normalized InDel similarity, the same value as Levenshtein.ratio
+  jaro_winkler  Jaro-Winkler similarity with the standard 0.1 prefix weight
+  token_set     overlap of the identifier tokens (camelCase, snake_case, dotted)
+  path          leaf name similarity blended with the overlap of parent levels
+
+levenshtein and jaro_winkler use rapidfuzz or python-Levenshtein when one is
+installed and an equivalent pure-Python implementation otherwise; BACKEND
+tells which one is active.
+
+SynonymTable holds field-name synonyms and abbreviations learned from
+accepted mappings; the matchers look them up before any fuzzy scoring.
+"""
+
+import difflib
+import gzip
+import heapq
+import json
+import os
+import re
+import threading
+
+try:
+    from rapidfuzz.distance import Indel as _Indel, JaroWinkler as _JaroWinkler
+    BACKEND = 'rapidfuzz'
+except ImportError:
+    try:
+        import Levenshtein as _Levenshtein
+        BACKEND = 'python-Levenshtein'
+    except ImportError:
+        BACKEND = 'python'
+
+
+def exact_score(a, b):
+    return 1.0 if a == b else 0.0
+
+
+def sequence_score(a, b):
+    return difflib.SequenceMatcher(None, a, b).ratio()
+
+
+def _python_levenshtein_ratio(a, b):
+    # 1 - InDel distance / total length, with the InDel distance taken from the LCS
+    total = len(a) + len(b)
+    if total == 0:
+        return 1.0
+    if len(a) < len(b):
+        a, b = b, a
+    previous = [0] * (len(b) + 1)
+    for char_a in a:
+        current = [0]
+        for j, char_b in enumerate(b):
+            if char_a == char_b:
+                current.append(previous[j] + 1)
+            else:
+                current.append(max(previous[j + 1], current[j]))
+        previous = current
+    return 2 * previous[-1] / total
+
+
+def _python_jaro_winkler(a, b, prefix_weight=0.1):
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    window = max(max(len(a), len(b)) // 2 - 1, 0)
+    matched_a = [False] * len(a)
+    matched_b = [False] * len(b)
+    matches = 0
+    for i, char_a in enumerate(a):
+        for j in range(max(0, i - window), min(len(b), i + window + 1)):
+            if not matched_b[j] and b[j] == char_a:
+                matched_a[i] = matched_b[j] = True
+                matches += 1
+                break
+    if not matches:
+        return 0.0
+    a_matches = [char for char, matched in zip(a, matched_a) if matched]
+    b_matches = [char for char, matched in zip(b, matched_b) if matched]
+    transpositions = sum(x != y for x, y in zip(a_matches, b_matches)) // 2
+    jaro = (matches / len(a) + matches / len(b) + (matches - transpositions) / matches) / 3
+    if jaro <= 0.7:
+        return jaro  # Winkler's prefix boost only applies to already similar strings
+    prefix = 0
+    for x, y in zip(a[:4], b[:4]):
+        if x != y:
+            break
+        prefix += 1
+    return jaro + prefix * prefix_weight * (1 - jaro)
+
+
+if BACKEND == 'rapidfuzz':
+    def levenshtein_score(a, b):
+        return _Indel.normalized_similarity(a, b)
+
+    def jaro_winkler_score(a, b):
+        return _JaroWinkler.similarity(a, b)
+elif BACKEND == 'python-Levenshtein':
+    def levenshtein_score(a, b):
+        return _Levenshtein.ratio(a, b)
+
+    def jaro_winkler_score(a, b):
+        return _Levenshtein.jaro_winkler(a, b)
+else:
+    levenshtein_score = _python_levenshtein_ratio
+    jaro_winkler_score = _python_jaro_winkler
+
+
+_TOKEN_RE = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+')
+
+
+def tokenize(text):
+    """Lowercase identifier tokens: 'customerID.first_name' -> ['customer', 'id', 'first', 'name']."""
+    return [token.lower() for token in _TOKEN_RE.findall(text)]
+
+
+def token_set_score(a, b):
+    tokens_a, tokens_b = set(tokenize(a)), set(tokenize(b))
+    if not tokens_a or not tokens_b:
+        return exact_score(a, b)
+    return 2 * len(tokens_a & tokens_b) / (len(tokens_a) + len(tokens_b))
+
+
+def _levels(path):
+    return [level.lower() for level in path.replace('/', '.').split('.') if level]
+
+
+def path_score(a, b, leaf_weight=0.7):
+    levels_a, levels_b = _levels(a), _levels(b)
+    if not levels_a or not levels_b:
+        return exact_score(a, b)
+    leaf = sequence_score(levels_a[-1], levels_b[-1])
+    parents_a, parents_b = set(levels_a[:-1]), set(levels_b[:-1])
+    if parents_a or parents_b:
+        parents = 2 * len(parents_a & parents_b) / (len(parents_a) + len(parents_b))
+    else:
+        parents = 1.0
+    return leaf_weight * leaf + (1 - leaf_weight) * parents
+
+
+SCORERS = {
+    'exact': exact_score,
+    'sequence': sequence_score,
+    'levenshtein': levenshtein_score,
+    'jaro_winkler': jaro_winkler_score,
+    'token_set': token_set_score,
+    'path': path_score,
+}
+
+# Scorers that never exceed 2 * min(len(a), len(b)) / (len(a) + len(b))
+LENGTH_BOUNDED = {'exact', 'sequence', 'levenshtein'}
+
+
+def length_bound(len_a, len_b):
+    total = len_a + len_b
+    return 2 * min(len_a, len_b) / total if total else 1.0
+
+
+class SimilarityEngine:
+    """
+    Scores strings with one scorer or a weighted blend of scorers.
+
+    scorer is a name from SCORERS, a callable (a, b) -> float, or a dict of
+    {name or callable: weight}; blended scores are divided by the total weight.
+    """
+    def __init__(self, scorer='sequence'):
+        if isinstance(scorer, dict):
+            total = sum(scorer.values())
+            parts = [(self._resolve(name), weight / total) for name, weight in scorer.items()]
+            self._score = lambda a, b: sum(weight * func(a, b) for func, weight in parts)
+            self.name = '+'.join(f"{name}*{weight:g}" for name, weight in scorer.items())
+            self.length_bounded = all(name in LENGTH_BOUNDED for name in scorer)
+        else:
+            self._score = self._resolve(scorer)
+            self.name = scorer if isinstance(scorer, str) else getattr(scorer, '__name__', 'custom')
+            self.length_bounded = scorer in LENGTH_BOUNDED
+
+    @staticmethod
+    def _resolve(scorer):
+        if callable(scorer):
+            return scorer
+        if scorer not in SCORERS:
+            raise ValueError(f"Unknown scorer {scorer!r}; expected one of {', '.join(SCORERS)}")
+        return SCORERS[scorer]
+
+    def score(self, a, b):
+        return self._score(a, b)
+
+    def score_many(self, candidates, b, min_score=0.0):
+        """
+        Yield (candidate, score(candidate, b)) for the candidates scoring above min_score.
+        With the sequence scorer b's analysis is shared by all candidates and difflib's
+        quick upper bounds skip weak pairs; other length-bounded scorers skip the
+        candidates whose length alone keeps them at or below min_score.
+        """
+        if self._score is sequence_score:
+            matcher = difflib.SequenceMatcher(None, '', b)
+            for candidate in candidates:
+                matcher.set_seq1(candidate)
+                if matcher.real_quick_ratio() <= min_score or matcher.quick_ratio() <= min_score:
+                    continue
+                score = matcher.ratio()
+                if score > min_score:
+                    yield candidate, score
+            return
+        len_b = len(b)
+        for candidate in candidates:
+            if self.length_bounded and length_bound(len(candidate), len_b) <= min_score:
+                continue
+            score = self._score(candidate, b)
+            if score > min_score:
+                yield candidate, score
+
+    def best_match(self, query, candidates):
+        """
+        The candidate with the highest score and that score, the first one on ties.
+        Returns (None, 0.0) when no candidate scores above zero.
+        """
+        best, best_score = None, 0.0
+        for candidate in candidates:
+            score = self._score(query, candidate)
+            if score > best_score:
+                best, best_score = candidate, score
+        return best, best_score
+
+    def close_matches(self, query, candidates, n=3, cutoff=0.6):
+        """
+        Same contract as difflib.get_close_matches: up to n candidates scoring at least
+        cutoff, best first. With the sequence scorer the result is exactly difflib's.
+        """
+        if self._score is sequence_score:
+            return difflib.get_close_matches(query, candidates, n, cutoff)
+        if not n > 0:
+            raise ValueError("n must be > 0: %r" % (n,))
+        if not 0.0 <= cutoff <= 1.0:
+            raise ValueError("cutoff must be in [0.0, 1.0]: %r" % (cutoff,))
+        scored = []
+        for candidate in candidates:
+            score = self._score(query, candidate)
+            if score >= cutoff:
+                scored.append((score, candidate))
+        return [candidate for score, candidate in heapq.nlargest(n, scored)]
+
+
+SYNONYMS_PATH = os.path.join(os.path.expanduser('~'), '.the-forge', 'synonyms.json.gz')
+
+DESTINATION_HEADERS = ('Destination Fields', 'Destination Field (Target Path)')
+
+
+def _is_abbreviation(short, full):
+    # 'qty' -> 'quantity', 'cust' -> 'customer': same first letter, letters kept in order
+    if short[0] != full[0]:
+        return False
+    rest = iter(full[1:])
+    return all(char in rest for char in short[1:])
+
+
+class SynonymTable:
+    """
+    Field-name synonyms and abbreviations learned from accepted mappings.
+
+    tokens maps an abbreviation token to its full form ('qty' -> 'quantity'),
+    which canonical_name() expands, and pairs maps a canonical field name to
+    the canonical names it was mapped to or from. Pairs are kept pairwise:
+    learning a -> b and b -> c does not make a a synonym of c, so one wrong
+    row cannot merge unrelated names. Matchers index their candidates under
+    canonical() and look a query up under each of its forms(). The table is
+    kept as gzip-compressed JSON at path and only read on first use; revision
+    changes whenever something new is learned. Loading, learning and saving
+    hold a lock, so one table can be shared between threads.
+    """
+    # Upper bound on the forms() of one path, whose levels each may have several synonyms
+    MAX_FORMS = 32
+
+    def __init__(self, path=SYNONYMS_PATH):
+        self.path = path
+        self.revision = 0
+        self._pairs = None
+        self._tokens = None
+        # Reentrant: learn() holds it while canonical_name() loads
+        self._lock = threading.RLock()
+
+    def _load(self):
+        if self._pairs is not None:
+            return
+        with self._lock:
+            if self._pairs is not None:
+                return
+            pairs, tokens = {}, {}
+            if self.path and os.path.exists(self.path):
+                with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+                    data = json.load(f)
+                # Tables written before pairs were kept pairwise held merged groups; they are not read
+                pairs = data.get('pairs', {})
+                tokens = data.get('tokens', {})
+            self._tokens = tokens
+            self._pairs = pairs
+
+    def __len__(self):
+        self._load()
+        return len(self._pairs) + len(self._tokens)
+
+    @staticmethod
+    def _key(name):
+        return re.sub(r'[^0-9a-z]', '', name.lower())
+
+    def canonical_name(self, name):
+        """name lowercased, alphanumerics only, with learned abbreviations expanded."""
+        self._load()
+        return ''.join(self._tokens.get(token, token) for token in tokenize(name)) or self._key(name)
+
+    def name_forms(self, name):
+        """canonical_name(name) followed by the names learned as its synonyms."""
+        canonical = self.canonical_name(name)
+        forms = [canonical]
+        for key in dict.fromkeys((canonical, self._key(name))):
+            forms.extend(form for form in self._pairs.get(key, ()) if form not in forms)
+        return forms
+
+    @staticmethod
+    def _levels(path):
+        return [level for level in re.split(r'[./]', path) if level]
+
+    def canonical(self, path):
+        return '.'.join(self.canonical_name(level) for level in self._levels(path))
+
+    def forms(self, path):
+        """canonical(path) first, then the paths with levels swapped for learned synonyms (at most MAX_FORMS)."""
+        forms = ['']
+        for level in self._levels(path):
+            forms = [f'{form}.{name}' if form else name for form in forms for name in self.name_forms(level)][:self.MAX_FORMS]
+        return forms
+
+    def synonymous(self, a, b):
+        a_levels, b_levels = self._levels(a), self._levels(b)
+        return len(a_levels) == len(b_levels) and all(
+            self.canonical_name(y) in self.name_forms(x) for x, y in zip(a_levels, b_levels))
+
+    @staticmethod
+    def pick(name, synonyms, engine):
+        """
+        Which of synonyms (candidates sharing one of name's forms) name maps to: the
+        one equal to it but for case, else the one engine scores highest, else the first.
+        """
+        lowered = name.lower()
+        for candidate in synonyms:
+            if candidate.lower() == lowered:
+                return candidate
+        if len(synonyms) > 1:
+            best, _ = engine.best_match(name, synonyms)
+            if best is not None:
+                return best
+        return synonyms[0]
+
+    def learn(self, source_name, target_name):
+        """Record that field source_name was mapped to field target_name; returns True if that was new."""
+        with self._lock:
+            self._load()
+            source_tokens, target_tokens = tokenize(source_name), tokenize(target_name)
+            learned = False
+            if len(source_tokens) == len(target_tokens):
+                for a, b in zip(source_tokens, target_tokens):
+                    short, full = (a, b) if len(a) < len(b) else (b, a)
+                    if len(short) < len(full) and _is_abbreviation(short, full):
+                        if self._tokens.get(short) != full:
+                            self._tokens[short] = full
+                            learned = True
+            # Each side by its canonical name and, for lookups that lowercase it first, its plain key
+            source = {self.canonical_name(source_name), self._key(source_name)} - {''}
+            target = {self.canonical_name(target_name), self._key(target_name)} - {''}
+            for keys, others in ((source, target), (target, source)):
+                for key in sorted(keys):
+                    for other in sorted(others - {key}):
+                        partners = self._pairs.setdefault(key, [])
+                        if other not in partners:
+                            partners.append(other)
+                            learned = True
+            if learned:
+                self.revision += 1
+            return learned
+
+    def learn_workbook(self, workbook):
+        """
+        Learn the source/destination field names of an exported mapping workbook (a path
+        or file object). The header may be on either of the first two rows; the source
+        field is the last filled source level column (LevelN_src, Source Level N, or the
+        source Element column) and the destination the last segment of the Destination
+        Fields column. Only leaf-to-leaf rows are learned: rows whose source or destination
+        is a structure (a prefix of another path in the sheet), and destinations several
+        sources of the sheet map to, are skipped. Returns the number of new pairs.
+        """
+        import openpyxl
+        wb = openpyxl.load_workbook(workbook, read_only=True, data_only=True)
+        learned = 0
+        try:
+            for ws in wb.worksheets:
+                rows = ws.iter_rows(values_only=True)
+                for _ in range(2):
+                    headers = [str(h).strip() if h is not None else '' for h in next(rows, ())]
+                    dest_idx = next((i for i, h in enumerate(headers) if h in DESTINATION_HEADERS), None)
+                    if dest_idx is not None:
+                        break
+                if dest_idx is None:
+                    continue
+                level_idx = [i for i, h in enumerate(headers[:dest_idx]) if re.fullmatch(r'Level\d+_src|Source Level \d+', h)]
+                if not level_idx and 'Element' in headers[:dest_idx]:
+                    level_idx = [headers.index('Element')]
+                mapped = []
+                for row in rows:
+                    dest = row[dest_idx] if dest_idx < len(row) else None
+                    levels = tuple(str(row[i]).strip() for i in level_idx if i < len(row) and row[i] not in (None, ''))
+                    dest_levels = tuple(level.strip() for level in re.split(r'[./]', str(dest or '')) if level.strip())
+                    if levels and dest_levels:
+                        mapped.append((levels, dest_levels))
+                # A structure is a proper prefix of another path of the sheet
+                structures = set()
+                for levels, dest_levels in mapped:
+                    structures.update(('src',) + levels[:depth] for depth in range(1, len(levels)))
+                    structures.update(('dest',) + dest_levels[:depth] for depth in range(1, len(dest_levels)))
+                sources_per_dest = {}
+                for levels, dest_levels in mapped:
+                    sources_per_dest.setdefault(dest_levels, set()).add(levels)
+                for levels, dest_levels in mapped:
+                    if ('src',) + levels in structures or ('dest',) + dest_levels in structures:
+                        continue
+                    if len(sources_per_dest[dest_levels]) > 1:
+                        continue
+                    if self.learn(levels[-1], dest_levels[-1]):
+                        learned += 1
+        finally:
+            wb.close()
+        return learned
+
+    def save(self, path=None):
+        path = path or self.path
+        with self._lock:
+            self._load()
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            with gzip.open(path, 'wt', encoding='utf-8') as f:
+                json.dump({'pairs': self._pairs, 'tokens': self._tokens}, f, separators=(',', ':'))
+
+
+class CandidateIndex:
+    """
+    Best-match lookups against a fixed list of candidate paths.
+
+    Exact matches are answered from a dict, then synonyms from a dict of the
+    candidates' canonical forms, looked up under each of the query's forms, when
+    a SynonymTable is given (SynonymTable.pick decides between the candidates
+    found). Otherwise the candidates sharing the query's leaf name are scored first, then the rest from the closest length
+    outwards; with a length-bounded engine the sweep stops once no remaining
+    length can beat the best score, so mostly-exact mappings stay near-linear.
+    Apart from exact matches winning outright, results equal engine.best_match
+    over the whole list, ties included.
+    """
+    def __init__(self, candidates, engine=None, separator='.', synonyms=None):
+        self.candidates = list(candidates)
+        self.engine = engine or SimilarityEngine('sequence')
+        self.separator = separator
+        self.synonyms = synonyms if synonyms else None
+        self.canonical_positions = {}
+        if self.synonyms:
+            for idx, candidate in enumerate(self.candidates):
+                self.canonical_positions.setdefault(self.synonyms.canonical(candidate), []).append(idx)
+        self.positions = {}
+        self.by_leaf = {}
+        by_length = {}
+        for idx, candidate in enumerate(self.candidates):
+            self.positions.setdefault(candidate, idx)
+            self.by_leaf.setdefault(candidate.rsplit(separator, 1)[-1], []).append(idx)
+            by_length.setdefault(len(candidate), []).append(idx)
+        self.by_length = sorted(by_length.items())
+
+    def best_match(self, query):
+        """(candidate, score) like SimilarityEngine.best_match, (None, 0.0) when nothing scores."""
+        if query in self.positions:
+            return query, 1.0
+        if self.synonyms:
+            indexes = [idx for form in self.synonyms.forms(query) for idx in self.canonical_positions.get(form, ())]
+            if indexes:
+                return self.synonyms.pick(query, [self.candidates[idx] for idx in indexes], self.engine), 1.0
+        score = self.engine.score
+        if not self.engine.length_bounded:
+            return self.engine.best_match(query, self.candidates)
+        best_idx, best_score = None, 0.0
+        seen = set()
+        for idx in self.by_leaf.get(query.rsplit(self.separator, 1)[-1], ()):
+            seen.add(idx)
+            sim = score(query, self.candidates[idx])
+            if sim > best_score or (sim == best_score and best_idx is not None and idx < best_idx):
+                best_idx, best_score = idx, sim
+        query_len = len(query)
+        for bound, indexes in sorted(((length_bound(query_len, length), indexes) for length, indexes in self.by_length),
+                                     key=lambda item: -item[0]):
+            # The small margin keeps C backends that round differently from pruning a tie
+            if bound + 1e-9 < best_score or bound == 0.0:
+                break
+            for idx in indexes:
+                if idx in seen:
+                    continue
+                sim = score(query, self.candidates[idx])
+                if sim > best_score or (sim == best_score and best_idx is not None and idx < best_idx):
+                    best_idx, best_score = idx, sim
+        if best_idx is None:
+            return None, 0.0
+        return self.candidates[best_idx], best_score
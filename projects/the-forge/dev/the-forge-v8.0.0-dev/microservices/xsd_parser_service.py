@@ -1,4 +1,6 @@
+import os
 import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 XSD_NS = '{http://www.w3.org/2001/XMLSchema}'
 
@@ -236,14 +238,47 @@ class XSDParser:
             rows.extend(self.parse_element(elem, complex_types, simple_types, 1, category='message'))
         return rows
 
-    def parse_xsd_directory(self, dir_path):
+    def iter_xsd_directory(self, dir_path, workers=None, file_names=None):
+        """
+        Parse every .xsd file in dir_path (or the given file_names in it) and yield
+        (file_name, rows, error) as each file completes. Files are parsed in a process
+        pool of `workers` processes (default: CPU count); workers=1 parses them one by
+        one in this process. A file that fails yields its error message instead of
+        stopping the others.
+        """
+        if file_names is None:
+            file_names = [fname for fname in os.listdir(dir_path) if fname.lower().endswith('.xsd')]
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(file_names) <= 1:
+            for fname in file_names:
+                yield _parse_xsd_file_task(self.max_level, dir_path, fname)
+            return
+        with ProcessPoolExecutor(max_workers=min(workers, len(file_names))) as pool:
+            futures = [pool.submit(_parse_xsd_file_task, self.max_level, dir_path, fname) for fname in file_names]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def parse_xsd_directory(self, dir_path, workers=None, progress=None, errors=None):
+        """
+        Parse every .xsd file in dir_path into {sheet name: rows}, keeping the directory order.
+        progress(done, total, file_name, error) is called as each file completes; files that
+        fail are left out of the result and, if an errors dict is given, recorded in it as
+        {file_name: message}.
+        """
+        order = [fname for fname in os.listdir(dir_path) if fname.lower().endswith('.xsd')]
+        parsed = {}
+        for done, (fname, rows, error) in enumerate(self.iter_xsd_directory(dir_path, workers, order), 1):
+            if error is None:
+                parsed[fname] = rows
+            elif errors is not None:
+                errors[fname] = error
+            if progress:
+                progress(done, len(order), fname, error)
         result = {}
-        for fname in os.listdir(dir_path):
-            if fname.lower().endswith('.xsd'):
-                xsd_path = os.path.join(dir_path, fname)
-                rows = self.parse_xsd_file(xsd_path)
+        for fname in order:
+            if fname in parsed:
                 sheet_name = os.path.splitext(fname)[0]
-                result[sheet_name] = rows
+                result[sheet_name] = parsed[fname]
         return result
 
     def parse_xsd_string(self, xsd_string):
@@ -268,4 +303,12 @@ class XSDParser:
         rows = []
         for elem in root.findall(f'{XSD_NS}element'):
             rows.extend(self.parse_element(elem, complex_types, simple_types, 1, category='message'))
-        return rows 
\ No newline at end of file
+        return rows 
+
+
+def _parse_xsd_file_task(max_level, dir_path, fname):
+    """Worker entry point for iter_xsd_directory; returns (file_name, rows, error)."""
+    try:
+        return fname, XSDParser(max_level).parse_xsd_file(os.path.join(dir_path, fname)), None
+    except Exception as e:
+        return fname, None, f"{type(e).__name__}: {e}"
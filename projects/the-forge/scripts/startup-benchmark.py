@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark for The Forge
+
+Measures the startup cost of every entry point of the given version folders
+(default: everything under dev/, pre/ and prd/ plus the web app):
+  - cold and warm import time, total and per module, parsed from -X importtime
+  - time to first useful output (CLI help text, Qt/Tk window shown, first
+    Streamlit render)
+  - peak RSS of the process
+
+Cold runs use an empty bytecode cache (a fresh PYTHONPYCACHEPREFIX), warm runs
+reuse the cache the cold run filled. The JSON report can be compared with a
+baseline report so startup regressions are caught before a release is
+promoted from dev/ to prd/; entry points are paired by entry file and mode,
+so a dev folder can be compared with the prd folder it replaces.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+MARKER = "FORGE_STARTUP_READY"
+RSS_PREFIX = "FORGE_PEAK_RSS_KB"
+
+# Entry point file (relative to a version folder) -> how its first useful output is reached
+ENTRY_POINTS = [
+    ("app.py", "streamlit"),
+    ("forge_qt_app.py", "qt"),
+    ("the-forge.py", "tk"),
+    ("src/cli/main.py", "cli"),
+]
+
+# Regressions smaller than these are treated as noise
+NOISE_FLOOR = {"cold_import_ms": 10.0, "warm_import_ms": 5.0, "first_output_ms": 20.0, "peak_rss_kb": 2048}
+
+# Runs inside the measured process: python -c PROBE <mode> <entry file>
+PROBE = r'''
+import importlib.util, os, runpy, sys
+mode, path = sys.argv[1], sys.argv[2]
+
+def load():
+    spec = importlib.util.spec_from_file_location("forge_entry", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["forge_entry"] = module
+    spec.loader.exec_module(module)
+    return module
+
+if mode == "import":
+    load()
+elif mode == "cli":
+    sys.argv = [path, "--help"]
+    try:
+        runpy.run_path(path, run_name="__main__")
+    except SystemExit:
+        pass
+elif mode == "qt":
+    module = load()
+    app = module.QApplication.instance() or module.QApplication([])
+    window = module.ForgeMainWindow()
+    window.show()
+    app.processEvents()
+elif mode == "tk":
+    import tkinter
+    def first_frame(self, n=0):
+        self.update()
+    tkinter.Tk.mainloop = first_frame
+    load().main()
+elif mode == "streamlit":
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(path, default_timeout=120)
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+
+print("@MARKER@", flush=True)
+try:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak //= 1024  # bytes on macOS, kilobytes elsewhere
+except ImportError:
+    peak = None
+print("@RSS_PREFIX@", peak, flush=True)
+sys.stdout.flush()
+os._exit(0)
+'''.replace("@MARKER@", MARKER).replace("@RSS_PREFIX@", RSS_PREFIX)
+
+
+def find_entry_points(version_dir: Path) -> List[Tuple[Path, str]]:
+    """Entry point files present in a version folder, with their probe mode."""
+    return [(version_dir / rel_path, mode) for rel_path, mode in ENTRY_POINTS
+            if (version_dir / rel_path).is_file()]
+
+
+def default_targets(project_root: Path) -> List[Path]:
+    targets = []
+    for stage in ("dev", "pre", "prd"):
+        stage_dir = project_root / stage
+        if stage_dir.is_dir():
+            targets.extend(sorted(p for p in stage_dir.iterdir() if p.is_dir()))
+    web_app = project_root.parent / "the-forge-web-app"
+    if web_app.is_dir():
+        targets.append(web_app)
+    return targets
+
+
+def probe_env(entry: Path, version_dir: Path, pycache_prefix: str) -> Dict[str, str]:
+    """Environment of a measured process: fresh or reused bytecode cache, entry folders on sys.path."""
+    env = dict(os.environ)
+    paths = [str(entry.parent), str(version_dir)]
+    if (version_dir / "src").is_dir():
+        paths.append(str(version_dir / "src"))
+    if env.get("PYTHONPATH"):
+        paths.append(env["PYTHONPATH"])
+    env["PYTHONPATH"] = os.pathsep.join(paths)
+    env["PYTHONPYCACHEPREFIX"] = pycache_prefix
+    env.pop("PYTHONDONTWRITEBYTECODE", None)  # Warm runs need the cache the cold run writes
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    env["PYTHONIOENCODING"] = "utf-8"
+    return env
+
+
+def parse_importtime(stderr: str) -> Dict[str, Dict[str, float]]:
+    """
+    Parse -X importtime lines ("import time: self [us] | cumulative | imported package")
+    into {module: {"self_ms", "cumulative_ms"}}.
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Header line
+        name = fields[2].strip()
+        modules[name] = {
+            "self_ms": int(fields[0]) / 1000,
+            "cumulative_ms": int(fields[1]) / 1000,
+        }
+    return modules
+
+
+def run_import(entry: Path, version_dir: Path, pycache_prefix: str, timeout: float) -> Dict[str, Dict[str, float]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE, "import", str(entry)],
+        cwd=entry.parent, env=probe_env(entry, version_dir, pycache_prefix),
+        capture_output=True, text=True, encoding="utf-8", errors="replace", timeout=timeout,
+    )
+    if MARKER not in result.stdout:
+        raise RuntimeError(_last_error_line(result.stderr))
+    return parse_importtime(result.stderr)
+
+
+def run_first_output(entry: Path, version_dir: Path, mode: str, pycache_prefix: str,
+                     timeout: float) -> Tuple[float, Optional[int]]:
+    """
+    Time from process start to its first useful output in ms, and its peak RSS in KB.
+    For the CLI the first line of help text counts, for the others the ready marker.
+    """
+    with tempfile.TemporaryFile(mode="w+", encoding="utf-8", errors="replace") as stderr_file:
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, "-c", PROBE, mode, str(entry)],
+            cwd=entry.parent, env=probe_env(entry, version_dir, pycache_prefix),
+            stdout=subprocess.PIPE, stderr=stderr_file, text=True, encoding="utf-8", errors="replace",
+        )
+        # The stdout loop below would block forever on a hung entry point
+        watchdog = threading.Timer(timeout, process.kill)
+        watchdog.start()
+        first_output = None
+        peak_rss = None
+        try:
+            for line in process.stdout:
+                if first_output is None and (mode == "cli" or line.startswith(MARKER)):
+                    first_output = (time.perf_counter() - start) * 1000
+                if line.startswith(RSS_PREFIX):
+                    value = line[len(RSS_PREFIX):].strip()
+                    peak_rss = int(value) if value.isdigit() else None
+            process.wait()
+            timed_out = watchdog.finished.is_set()
+        finally:
+            watchdog.cancel()
+            if process.poll() is None:
+                process.kill()
+        stderr_file.seek(0)
+        stderr = stderr_file.read()
+    if timed_out and first_output is None:
+        raise RuntimeError(f"timed out after {timeout:g} s")
+    if first_output is None:
+        raise RuntimeError(_last_error_line(stderr))
+    return first_output, peak_rss
+
+
+def _last_error_line(stderr: str) -> str:
+    lines = [line for line in stderr.splitlines() if line.strip() and not line.startswith("import time:")]
+    return lines[-1].strip() if lines else "no output"
+
+
+def benchmark_entry(entry: Path, version_dir: Path, mode: str, repeat: int, min_module_ms: float,
+                    timeout: float) -> Dict:
+    """Cold run once with an empty bytecode cache, then `repeat` warm runs; medians are reported."""
+    result = {"mode": mode, "error": None}
+    with tempfile.TemporaryDirectory(prefix="forge-pycache-") as pycache_prefix:
+        try:
+            cold_modules = run_import(entry, version_dir, pycache_prefix, timeout)
+            warm_runs = [run_import(entry, version_dir, pycache_prefix, timeout) for _ in range(repeat)]
+            outputs = [run_first_output(entry, version_dir, mode, pycache_prefix, timeout) for _ in range(repeat)]
+        except subprocess.TimeoutExpired:
+            result["error"] = f"timed out after {timeout:g} s"
+            return result
+        except (RuntimeError, OSError) as e:
+            result["error"] = str(e)
+            return result
+
+    warm_modules = {}
+    for name in warm_runs[0]:
+        warm_modules[name] = {
+            key: round(statistics.median(run[name][key] for run in warm_runs if name in run), 3)
+            for key in ("self_ms", "cumulative_ms")
+        }
+    result["cold_import_ms"] = round(sum(m["self_ms"] for m in cold_modules.values()), 1)
+    result["warm_import_ms"] = round(statistics.median(
+        sum(m["self_ms"] for m in run.values()) for run in warm_runs), 1)
+    result["first_output_ms"] = round(statistics.median(ms for ms, _ in outputs), 1)
+    rss_values = [rss for _, rss in outputs if rss is not None]
+    result["peak_rss_kb"] = max(rss_values) if rss_values else None
+    result["modules"] = {
+        "cold": {name: m for name, m in cold_modules.items() if m["cumulative_ms"] >= min_module_ms},
+        "warm": {name: m for name, m in warm_modules.items() if m["cumulative_ms"] >= min_module_ms},
+    }
+    return result
+
+
+def split_entry_name(name: str) -> Tuple[str, str]:
+    """(version folder, entry file) of a report entry name such as the-forge/prd/the-forge-v7.0.0/src/cli/main.py."""
+    for rel_path, _ in ENTRY_POINTS:
+        if name == rel_path or name.endswith("/" + rel_path):
+            return name[:-len(rel_path)].rstrip("/"), rel_path
+    target, _, entry = name.rpartition("/")
+    return target, entry
+
+
+def compare_reports(baseline: Dict, current: Dict, threshold: float,
+                    baseline_target: Optional[str] = None) -> Tuple[List[str], List[str]]:
+    """
+    Compare every entry point of current with the baseline entry of the same entry file and
+    mode: the one under baseline_target if given, else the one in the same folder, else the
+    only one. Returns the metrics that grew by more than threshold percent (and the noise
+    floor), and the entry points that could not be checked (errored or without a baseline).
+    """
+    by_entry = {}
+    for name, metrics in baseline.get("entry_points", {}).items():
+        target, entry = split_entry_name(name)
+        by_entry.setdefault((entry, metrics.get("mode")), []).append((target, name, metrics))
+
+    regressions, unchecked = [], []
+    if not current["entry_points"]:
+        unchecked.append("no entry points were benchmarked")
+    for name, metrics in current["entry_points"].items():
+        if metrics.get("error"):
+            unchecked.append(f"{name}: {metrics['error']}")
+            continue
+        target, entry = split_entry_name(name)
+        candidates = by_entry.get((entry, metrics.get("mode")), [])
+        if baseline_target:
+            matches = [c for c in candidates if c[0] == baseline_target or c[0].endswith("/" + baseline_target)]
+        else:
+            matches = [c for c in candidates if c[0] == target] or candidates
+        if not matches:
+            unchecked.append(f"{name}: no baseline entry")
+            continue
+        if len(matches) > 1:
+            unchecked.append(f"{name}: {len(matches)} baseline entries match, pick one with --baseline-target")
+            continue
+        _, old_name, old = matches[0]
+        if old.get("error"):
+            unchecked.append(f"{name}: baseline {old_name} errored: {old['error']}")
+            continue
+        label = name if old_name == name else f"{name} (vs {old_name})"
+        for metric, floor in NOISE_FLOOR.items():
+            before, after = old.get(metric), metrics.get(metric)
+            if before is None or after is None:
+                continue
+            if after - before > floor and after > before * (1 + threshold / 100):
+                regressions.append(f"{label}: {metric} {before} -> {after} (+{(after / before - 1) * 100:.0f}%)")
+    return regressions, unchecked
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup benchmark for The Forge entry points")
+    parser.add_argument("targets", nargs="*", help="Version folders to benchmark (default: dev/, pre/, prd/ and the web app)")
+    parser.add_argument("--repeat", type=int, default=5, help="Warm runs per entry point (default: 5)")
+    parser.add_argument("--output", default="startup-benchmark.json", help="JSON report path")
+    parser.add_argument("--compare", help="Baseline JSON report to check for regressions")
+    parser.add_argument("--baseline-target", help="Version folder of the baseline report to compare with, e.g. prd/the-forge-v7.0.0 "
+                                                  "(default: the same folder, or the only one with that entry point)")
+    parser.add_argument("--threshold", type=float, default=20.0, help="Allowed growth in percent (default: 20)")
+    parser.add_argument("--min-module-ms", type=float, default=1.0, help="Only report modules with at least this cumulative import time")
+    parser.add_argument("--timeout", type=float, default=180.0, help="Seconds before a run is abandoned")
+    args = parser.parse_args()
+
+    project_root = Path(__file__).resolve().parent.parent
+    targets = [Path(t).resolve() for t in args.targets] or default_targets(project_root)
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "entry_points": {},
+    }
+    for version_dir in targets:
+        for entry, mode in find_entry_points(version_dir):
+            name = os.path.relpath(entry, project_root.parent).replace(os.sep, "/")
+            print(f"⏱  {name} ({mode})", flush=True)
+            result = benchmark_entry(entry, version_dir, mode, args.repeat, args.min_module_ms, args.timeout)
+            report["entry_points"][name] = result
+            if result["error"]:
+                print(f"   ✗ {result['error']}")
+            else:
+                print(f"   cold import {result['cold_import_ms']} ms | warm import {result['warm_import_ms']} ms | "
+                      f"first output {result['first_output_ms']} ms | peak RSS {result['peak_rss_kb']} KB")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions, unchecked = compare_reports(baseline, report, args.threshold, args.baseline_target)
+        if regressions:
+            print("❌ Startup regressions:")
+            for line in regressions:
+                print(f"   {line}")
+        if unchecked:
+            print("❌ Not compared:")
+            for line in unchecked:
+                print(f"   {line}")
+        if regressions or unchecked:
+            sys.exit(1)
+        print("✅ No startup regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Similarity Engine Sync for The Forge
+
+The web app, the v2 CLI and the v8 desktop app are each shipped from their
+own folder, so every one of them carries a vendored copy of
+similarity_engine.py. The copy in dev/the-forge-v1.0.0/src/core is the one
+to edit; this script writes it over the vendored copies, or with --check
+lists the copies that differ from it and exits non-zero.
+"""
+
+import argparse
+import shutil
+import sys
+from pathlib import Path
+
+FORGE_ROOT = Path(__file__).resolve().parents[1]
+
+SOURCE = FORGE_ROOT / "dev" / "the-forge-v1.0.0" / "src" / "core" / "similarity_engine.py"
+
+COPIES = [
+    FORGE_ROOT / "dev" / "the-forge-v2.0.0-dev" / "src" / "core" / "similarity_engine.py",
+    FORGE_ROOT / "dev" / "the-forge-v8.0.0-dev" / "microservices" / "similarity_engine.py",
+    FORGE_ROOT.parent / "the-forge-web-app" / "services" / "similarity_engine.py",
+]
+
+
+def stale_copies():
+    source = SOURCE.read_bytes()
+    return [copy for copy in COPIES if not copy.exists() or copy.read_bytes() != source]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Copy the shared similarity engine into every deployable folder")
+    parser.add_argument("--check", action="store_true", help="Only list out-of-date copies; exit 1 if there are any")
+    args = parser.parse_args()
+
+    stale = stale_copies()
+    if args.check:
+        for copy in stale:
+            print(f"❌ {copy} differs from {SOURCE}")
+        if not stale:
+            print(f"✅ {len(COPIES)} copies match {SOURCE}")
+        return 1 if stale else 0
+
+    for copy in stale:
+        shutil.copyfile(SOURCE, copy)
+        print(f"📝 Updated {copy}")
+    print(f"✅ {len(COPIES)} copies match {SOURCE}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())